@@ -14,7 +14,12 @@ from sklearn.decomposition import PCA
 import logging
 import glob
 import re
+import inspect
 from collections import Counter
+import storage
+import frames
+import snapshot
+import pipeline
 
 # 로깅 설정
 logging.basicConfig(
@@ -32,27 +37,83 @@ DATA_DIR = "data"
 RESULTS_DIR = "results"
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
+# 분석 백엔드 (pandas: DataFrame 집계, warehouse: DuckDB 웨어하우스에서 SQL 집계)
+ANALYSIS_BACKEND = os.getenv("ANALYSIS_BACKEND", "pandas")
+
+def _top_values(values, n):
+    """가장 많이 나온 값 n개 (개수가 같으면 먼저 나온 값 우선, 범주형 열에서도 value_counts와 같은 순서)"""
+    counts = values.value_counts(sort=False)
+    first_seen = pd.unique(values.dropna())
+    return counts.reindex(first_seen).sort_values(ascending=False, kind='stable').head(n).index
+
+def _clip_outliers(values, quantile=0.99):
+    """음수와 결측값은 0으로 바꾸고 분위수(기본 상위 1%)를 넘는 값은 분위수로 제한 (열 단위 연산)
+
+    값과 형식은 원소마다 max(0, x), min(x, 분위수)를 적용하던 이전 구현과 같습니다. 정수 열은
+    정수형으로 남고(결측값이 있는 nullable 정수 열은 실수로 처리), 분위수로 제한된 값이 있으면 실수형이 됩니다.
+    """
+    floats = pd.api.types.is_float_dtype(values.dtype) or bool(values.hasnans)
+    numbers = values.to_numpy(dtype="float64", na_value=np.nan) if floats else values.to_numpy(dtype="int64")
+    
+    # 음수/결측값은 정수 0 (양수인 실수 값이 하나도 없으면 정수형)
+    positive = numbers > 0
+    if floats and positive.any():
+        clipped = np.where(positive, numbers, 0.0)
+    else:
+        clipped = np.where(positive, numbers, 0).astype("int64")
+    
+    upper_limit = pd.Series(clipped).quantile(quantile)
+    exceeds = clipped > upper_limit
+    if clipped.dtype.kind == "f" or exceeds.any():
+        clipped = np.where(exceeds, upper_limit, clipped)
+    return pd.Series(clipped, index=values.index, name=values.name)
+
+def _text_length(values):
+    """문자열 열의 글자 수 (결측값은 0, 문자열이 아닌 값은 str로 바꾼 길이)"""
+    lengths = values.astype(str).str.len()
+    return lengths.where(values.notna(), 0).astype("int64")
+
 class GitHubDataAnalyzer:
-    def __init__(self):
-        """GitHub 데이터 분석기 초기화"""
-        logger.info("GitHub 데이터 분석기 초기화")
+    def __init__(self, backend=ANALYSIS_BACKEND):
+        """GitHub 데이터 분석기 초기화
+        
+        backend가 "warehouse"이면 개발자/PR/시간 패턴 집계를 DuckDB 웨어하우스(warehouse.py)에서
+        SQL로 실행하므로 커밋 메시지 등 원본 행 전체를 메모리에 올리지 않습니다.
+        """
+        logger.info(f"GitHub 데이터 분석기 초기화 (백엔드: {backend})")
+        
+        self.warehouse = None
+        self.scope = {}  # 웨어하우스 집계 범위 (repos, start, end)
+        if backend == "warehouse":
+            from warehouse import Warehouse
+            self.warehouse = Warehouse()
         
         # 그래프 스타일 설정
         plt.style.use('ggplot')
         sns.set(style="whitegrid")
     
-    def load_data(self, repositories=None):
-        """지정된 저장소들 또는 모든 저장소의 데이터 로드"""
+    def load_data(self, repositories=None, start=None, end=None, tables=None):
+        """지정된 저장소들 또는 모든 저장소의 데이터 로드
+        
+        start/end(날짜 문자열 또는 datetime)를 주면 커밋 날짜, PR/이슈 생성일이
+        start 이상 end 미만인 행만 로드합니다. Parquet/partitioned 형식에서는
+        범위 밖의 파티션과 행 그룹을 읽지 않습니다. PR 리뷰(pr_reviews)는 PR 번호로
+        PR 데이터와 연결하며, 분석 기간 필터는 PR 쪽에만 적용됩니다.
+        
+        tables(테이블 이름 목록)를 주면 해당 테이블 파일만 읽고 나머지는 빈 DataFrame으로 반환합니다.
+        이전 버전 PR의 reviewers 열에서 만드는 리뷰는 pull_requests와 pr_reviews를 함께 읽을 때만 포함됩니다.
+        """
+        tables = set(tables if tables is not None else snapshot.SNAPSHOT_TABLES)
         all_commits = []
         all_prs = []
         all_issues = []
+        all_reviews = []
         repo_metadata = {}
         
         # 분석할 저장소 목록 결정
         if repositories is None:
             # 데이터 디렉토리의 모든 저장소 디렉토리 검색
-            repo_dirs = [d for d in os.listdir(DATA_DIR) if os.path.isdir(os.path.join(DATA_DIR, d))]
-            repositories = [d.replace("_", "/", 1) for d in repo_dirs]
+            repositories = storage.list_repositories(DATA_DIR)
         
         logger.info(f"{len(repositories)} 저장소의 데이터 로드 중")
         
@@ -69,62 +130,78 @@ class GitHubDataAnalyzer:
                         repo_metadata[repo_name] = metadata_df.iloc[0].to_dict()
                 
                 # 커밋 데이터
-                commits_file = os.path.join(repo_dir, "commits.csv")
-                if os.path.exists(commits_file):
-                    commits_df = pd.read_csv(commits_file)
+                if "commits" in tables and storage.table_exists(repo_dir, "commits"):
+                    commits_df = storage.read_table(repo_dir, "commits", start=start, end=end, typed=True)
                     if not commits_df.empty:
                         # 저장소 이름 추가 (파일에 없는 경우)
                         if 'repo' not in commits_df.columns:
                             commits_df['repo'] = repo_name
+                        commits_df = frames.drop_text(commits_df)
                         all_commits.append(commits_df)
                 
+                # PR 리뷰 데이터
+                reviews_df = None
+                if "pr_reviews" in tables and storage.table_exists(repo_dir, "pr_reviews"):
+                    reviews_df = storage.read_table(repo_dir, "pr_reviews", typed=True)
+                    if 'repo' not in reviews_df.columns:
+                        reviews_df['repo'] = repo_name
+                    all_reviews.append(reviews_df)
+                
                 # PR 데이터
-                prs_file = os.path.join(repo_dir, "pull_requests.csv")
-                if os.path.exists(prs_file):
-                    prs_df = pd.read_csv(prs_file)
+                if "pull_requests" in tables and storage.table_exists(repo_dir, "pull_requests"):
+                    prs_df = storage.read_table(repo_dir, "pull_requests", start=start, end=end, typed=True)
                     if not prs_df.empty:
                         # 저장소 이름 추가
                         if 'repo' not in prs_df.columns:
                             prs_df['repo'] = repo_name
+                        prs_df = frames.drop_text(prs_df)
+                        
+                        # 이전 버전 데이터: pr_reviews에 없는 PR의 reviewers 열(JSON)을 리뷰 행으로 변환
+                        if 'reviewers' in prs_df.columns:
+                            if "pr_reviews" in tables:
+                                legacy = prs_df[prs_df['reviewers'].notna()]
+                                if reviews_df is not None:
+                                    legacy = legacy[~legacy['number'].isin(reviews_df['pr_number'])]
+                                all_reviews.append(self._reviews_from_reviewers(legacy))
+                            prs_df = prs_df.drop(columns='reviewers')
                         all_prs.append(prs_df)
                 
                 # 이슈 데이터
-                issues_file = os.path.join(repo_dir, "issues.csv")
-                if os.path.exists(issues_file):
-                    issues_df = pd.read_csv(issues_file)
+                if "issues" in tables and storage.table_exists(repo_dir, "issues"):
+                    issues_df = storage.read_table(repo_dir, "issues", start=start, end=end, typed=True)
                     if not issues_df.empty:
                         # 저장소 이름 추가
                         if 'repo' not in issues_df.columns:
                             issues_df['repo'] = repo_name
+                        issues_df = frames.drop_text(issues_df)
                         all_issues.append(issues_df)
-                
+            
             except Exception as e:
                 logger.error(f"저장소 {repo_name} 데이터 로드 중 오류: {e}")
         
         # 모든 데이터 결합
-        commits_df = pd.concat(all_commits, ignore_index=True) if all_commits else pd.DataFrame()
+        commits_df = frames.dedup_commits(pd.concat(all_commits, ignore_index=True)) if all_commits else pd.DataFrame()
         prs_df = pd.concat(all_prs, ignore_index=True) if all_prs else pd.DataFrame()
         issues_df = pd.concat(all_issues, ignore_index=True) if all_issues else pd.DataFrame()
+        reviews_df = pd.concat(all_reviews, ignore_index=True) if all_reviews else pd.DataFrame(columns=['repo', 'pr_number', 'reviewer', 'state', 'submitted_at'])
         
-        # 날짜 열 변환
+        # 날짜 열 변환 (read_table(typed=True)로 이미 변환된 열은 그대로 두고, reviewers 열에서 만든 리뷰 시각 같은 문자열만 파싱)
         for df, date_cols in [
             (commits_df, ['date']),
             (prs_df, ['created_at', 'updated_at', 'closed_at', 'merged_at']),
-            (issues_df, ['created_at', 'updated_at', 'closed_at'])
+            (issues_df, ['created_at', 'updated_at', 'closed_at']),
+            (reviews_df, ['submitted_at'])
         ]:
             if not df.empty:
                 for col in date_cols:
                     if col in df.columns:
-                        df[col] = pd.to_datetime(df[col], errors='coerce')
+                        df[col] = frames.parse_dates(df[col])
         
-        # PR 데이터 - reviewers 열이 JSON 문자열인 경우 파싱
-        if not prs_df.empty and 'reviewers' in prs_df.columns:
-            try:
-                prs_df['reviewers'] = prs_df['reviewers'].apply(
-                    lambda x: json.loads(x) if isinstance(x, str) else x
-                )
-            except Exception as e:
-                logger.warning(f"'reviewers' 열 파싱 중 오류: {e}")
+        # 저장소 목록/파일 순서와 무관하게 웨어하우스 백엔드와 같은 행 순서로 정렬 (frames.ROW_ORDER)
+        commits_df = frames.sort_rows(commits_df, "commits")
+        prs_df = frames.sort_rows(prs_df, "pull_requests")
+        issues_df = frames.sort_rows(issues_df, "issues")
+        reviews_df = frames.sort_rows(reviews_df, "pr_reviews")
         
         # 이슈 데이터 - JSON 문자열로 저장된 열 파싱
         for col in ['assignees', 'labels']:
@@ -136,27 +213,77 @@ class GitHubDataAnalyzer:
                 except Exception as e:
                     logger.warning(f"'{col}' 열 파싱 중 오류: {e}")
         
-        logger.info(f"데이터 로드 완료: {len(commits_df)} 커밋, {len(prs_df)} PR, {len(issues_df)} 이슈")
+        logger.info(f"데이터 로드 완료: {len(commits_df)} 커밋, {len(prs_df)} PR, {len(issues_df)} 이슈, {len(reviews_df)} 리뷰")
         
-        return {
+        # 반복 문자열은 범주형, 개수 열은 작은 정수형으로 압축
+        return frames.compact_frames({
             "commits": commits_df,
             "pull_requests": prs_df,
             "issues": issues_df,
+            "pr_reviews": reviews_df,
             "metadata": repo_metadata
-        }
+        }, "로드", restore_ints=True)
+    
+    def load_text(self, table, rows, column):
+        """rows(repo와 키 열이 있는 DataFrame)의 텍스트 열을 rows와 같은 순서의 Series로 반환
+
+        본문/메시지는 load_data에서 읽지 않으므로 텍스트가 필요한 분석만 이 메서드로
+        저장소별 텍스트 파일에서 해당 행의 텍스트를 읽습니다.
+        """
+        if column in rows.columns:
+            return rows[column]
+        
+        key = storage.TEXT_COLUMNS[table][0]
+        texts = []
+        for repo_name, keys in rows.groupby('repo', sort=False, observed=True)[key]:
+            repo_dir = os.path.join(DATA_DIR, repo_name.replace("/", "_"))
+            repo_texts = storage.read_text(repo_dir, table, keys=keys.tolist(), columns=[column])
+            repo_texts['repo'] = repo_name
+            texts.append(repo_texts)
+        
+        if not texts:
+            return pd.Series(None, index=rows.index, dtype=object)
+        
+        merged = rows[['repo', key]].astype({'repo': str}).merge(
+            pd.concat(texts, ignore_index=True).drop_duplicates(['repo', key]),
+            on=['repo', key], how='left'
+        )
+        return pd.Series(merged[column].values, index=rows.index)
+    
+    @staticmethod
+    def _reviews_from_reviewers(prs_df):
+        """이전 버전 PR 데이터의 reviewers 열({리뷰어: [{state, submitted_at}, ...]})을 pr_reviews 행으로 변환"""
+        rows = []
+        for repo, number, reviewers in zip(prs_df['repo'], prs_df['number'], prs_df['reviewers']):
+            if isinstance(reviewers, str):
+                reviewers = json.loads(reviewers)
+            if not isinstance(reviewers, dict):
+                continue
+            for reviewer, reviews in reviewers.items():
+                for review in reviews:
+                    rows.append({"repo": repo, "pr_number": number, "reviewer": reviewer,
+                                 "state": review.get("state"), "submitted_at": review.get("submitted_at")})
+        return pd.DataFrame(rows, columns=['repo', 'pr_number', 'reviewer', 'state', 'submitted_at'])
     
     def clean_data(self, data):
-        """데이터 정제 및 전처리"""
-        commits_df = data["commits"].copy()
-        prs_df = data["pull_requests"].copy()
-        issues_df = data["issues"].copy()
+        """데이터 정제 및 전처리
+
+        입력 DataFrame은 복사하지 않고 얕은 복사본에 열을 추가하므로(copy-on-write) 원본은 바뀌지 않습니다.
+        결과 DataFrame에는 정제 표시(frames.CLEANED_ATTR)를 남기며, 이미 정제된 데이터는 그대로 반환합니다.
+        """
+        if all(frames.is_cleaned(data[table]) for table in ("commits", "pull_requests", "issues")):
+            return data
+        
+        commits_df = data["commits"].copy(deep=False)
+        prs_df = data["pull_requests"].copy(deep=False)
+        issues_df = data["issues"].copy(deep=False)
         
         logger.info("데이터 정제 및 전처리 중...")
         
         # 커밋 데이터 정제
         if not commits_df.empty:
             # 날짜 관련 특성 추가
-            commits_df['date'] = pd.to_datetime(commits_df['date'], errors='coerce')
+            commits_df['date'] = frames.parse_dates(commits_df['date'])
             commits_df = commits_df.dropna(subset=['date'])  # 날짜가 없는 행 제거
             
             # 요일 및 시간 추출
@@ -166,46 +293,37 @@ class GitHubDataAnalyzer:
             commits_df['month'] = commits_df['date'].dt.month
             commits_df['year'] = commits_df['date'].dt.year
             
-            # 커밋 메시지 분석
-            commits_df['message_length'] = commits_df['message'].apply(lambda x: len(str(x)) if pd.notna(x) else 0)
+            # 커밋 메시지 길이 (저장할 때 계산된 message_length가 없는 경우만 메시지에서 계산)
+            if 'message_length' not in commits_df.columns:
+                commits_df['message_length'] = _text_length(commits_df['message'])
             
-            # 이상치 처리
+            # 이상치 처리 (음수/결측값은 0, 상위 1% 이상치 제한)
             for col in ['additions', 'deletions', 'total_changes', 'files_changed']:
                 if col in commits_df.columns:
-                    # 0 이상의 값 확인
-                    commits_df[col] = commits_df[col].apply(lambda x: max(0, x) if pd.notna(x) else 0)
-                    
-                    # 상위 1% 이상치 제한
-                    upper_limit = commits_df[col].quantile(0.99)
-                    commits_df[col] = commits_df[col].apply(lambda x: min(x, upper_limit))
+                    commits_df[col] = _clip_outliers(commits_df[col])
         
         # PR 데이터 정제
         if not prs_df.empty:
             # 날짜 변환
             for col in ['created_at', 'updated_at', 'closed_at', 'merged_at']:
                 if col in prs_df.columns:
-                    prs_df[col] = pd.to_datetime(prs_df[col], errors='coerce')
+                    prs_df[col] = frames.parse_dates(prs_df[col])
             
             # PR 처리 시간 계산 (시간 단위)
-            prs_df['processing_time'] = None
+            prs_df['processing_time'] = np.nan
             mask = ~prs_df['closed_at'].isna()
             prs_df.loc[mask, 'processing_time'] = (
                 prs_df.loc[mask, 'closed_at'] - prs_df.loc[mask, 'created_at']
             ).dt.total_seconds() / 3600
             
-            # 이상치 처리
+            # 이상치 처리 (음수/결측값은 0, 상위 1% 이상치 제한)
             for col in ['additions', 'deletions', 'changed_files', 'comments', 'review_comments', 'commits']:
                 if col in prs_df.columns:
-                    # 0 이상의 값 확인
-                    prs_df[col] = prs_df[col].apply(lambda x: max(0, x) if pd.notna(x) else 0)
-                    
-                    # 상위 1% 이상치 제한
-                    upper_limit = prs_df[col].quantile(0.99)
-                    prs_df[col] = prs_df[col].apply(lambda x: min(x, upper_limit))
+                    prs_df[col] = _clip_outliers(prs_df[col])
             
             # PR 제목 길이
             if 'title' in prs_df.columns:
-                prs_df['title_length'] = prs_df['title'].apply(lambda x: len(str(x)) if pd.notna(x) else 0)
+                prs_df['title_length'] = _text_length(prs_df['title'])
             
             # 병합 여부 플래그
             if 'is_merged' not in prs_df.columns and 'merged_at' in prs_df.columns:
@@ -216,10 +334,10 @@ class GitHubDataAnalyzer:
             # 날짜 변환
             for col in ['created_at', 'updated_at', 'closed_at']:
                 if col in issues_df.columns:
-                    issues_df[col] = pd.to_datetime(issues_df[col], errors='coerce')
+                    issues_df[col] = frames.parse_dates(issues_df[col])
             
             # 이슈 처리 시간 계산 (시간 단위)
-            issues_df['resolution_time'] = None
+            issues_df['resolution_time'] = np.nan
             mask = ~issues_df['closed_at'].isna()
             issues_df.loc[mask, 'resolution_time'] = (
                 issues_df.loc[mask, 'closed_at'] - issues_df.loc[mask, 'created_at']
@@ -227,19 +345,55 @@ class GitHubDataAnalyzer:
             
             # 이슈 제목 및 본문 길이
             if 'title' in issues_df.columns:
-                issues_df['title_length'] = issues_df['title'].apply(lambda x: len(str(x)) if pd.notna(x) else 0)
+                issues_df['title_length'] = _text_length(issues_df['title'])
             
             if 'body' in issues_df.columns:
-                issues_df['body_length'] = issues_df['body'].apply(
-                    lambda x: len(str(x)) if pd.notna(x) and x is not None else 0
-                )
+                issues_df['body_length'] = _text_length(issues_df['body'])
         
         logger.info("데이터 정제 완료")
         
-        return {
+        # 정제 단계에서 추가된 요일/시간/길이 열 압축
+        return frames.mark_cleaned(frames.compact_frames({
             "commits": commits_df,
             "pull_requests": prs_df,
-            "issues": issues_df
+            "issues": issues_df,
+            "pr_reviews": data["pr_reviews"]
+        }, "정제"))
+    
+    def load_clean_data(self, repositories=None, start=None, end=None, tables=None):
+        """load_data와 clean_data를 실행한 정제 데이터 반환 (tables: load_data 참고)
+        
+        SNAPSHOT_ENABLED이면 입력 테이블 파일(경로, 크기, 수정 시각, 앞뒤 내용 해시), 분석 범위, 정제 설정과
+        로드/정제 코드(storage, frames 모듈 포함)로 만든 키의 스냅샷이 있는 경우 다시 정제하지 않고 스냅샷을 읽으며,
+        없으면 정제한 결과를 스냅샷으로 저장합니다.
+        """
+        if not snapshot.SNAPSHOT_ENABLED:
+            return self.clean_data(self.load_data(repositories, start, end, tables))
+        
+        if repositories is None:
+            repositories = storage.list_repositories(DATA_DIR)
+        
+        key = snapshot.fingerprint(
+            DATA_DIR, repositories,
+            tables=sorted(tables) if tables is not None else snapshot.SNAPSHOT_TABLES,
+            start=start, end=end,
+            code=[inspect.getsource(func) for func in (self.load_data, self._reviews_from_reviewers, self.clean_data)] + [inspect.getsource(module) for module in (storage, frames)],
+            **self.clean_config()
+        )
+        clean_data = snapshot.load(key)
+        if clean_data is None:
+            clean_data = self.clean_data(self.load_data(repositories, start, end, tables))
+            snapshot.save(key, clean_data)
+        return clean_data
+    
+    @staticmethod
+    def clean_config():
+        """정제 결과에 영향을 주는 설정 (스냅샷과 분석 단계 캐시 키에 포함)"""
+        return {
+            "compact_frames": frames.COMPACT_FRAMES,
+            "drop_text_columns": frames.DROP_TEXT_COLUMNS,
+            "dedup_commits": frames.DEDUP_COMMITS,
+            "pandas": pd.__version__
         }
     
     def analyze_developer_patterns(self, commits_df):
@@ -250,6 +404,9 @@ class GitHubDataAnalyzer:
             logger.warning("커밋 데이터가 없습니다. 개발자 패턴 분석을 건너뜁니다.")
             return None
         
+        if self.warehouse is not None:
+            return self._save_developer_patterns(*self.warehouse.developer_patterns(**self.scope))
+        
         # 저자 기준으로 사용 (author_login 또는 author_name)
         author_col = 'author_login' if 'author_login' in commits_df.columns else 'author_name'
         
@@ -258,7 +415,7 @@ class GitHubDataAnalyzer:
         logger.info(f"고유한 개발자 수: {len(valid_authors)}")
         
         # 상위 개발자만 상세 분석 (너무 많으면 분석이 어려움)
-        top_authors = commits_df[author_col].value_counts().head(30).index
+        top_authors = _top_values(commits_df[author_col], 30)
         
         # 개발자별 기본 통계
         dev_stats = commits_df.groupby(author_col).agg({
@@ -314,12 +471,13 @@ class GitHubDataAnalyzer:
         # 커밋 메시지 분석
         message_patterns = {}
         
-        # 상위 개발자에 대해서만 상세 메시지 분석 수행
+        # 상위 개발자에 대해서만 상세 메시지 분석 수행 (메시지는 해당 커밋만 텍스트 파일에서 읽음)
+        top_commits = commits_df[commits_df[author_col].isin(top_authors)]
+        top_messages = self.load_text("commits", top_commits, "message")
+        
         for author in top_authors:
-            author_commits = commits_df[commits_df[author_col] == author]
-            
             # 메시지가 있는 커밋만 분석
-            messages = author_commits['message'].dropna().astype(str).tolist()
+            messages = top_messages[top_commits[author_col] == author].dropna().astype(str).tolist()
             
             if messages:
                 # 모든 메시지 합치기
@@ -342,6 +500,10 @@ class GitHubDataAnalyzer:
                 top_words = {word: count for word, count in word_freq.most_common(10)}
                 message_patterns[author] = top_words
         
+        return self._save_developer_patterns(dev_stats, day_activity, hour_activity, message_patterns)
+    
+    def _save_developer_patterns(self, dev_stats, day_activity, hour_activity, message_patterns):
+        """개발자 패턴 분석 결과 저장"""
         # 결과 저장
         dev_patterns = {
             'stats': dev_stats,
@@ -370,8 +532,8 @@ class GitHubDataAnalyzer:
         
         return dev_patterns
     
-    def analyze_pr_patterns(self, prs_df):
-        """PR 패턴 분석"""
+    def analyze_pr_patterns(self, prs_df, reviews_df=None):
+        """PR 패턴 분석 (reviews_df: pr_reviews 행, 있으면 리뷰 네트워크 구성)"""
         logger.info("PR 패턴 분석 중...")
         
         if prs_df.empty:
@@ -384,8 +546,11 @@ class GitHubDataAnalyzer:
             logger.warning(f"'{author_col}' 열을 찾을 수 없습니다. PR 패턴 분석을 건너뜁니다.")
             return None
         
+        if self.warehouse is not None:
+            return self._save_pr_patterns(*self.warehouse.pr_patterns(**self.scope))
+        
         # 상위 개발자만 분석
-        top_authors = prs_df[author_col].value_counts().head(30).index
+        top_authors = _top_values(prs_df[author_col], 30)
         
         # 개발자별 PR 통계
         pr_stats = prs_df.groupby(author_col).agg({
@@ -417,44 +582,43 @@ class GitHubDataAnalyzer:
         if 'additions' in prs_df.columns and 'processing_time' in prs_df.columns:
             # 전체 상관관계
             corr = prs_df[['additions', 'processing_time']].corr().iloc[0, 1]
-            size_time_corr['overall'] = corr
+            size_time_corr['overall'] = None if pd.isna(corr) else corr  # 계산할 수 없으면 JSON null
             
             # 개발자별 상관관계 (상위 개발자만)
             for author in top_authors:
                 author_prs = prs_df[prs_df[author_col] == author]
                 if len(author_prs) >= 10:  # 충분한 데이터가 있는 경우만
                     author_corr = author_prs[['additions', 'processing_time']].corr().iloc[0, 1]
-                    size_time_corr[author] = author_corr
+                    size_time_corr[author] = None if pd.isna(author_corr) else author_corr
         
-        # 리뷰 패턴 분석 (reviewers 열이 있는 경우)
+        # 리뷰 패턴 분석 (pr_reviews가 있는 경우)
         review_network = None
         
-        if 'reviewers' in prs_df.columns and prs_df['reviewers'].notna().any():
-            # 리뷰 네트워크 구성 (누가 누구의 코드를 리뷰하는지)
-            review_edges = []
-            
-            for _, row in prs_df[prs_df['reviewers'].notna()].iterrows():
-                author = row[author_col]
-                reviewers_data = row['reviewers']
-                
-                if isinstance(reviewers_data, dict):
-                    for reviewer in reviewers_data.keys():
-                        if reviewer != author:  # 자기 자신은 제외
-                            review_edges.append((reviewer, author))
+        if reviews_df is not None and not reviews_df.empty:
+            # 리뷰 네트워크 구성 (누가 누구의 코드를 리뷰하는지, PR 하나에서 같은 리뷰어는 한 번만 셈)
+            reviews = reviews_df[['repo', 'pr_number', 'reviewer']].drop_duplicates()
+            edges = reviews.merge(
+                prs_df[['repo', 'number', author_col]].rename(columns={'number': 'pr_number'}),
+                on=['repo', 'pr_number']
+            )
+            edges = edges[edges['reviewer'].astype(object) != edges[author_col].astype(object)]  # 자기 자신은 제외 (범주가 다른 범주형 열끼리 비교)
             
-            # 리뷰 횟수 계산
-            review_counts = Counter(review_edges)
+            # 리뷰 횟수 계산 (횟수가 많은 순, 같으면 리뷰어/작성자 이름순으로 웨어하우스 백엔드와 같은 순서)
+            review_counts = edges.groupby(['reviewer', author_col], sort=False, dropna=False).size().rename('weight').reset_index()
+            review_counts = review_counts.astype({'reviewer': object, author_col: object}).sort_values(
+                ['weight', 'reviewer', author_col], ascending=[False, True, True], na_position='last', kind='stable'
+            )
             
             # 네트워크 데이터 구성
             review_network = {
-                'edges': [{'source': src, 'target': tgt, 'weight': cnt} 
-                         for (src, tgt), cnt in review_counts.items()]
+                'edges': [{'source': src, 'target': tgt, 'weight': int(cnt)} 
+                         for src, tgt, cnt in review_counts.itertuples(index=False)]
             }
-            
-            # 리뷰 네트워크 저장
-            with open(os.path.join(RESULTS_DIR, 'pr_patterns', 'review_network.json'), 'w') as f:
-                json.dump(review_network, f, indent=2)
         
+        return self._save_pr_patterns(pr_stats, size_time_corr, review_network)
+    
+    def _save_pr_patterns(self, pr_stats, size_time_corr, review_network):
+        """PR 패턴 분석 결과 저장"""
         # 결과 저장
         pr_patterns = {
             'stats': pr_stats,
@@ -468,6 +632,11 @@ class GitHubDataAnalyzer:
         # PR 통계
         pr_stats.to_csv(os.path.join(RESULTS_DIR, 'pr_patterns', 'pr_stats.csv'))
         
+        # 리뷰 네트워크
+        if review_network is not None:
+            with open(os.path.join(RESULTS_DIR, 'pr_patterns', 'review_network.json'), 'w') as f:
+                json.dump(review_network, f, indent=2)
+        
         # 크기-시간 상관관계
         with open(os.path.join(RESULTS_DIR, 'pr_patterns', 'size_time_corr.json'), 'w') as f:
             json.dump(size_time_corr, f, indent=2)
@@ -655,42 +824,54 @@ class GitHubDataAnalyzer:
             logger.warning("'date' 열을 찾을 수 없습니다. 시간 패턴 분석을 건너뜁니다.")
             return None
         
-        # 날짜 포맷 확인
-        commits_df['date'] = pd.to_datetime(commits_df['date'], errors='coerce')
-        commits_df = commits_df.dropna(subset=['date'])
-        
-        # 날짜 특성 추가
-        commits_df['day_of_week'] = commits_df['date'].dt.dayofweek
-        commits_df['day_name'] = commits_df['date'].dt.day_name()
-        commits_df['hour_of_day'] = commits_df['date'].dt.hour
-        commits_df['date_only'] = commits_df['date'].dt.date
+        if self.warehouse is not None:
+            return self._save_time_patterns(*self.warehouse.time_patterns(**self.scope))
         
-        # 결과 저장 디렉토리
-        os.makedirs(os.path.join(RESULTS_DIR, 'time_patterns'), exist_ok=True)
+        # 정제되지 않은 데이터만 날짜 변환과 요일/시간 특성 추가 (정제된 데이터는 복사하지 않고 그대로 사용)
+        if not frames.is_cleaned(commits_df):
+            commits_df = commits_df.assign(date=frames.parse_dates(commits_df['date'])).dropna(subset=['date'])
+            commits_df = commits_df.assign(
+                day_of_week=commits_df['date'].dt.dayofweek,
+                day_name=commits_df['date'].dt.day_name(),
+                hour_of_day=commits_df['date'].dt.hour
+            )
         
         # 일별 커밋 수
-        daily_commits = commits_df.groupby('date_only').size().reset_index(name='count')
-        daily_commits.to_csv(os.path.join(RESULTS_DIR, 'time_patterns', 'daily_commits.csv'), index=False)
+        daily_commits = commits_df.groupby(commits_df['date'].dt.date.rename('date_only')).size().reset_index(name='count')
         
         # 요일별 커밋 분포
-        day_counts = commits_df.groupby('day_name').size()
+        day_counts = commits_df.groupby('day_name', observed=True).size()
+        day_counts.index = day_counts.index.astype(str)
         
         # 요일 순서 조정
         day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         if set(day_counts.index).issubset(day_order):
             day_counts = day_counts.reindex(day_order)
         
-        day_counts.to_csv(os.path.join(RESULTS_DIR, 'time_patterns', 'day_of_week.csv'))
-        
         # 시간대별 커밋 분포
         hour_counts = commits_df.groupby('hour_of_day').size()
-        hour_counts.to_csv(os.path.join(RESULTS_DIR, 'time_patterns', 'hour_of_day.csv'))
         
         # 요일-시간 히트맵 데이터
         day_hour_counts = pd.crosstab(
             commits_df['day_of_week'], 
             commits_df['hour_of_day']
         )
+        
+        # 월별/연도별 추세
+        monthly_counts = commits_df.groupby(commits_df['date'].dt.to_period('M').rename('year_month')).size()
+        
+        return self._save_time_patterns(daily_commits, day_counts, hour_counts, day_hour_counts, monthly_counts)
+    
+    def _save_time_patterns(self, daily_commits, day_counts, hour_counts, day_hour_counts, monthly_counts):
+        """시간 패턴 분석 결과 저장 및 시각화"""
+        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+        
+        # 결과 저장 디렉토리
+        os.makedirs(os.path.join(RESULTS_DIR, 'time_patterns'), exist_ok=True)
+        
+        daily_commits.to_csv(os.path.join(RESULTS_DIR, 'time_patterns', 'daily_commits.csv'), index=False)
+        day_counts.to_csv(os.path.join(RESULTS_DIR, 'time_patterns', 'day_of_week.csv'))
+        hour_counts.to_csv(os.path.join(RESULTS_DIR, 'time_patterns', 'hour_of_day.csv'))
         day_hour_counts.to_csv(os.path.join(RESULTS_DIR, 'time_patterns', 'day_hour_heatmap.csv'))
         
         # 시각화: 요일별 커밋 분포
@@ -727,10 +908,7 @@ class GitHubDataAnalyzer:
         plt.savefig(os.path.join(RESULTS_DIR, 'time_patterns', 'day_hour_heatmap.png'), dpi=300)
         plt.close()
         
-        # 월별/연도별 추세 (충분한 데이터가 있는 경우)
-        commits_df['year_month'] = commits_df['date'].dt.to_period('M')
-        monthly_counts = commits_df.groupby('year_month').size()
-        
+        # 월별 추세 (충분한 데이터가 있는 경우)
         if len(monthly_counts) > 1:
             monthly_counts.to_csv(os.path.join(RESULTS_DIR, 'time_patterns', 'monthly_commits.csv'))
             
@@ -781,10 +959,10 @@ class GitHubDataAnalyzer:
         if 'commits' in prs_df.columns:
             features.append('commits')
         
-        # 파생 특성 생성
+        # 파생 특성 생성 (입력 DataFrame에 열을 추가하지 않도록 assign 사용)
         if 'created_at' in prs_df.columns:
-            prs_df['day_of_week'] = pd.to_datetime(prs_df['created_at']).dt.dayofweek
-            prs_df['hour_of_day'] = pd.to_datetime(prs_df['created_at']).dt.hour
+            created_at = prs_df['created_at'] if frames.is_cleaned(prs_df) else pd.to_datetime(prs_df['created_at'])
+            prs_df = prs_df.assign(day_of_week=created_at.dt.dayofweek, hour_of_day=created_at.dt.hour)
             features.extend(['day_of_week', 'hour_of_day'])
         
         # 특성 및 목표 변수 추출
@@ -862,41 +1040,21 @@ class GitHubDataAnalyzer:
             'importance': importance
         }
     
-    def run_analysis(self, repositories=None):
-        """모든 분석 실행"""
-        # 1. 데이터 로드
-        data = self.load_data(repositories)
-        
-        # 2. 데이터 정제
-        clean_data = self.clean_data(data)
-        
-        # 3. 개발자 활동 패턴 분석
-        dev_patterns = self.analyze_developer_patterns(clean_data["commits"])
-        
-        # 4. PR 패턴 분석
-        pr_patterns = self.analyze_pr_patterns(clean_data["pull_requests"])
-        
-        # 5. 개발자 클러스터링
-        clustering = self.cluster_developers(
-            clean_data["commits"], 
-            clean_data["pull_requests"]
-        )
-        
-        # 6. 시간 패턴 분석
-        time_patterns = self.analyze_time_patterns(clean_data["commits"])
-        
-        # 7. PR 승인 예측 모델 훈련
-        pr_model = self.train_pr_approval_model(clean_data["pull_requests"])
-        
-        # 결과 요약
+    def count_rows(self, df):
+        """요약용 행 수와 작성자(author_login) 수"""
+        authors = len(df[df["author_login"].notna()]["author_login"].unique()) if 'author_login' in df.columns else 0
+        return {"rows": len(df), "authors": authors}
+    
+    def save_summary(self, commit_counts, pr_counts, issue_counts, clustering, pr_model, repositories=None):
+        """분석 결과 요약 저장 (count_rows 결과와 클러스터링/모델 결과)"""
         summary = {
             'repositories': repositories,
             'data_counts': {
-                'commits': len(clean_data["commits"]),
-                'pull_requests': len(clean_data["pull_requests"]),
-                'issues': len(clean_data["issues"])
+                'commits': commit_counts['rows'],
+                'pull_requests': pr_counts['rows'],
+                'issues': issue_counts['rows']
             },
-            'dev_count': len(clean_data["commits"][clean_data["commits"]["author_login"].notna()]["author_login"].unique()) if 'author_login' in clean_data["commits"].columns else 0,
+            'dev_count': commit_counts['authors'],
             'clusters': clustering['n_clusters'] if clustering else 0,
             'model_accuracy': pr_model['accuracy'] if pr_model else None
         }
@@ -905,15 +1063,46 @@ class GitHubDataAnalyzer:
         with open(os.path.join(RESULTS_DIR, 'analysis_summary.json'), 'w') as f:
             json.dump(summary, f, indent=2)
         
+        return summary
+    
+    def run_analysis(self, repositories=None, start=None, end=None):
+        """모든 분석 실행 (start/end로 분석 기간 제한 가능)
+        
+        분석 단계는 pipeline.STAGES의 의존성 그래프 순서로 실행하며, 입력 테이블 파일과 설정이
+        바뀌지 않은 단계는 다시 실행하지 않고 캐시된 결과를 사용합니다 (pipeline.py 참고).
+        """
+        repos = repositories if repositories is not None else storage.list_repositories(DATA_DIR)
+        if self.warehouse is not None:
+            # 웨어하우스 집계 범위 (적재는 다시 실행할 단계가 있을 때만)
+            self.scope = {"repos": repos, "start": start, "end": end}
+        
+        def load(tables):
+            if self.warehouse is not None:
+                # 1-2. 웨어하우스 동기화 후 텍스트 열을 뺀 정제 데이터만 로드 (클러스터링, 모델, 요약용)
+                self.warehouse.sync(DATA_DIR, repositories)
+                return frames.compact_frames(self.warehouse.clean_frames(**self.scope), "웨어하우스")
+            # 1-2. 데이터 로드 및 정제 (입력 파일이 바뀌지 않았으면 정제 스냅샷 사용)
+            return self.load_clean_data(repositories, start, end, tables)
+        
+        # 3-7. 개발자/PR 패턴, 클러스터링, 시간 패턴, PR 승인 모델과 결과 요약
+        params = {
+            "repositories": repos,
+            "start": start,
+            "end": end,
+            "backend": "warehouse" if self.warehouse is not None else "pandas",
+            **self.clean_config()
+        }
+        results = pipeline.run(self, load, DATA_DIR, repos, params, RESULTS_DIR)
+        
         logger.info("모든 분석 완료!")
         
         return {
-            'dev_patterns': dev_patterns,
-            'pr_patterns': pr_patterns,
-            'clustering': clustering,
-            'time_patterns': time_patterns,
-            'pr_model': pr_model,
-            'summary': summary
+            'dev_patterns': results['dev_patterns'],
+            'pr_patterns': results['pr_patterns'],
+            'clustering': results['clustering'],
+            'time_patterns': results['time_patterns'],
+            'pr_model': results['pr_model'],
+            'summary': results['summary']
         }
 
 def main():
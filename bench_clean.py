@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# github_analyzer/bench_clean.py
+
+"""합성 데이터로 clean_data의 이상치 처리/길이 계산 단계 측정
+
+load_data 결과와 같은 형태(압축된 정수 열, 결측값, 음수 포함)의 커밋/PR/이슈 DataFrame을 만들어
+원소별 apply로 처리하던 이전 구현과 열 단위 연산(_clip_outliers, _text_length)의 시간을 비교하고,
+두 결과가 값과 형식까지 같은지 확인합니다. 마지막으로 clean_data 전체 시간을 측정합니다:
+    python bench_clean.py --rows 1000000 --repeat 3
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+import warnings
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+COMMIT_COLUMNS = ['additions', 'deletions', 'total_changes', 'files_changed']
+PR_COLUMNS = ['additions', 'deletions', 'changed_files', 'comments', 'review_comments', 'commits']
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="clean_data 정제 단계 벤치마크")
+    parser.add_argument("--rows", type=int, default=1000000, help="테이블별 합성 행 수")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수 (가장 빠른 시간을 보고)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    parser.add_argument("--skip-baseline", action="store_true", help="이전 구현(apply) 측정 생략")
+    return parser.parse_args()
+
+def _counts(rng, rows, high, missing=0.05):
+    """결측값과 드문 음수/큰 값이 섞인 개수 열 (load_data처럼 nullable 정수형)"""
+    values = rng.geometric(1 / high, rows) - 1
+    values[rng.random(rows) < 0.001] *= 50
+    values[rng.random(rows) < 0.001] = -1
+    return pd.array(np.where(rng.random(rows) < missing, np.nan, values), dtype="Int32")
+
+def _texts(rng, rows, words, missing=0.02, pool_size=5000):
+    """길이가 다른 문자열 열 (미리 만든 문장 pool_size개에서 뽑음, 일부 결측값)"""
+    vocabulary = np.array(["fix", "add", "update", "refactor", "버그", "수정", "test", "docs"])
+    pool = np.array([" ".join(vocabulary[rng.integers(0, len(vocabulary), n)]) for n in rng.integers(1, words, pool_size)], dtype=object)
+    return pd.Series(pool[rng.integers(0, pool_size, rows)], dtype="str").mask(rng.random(rows) < missing)
+
+def make_data(rows, seed=0):
+    """load_data 결과와 같은 형태의 합성 데이터"""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-01-01", tz="UTC").value // 10 ** 9
+    dates = lambda: pd.to_datetime(rng.integers(start, start + 365 * 86400, rows), unit="s", utc=True)
+    repos = pd.Categorical.from_codes(rng.integers(0, 50, rows), [f"owner{i}/repo{i}" for i in range(50)])
+    authors = pd.Categorical.from_codes(rng.integers(0, 5000, rows), [f"dev{i}" for i in range(5000)])
+    
+    commits = pd.DataFrame({
+        "repo": repos,
+        "sha": [f"{i:040x}" for i in range(rows)],
+        "author_login": authors,
+        "date": dates(),
+        "message": _texts(rng, rows, 12),
+        **{col: _counts(rng, rows, high) for col, high in zip(COMMIT_COLUMNS, [40, 20, 60, 3])}
+    })
+    
+    created = dates()
+    closed = pd.Series(created + pd.to_timedelta(rng.integers(0, 30 * 86400, rows), unit="s")).mask(rng.random(rows) < 0.2)
+    prs = pd.DataFrame({
+        "repo": repos,
+        "number": np.arange(rows),
+        "title": _texts(rng, rows, 8),
+        "state": pd.Categorical(np.where(closed.isna(), "open", "closed")),
+        "created_at": created,
+        "updated_at": created,
+        "closed_at": closed,
+        "merged_at": closed.mask(rng.random(rows) < 0.3),
+        "author_login": authors,
+        **{col: _counts(rng, rows, high) for col, high in zip(PR_COLUMNS, [80, 40, 5, 4, 3, 3])}
+    })
+    
+    issues = prs[["repo", "number", "title", "state", "created_at", "updated_at", "closed_at", "author_login"]].copy()
+    issues["body"] = _texts(rng, rows, 40)
+    reviews = pd.DataFrame(columns=['repo', 'pr_number', 'reviewer', 'state', 'submitted_at'])
+    return {"commits": commits, "pull_requests": prs, "issues": issues, "pr_reviews": reviews}
+
+def baseline_clip(values):
+    """이전 구현: 원소마다 max(0, x) 후 상위 1% 분위수로 min"""
+    values = values.apply(lambda x: max(0, x) if pd.notna(x) else 0)
+    upper_limit = values.quantile(0.99)
+    return values.apply(lambda x: min(x, upper_limit))
+
+def baseline_length(values):
+    """이전 구현: 원소마다 len(str(x))"""
+    return values.apply(lambda x: len(str(x)) if pd.notna(x) else 0)
+
+def stage_columns():
+    """이상치 처리/길이 계산 대상 (테이블, 열, 처리 종류)"""
+    stages = [("commits", col, "clip") for col in COMMIT_COLUMNS] + [("pull_requests", col, "clip") for col in PR_COLUMNS]
+    return stages + [("commits", "message", "length"), ("pull_requests", "title", "length"),
+                     ("issues", "title", "length"), ("issues", "body", "length")]
+
+def best_time(func, repeat):
+    """repeat번 실행한 가장 빠른 시간과 마지막 결과"""
+    best, result = None, None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    args = parse_args()
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.INFO)
+    
+    import analyze_data
+    
+    start_time = time.perf_counter()
+    data = make_data(args.rows, args.seed)
+    print(f"합성 데이터 {args.rows}행 x 3 테이블 생성: {time.perf_counter() - start_time:.1f}초")
+    
+    results = []
+    for table, col, kind in stage_columns():
+        values = data[table][col]
+        vectorized = analyze_data._clip_outliers if kind == "clip" else analyze_data._text_length
+        baseline = baseline_clip if kind == "clip" else baseline_length
+        
+        new_sec, new_result = best_time(lambda: vectorized(values), args.repeat)
+        row = {"table": table, "column": col, "stage": kind, "vectorized_sec": round(new_sec, 3)}
+        if not args.skip_baseline:
+            old_sec, old_result = best_time(lambda: baseline(values), args.repeat)
+            pd.testing.assert_series_equal(old_result, new_result, check_exact=True, obj=f"{table}.{col}")
+            row.update(apply_sec=round(old_sec, 3), speedup=round(old_sec / new_sec, 1), same=True)
+        results.append(row)
+    
+    report = pd.DataFrame(results)
+    print(report.to_string(index=False))
+    if not args.skip_baseline:
+        print(f"\n합계: apply {report['apply_sec'].sum():.2f}초 -> 열 단위 {report['vectorized_sec'].sum():.2f}초")
+    
+    analyzer = analyze_data.GitHubDataAnalyzer("pandas")
+    clean_sec, _ = best_time(lambda: analyzer.clean_data(data), args.repeat)
+    print(f"clean_data 전체 (날짜 특성, 처리 시간, 압축 포함): {clean_sec:.2f}초")
+
+if __name__ == "__main__":
+    main()
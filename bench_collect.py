@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# github_analyzer/bench_collect.py
+
+"""녹화된 카세트로 수집기 처리량을 네트워크 없이 측정
+
+먼저 실제 API로 한 번 수집하며 응답을 녹화합니다:
+    REPLAY_MODE=record python main.py collect --repos pallets/flask
+
+그런 다음 지연 시간과 동시 작업 수를 바꿔가며 재생합니다:
+    python bench_collect.py --repos pallets/flask --latency-ms 0 50 --workers 1 8 --repo-workers 1 4
+"""
+
+import os
+import sys
+import time
+import argparse
+import itertools
+import tempfile
+
+# 수집기 모듈이 설정을 읽기 전에 재생 모드 지정 (HTTP 캐시는 --cache로만 사용)
+# 커밋 상세 정보 캐시는 끔: 프로세스 안에서 공유되므로 켜 두면 첫 설정만 get_commit을 호출하고
+# 이후 설정들은 캐시에서 채워 측정값이 달라짐
+os.environ["REPLAY_MODE"] = "replay"
+os.environ.setdefault("HTTP_CACHE_ENABLED", "false")
+os.environ["COMMIT_STORE_ENABLED"] = "false"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="카세트 재생 기반 수집 벤치마크")
+    parser.add_argument("--repos", nargs="+", required=True, help="녹화된 저장소 목록 (owner/repo)")
+    parser.add_argument("--cassettes", default=os.getenv("REPLAY_CASSETTE_DIR", "cassettes"), help="카세트 디렉토리")
+    parser.add_argument("--latency-ms", type=float, nargs="+", default=[50], help="요청당 모의 지연 시간 (여러 값 가능)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[8], help="상세 정보 동시 요청 수 (여러 값 가능)")
+    parser.add_argument("--repo-workers", type=int, nargs="+", default=[1], help="동시에 수집할 저장소 수 (여러 값 가능)")
+    parser.add_argument("--mode", choices=["rest", "graphql"], default="rest", help="수집 방식")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="토큰당 모의 속도 제한 (0이면 녹화된 헤더 사용)")
+    parser.add_argument("--tokens", type=int, default=1, help="모의 토큰 수 (토큰 풀 측정용)")
+    parser.add_argument("--days", type=int, default=30, help="녹화할 때 사용한 수집 기간(일)")
+    parser.add_argument("--max-items", type=int, default=200, help="녹화할 때 사용한 저장소당 최대 항목 수")
+    parser.add_argument("--cache", action="store_true", help="HTTP 응답 캐시 사용 (같은 설정을 두 번째 실행부터 304로 재생)")
+    parser.add_argument("--repeat", type=int, default=1, help="설정별 반복 횟수")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    os.environ["REPLAY_CASSETTE_DIR"] = os.path.abspath(args.cassettes)
+    os.environ["REPLAY_RATE_LIMIT"] = str(args.rate_limit)
+    if args.cache:
+        os.environ["HTTP_CACHE_ENABLED"] = "true"
+    
+    # 수집 결과는 임시 디렉토리에 저장 (HTTP 캐시는 반복 실행 사이에 유지)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    workdir = tempfile.mkdtemp(prefix="bench_collect_")
+    os.chdir(workdir)
+    
+    import pandas as pd
+    import collect_data
+    
+    tokens = [f"replay_token_{i}" for i in range(args.tokens)]
+    results = []
+    
+    for latency_ms, max_workers, repo_workers in itertools.product(args.latency_ms, args.workers, args.repo_workers):
+        for run in range(args.repeat):
+            collector = collect_data.GitHubDataCollector(tokens, max_workers=max_workers, mode=args.mode)
+            collector.replay.latency_ms = latency_ms
+            collector.replay.reset()
+            
+            start_time = time.time()
+            summary = pd.DataFrame(collector.collect_repositories(
+                args.repos,
+                workers=repo_workers,
+                days_back=args.days,
+                max_items={
+                    "commits": args.max_items,
+                    "pull_requests": args.max_items // 2,
+                    "issues": args.max_items // 2
+                }
+            ))
+            elapsed = time.time() - start_time
+            collector.close()
+            
+            items = int(summary[["commits", "pull_requests", "issues"]].to_numpy().sum())
+            stats = collector.replay.stats
+            results.append({
+                "latency_ms": latency_ms,
+                "workers": max_workers,
+                "repo_workers": repo_workers,
+                "run": run + 1,
+                "elapsed_sec": round(elapsed, 2),
+                "requests": stats["requests"],
+                "not_modified": stats["not_modified"],
+                "rate_limited": stats["rate_limited"],
+                "misses": stats["misses"],
+                "items": items,
+                "items_per_sec": round(items / elapsed, 1) if elapsed else None,
+                "failed": int((summary["status"] != "완료").sum())
+            })
+    
+    print(pd.DataFrame(results).to_string(index=False))
+    print(f"\n수집 결과 디렉토리: {workdir}")
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,25 @@
 # github_analyzer/collect_data.py
 
 import os
-import time
 import json
+import time
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from github import Github, RateLimitExceededException
 from dotenv import load_dotenv
 from tqdm import tqdm
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from graphql_collector import GitHubGraphQLCollector
+from collection_state import CollectionState, CHILD_TABLES, ENTITY_COLUMNS, ENTITY_KEYS, child_rows, to_utc, upsert_child_rows, upsert_rows
+from http_cache import HTTP_CACHE_ENABLED, install_http_cache
+from rate_limiter import install_rate_limiter
+from token_pool import install_token_pool, load_tokens
+from paginator import MAX_PAGE_SIZE, iter_pages, is_pull_request
+from replay import install_replay
+from commit_store import COMMIT_STORE_ENABLED, open_commit_store
+import storage
 
 
 import sys
@@ -33,33 +44,69 @@ logger = logging.getLogger("GitHubCollector")
 
 # 환경 변수 로드
 load_dotenv()
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-MAX_ITEMS = int(os.getenv("MAX_ITEMS_PER_REQUEST", 100))
-REQUEST_DELAY = float(os.getenv("REQUEST_DELAY", 0.5))
+GITHUB_TOKENS = load_tokens()  # GITHUB_TOKEN + GITHUB_TOKENS / GITHUB_TOKENS_FILE
+MAX_ITEMS = int(os.getenv("MAX_ITEMS_PER_REQUEST", 100))  # 목록 페이지 크기 (GitHub 최대 100)
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", 8))  # 커밋 상세 정보 동시 요청 수 (동시에 수집하는 저장소 전체 합계)
+COLLECTION_MODE = os.getenv("COLLECTION_MODE", "rest")  # rest 또는 graphql
+GRAPHQL_COMMIT_FILES = os.getenv("GRAPHQL_COMMIT_FILES", "false").lower() in ("1", "true", "yes")  # GraphQL 모드에서 commit_files를 REST 커밋 상세 API로 채움
+REPO_WORKERS = int(os.getenv("REPO_WORKERS", 4))  # 동시에 수집할 저장소 수
+DEFER_PR_DETAILS = os.getenv("DEFER_PR_DETAILS", "false").lower() in ("1", "true", "yes")  # PR 상세 정보 나중에 보강
 
 # 데이터 디렉토리 경로
 DATA_DIR = "data"
 
 class GitHubDataCollector:
-    def __init__(self, token):
-        """GitHub 데이터 수집기 초기화"""
-        self.github = Github(token)
-        logger.info(f"GitHub API 연결됨 - 속도 제한: {self.github.get_rate_limit().core.remaining}/{self.github.get_rate_limit().core.limit}")
+    def __init__(self, token, max_workers=MAX_WORKERS, mode=COLLECTION_MODE, defer_pr_details=DEFER_PR_DETAILS):
+        """GitHub 데이터 수집기 초기화 (token은 토큰 하나 또는 토큰 목록)"""
+        self.tokens = [token] if isinstance(token, str) else list(token)
+        self.token = self.tokens[0]
+        self.max_workers = max_workers
+        self.mode = mode
+        self.defer_pr_details = defer_pr_details
+        self.per_page = max(1, min(MAX_ITEMS, MAX_PAGE_SIZE))  # 목록 요청 한 번에 받을 항목 수
+        self._local = threading.local()
+        
+        # 커밋/PR 상세 정보 요청용 작업 스레드 (페이지와 저장소마다 새로 만들지 않고 수집기 수명 동안 재사용하므로
+        # 스레드별 GitHub 클라이언트와 연결도 유지됨, 동시에 수집하는 저장소들이 함께 사용)
+        self._hydration = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="hydrate")
+        
+        # 녹화/재생 모드 (REPLAY_MODE=record|replay): 카세트 파일로 API 응답을 녹화하거나 네트워크 없이 재생
+        self.replay = install_replay()
+        
+        # 조건부 요청 캐시 (304 응답은 기본 속도 제한에 포함되지 않음)
+        self.http_cache = install_http_cache() if HTTP_CACHE_ENABLED else None
+        
+        # SHA 기준 커밋 상세 정보 캐시 (포크/미러에서 이미 수집한 커밋은 상세 정보를 다시 요청하지 않음)
+        self.commit_store = open_commit_store() if COMMIT_STORE_ENABLED else None
+        
+        # 응답 헤더 기반 속도 제한기 (모든 스레드가 공유)
+        # 토큰이 여러 개면 요청마다 남은 한도가 가장 많은 토큰을 사용
+        if len(self.tokens) > 1:
+            self.rate_limiter = install_token_pool(self.tokens)
+        else:
+            self.rate_limiter = install_rate_limiter()
+        
+        # GraphQL 모드: 커밋/PR/이슈를 100개 단위 배치 쿼리로 수집
+        self.graphql = GitHubGraphQLCollector(self.tokens) if mode == "graphql" else None
+        
+        rate_limit = self.github.get_rate_limit()
+        core = getattr(rate_limit, "resources", rate_limit).core
+        logger.info(f"GitHub API 연결됨 - 속도 제한: {core.remaining}/{core.limit} (토큰 {len(self.tokens)}개)")
+    
+    @property
+    def github(self):
+        """현재 스레드 전용 GitHub 클라이언트 (PyGithub 연결 객체는 스레드 간 공유 불가)"""
+        if not hasattr(self._local, "github"):
+            self._local.github = Github(self.token, per_page=self.per_page)
+        return self._local.github
+    
+    def close(self):
+        """상세 정보 작업 스레드 종료 (진행 중인 요청은 끝날 때까지 기다림)"""
+        self._hydration.shutdown(wait=True)
     
     def check_rate_limit(self, min_remaining=10):
-        """GitHub API 속도 제한 확인 및 대기"""
-        rate_limit = self.github.get_rate_limit()
-        remaining = rate_limit.core.remaining
-        
-        if remaining < min_remaining:
-            reset_time = rate_limit.core.reset
-            sleep_time = (reset_time - datetime.utcnow()).total_seconds() + 10  # 10초 추가 여유
-            logger.warning(f"API 속도 제한 거의 도달: {remaining} 남음. {sleep_time:.0f}초 대기 중...")
-            
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-            
-            logger.info(f"API 속도 제한 리셋됨. 새로운 제한: {self.github.get_rate_limit().core.remaining}")
+        """GitHub API 속도 제한 확인 및 대기 (마지막 응답 헤더 기준, 추가 API 호출 없음)"""
+        self.rate_limiter.wait_if_below(max(min_remaining, 1))
     
     def collect_repository_metadata(self, repo_name):
         """저장소의 기본 메타데이터 수집"""
@@ -87,90 +134,19 @@ class GitHubDataCollector:
                 "is_fork": repo.fork
             }
             
-            time.sleep(REQUEST_DELAY)
             return metadata
             
         except Exception as e:
             logger.error(f"저장소 데이터 수집 중 오류 발생: {e}")
             return None
     
-    def collect_commits(self, repo_name, days_back=30, max_commits=1000):
-        """저장소의 커밋 데이터 수집"""
-        logger.info(f"저장소 커밋 수집 중: {repo_name}, {days_back}일 전부터, 최대 {max_commits}개")
+    def collect_commits(self, repo_name, days_back=30, max_commits=1000, since=None):
+        """저장소의 커밋 데이터 수집 (since가 주어지면 해당 시각 이후 커밋만)"""
+        logger.info(f"저장소 커밋 수집 중: {repo_name}, {since or f'{days_back}일 전'}부터, 최대 {max_commits}개")
         
         try:
-            repo = self.github.get_repo(repo_name)
-            since_date = datetime.now() - timedelta(days=days_back)
-            
-            commits_data = []
-            commits = repo.get_commits(since=since_date)
-            
-            with tqdm(total=min(max_commits, commits.totalCount), desc="커밋 수집") as pbar:
-                for i, commit in enumerate(commits):
-                    if i >= max_commits:
-                        break
-                    
-                    try:
-                        # API 속도 제한 확인
-                        if i % 50 == 0:
-                            self.check_rate_limit()
-                        
-                        # 커밋 상세 정보 가져오기
-                        commit_data = {
-                            "repo": repo_name,
-                            "sha": commit.sha,
-                            "author_name": commit.commit.author.name if commit.commit.author else None,
-                            "author_email": commit.commit.author.email if commit.commit.author else None,
-                            "author_login": commit.author.login if commit.author else None,
-                            "committer_name": commit.commit.committer.name if commit.commit.committer else None,
-                            "committer_email": commit.commit.committer.email if commit.commit.committer else None,
-                            "committer_login": commit.committer.login if commit.committer else None,
-                            "date": commit.commit.author.date.isoformat() if commit.commit.author else None,
-                            "message": commit.commit.message,
-                            "url": commit.html_url
-                        }
-                        
-                        # 변경 통계 추가 (API 추가 호출 필요)
-                        try:
-                            detailed_commit = repo.get_commit(commit.sha)
-                            commit_data.update({
-                                "additions": detailed_commit.stats.additions,
-                                "deletions": detailed_commit.stats.deletions,
-                                "total_changes": detailed_commit.stats.total,
-                                "files_changed": len(detailed_commit.files)
-                            })
-                            
-                            # 파일 변경 데이터 (선택적으로 수집 가능)
-                            # files_data = []
-                            # for file in detailed_commit.files:
-                            #    files_data.append({
-                            #        "filename": file.filename,
-                            #        "additions": file.additions,
-                            #        "deletions": file.deletions,
-                            #        "changes": file.changes,
-                            #        "status": file.status
-                            #    })
-                            # commit_data["files"] = files_data
-                            
-                        except Exception as e:
-                            logger.warning(f"커밋 {commit.sha} 상세 정보 가져오기 실패: {e}")
-                            commit_data.update({
-                                "additions": None,
-                                "deletions": None,
-                                "total_changes": None,
-                                "files_changed": None
-                            })
-                        
-                        commits_data.append(commit_data)
-                        time.sleep(REQUEST_DELAY)
-                        pbar.update(1)
-                        
-                    except RateLimitExceededException:
-                        logger.warning("API 속도 제한 도달. 대기 중...")
-                        self.check_rate_limit(min_remaining=0)
-                        
-                    except Exception as e:
-                        logger.error(f"커밋 {commit.sha if hasattr(commit, 'sha') else 'unknown'} 처리 중 오류: {e}")
+            since_date = since or datetime.now(timezone.utc) - timedelta(days=days_back)
+            commits_data = [row for rows, _ in self.iter_commit_pages(repo_name, since_date, max_commits) for row in rows]
             
             logger.info(f"{len(commits_data)} 커밋 수집됨")
             return commits_data
@@ -178,79 +154,150 @@ class GitHubDataCollector:
         except Exception as e:
             logger.error(f"커밋 데이터 수집 중 오류 발생: {e}")
             return []
-
-    def collect_pull_requests(self, repo_name, state='all', max_prs=500):
-        """저장소의 PR 데이터 수집"""
-        logger.info(f"저장소 PR 수집 중: {repo_name}, 상태={state}, 최대 {max_prs}개")
+    
+    def iter_commit_pages(self, repo_name, since, max_commits, start=None):
+        """커밋을 한 페이지씩 수집 (변경 통계 포함)
         
-        try:
-            repo = self.github.get_repo(repo_name)
-            prs_data = []
-            prs = repo.get_pulls(state=state)
+        (행 목록, 다음 페이지 위치)를 반환하며, 마지막 페이지의 다음 위치는 None입니다.
+        start에 이전에 받은 위치를 넘기면 그 페이지부터 이어서 수집합니다.
+        """
+        def fetch_page(page_number):
+            return self.github.get_repo(repo_name, lazy=True).get_commits(since=since).get_page(page_number)
+        
+        count = 0
+        for page, next_page in iter_pages(fetch_page, start or 0, self.per_page, max_commits):
+            page = page[:max_commits - count]
+            count += len(page)
             
-            with tqdm(total=min(max_prs, prs.totalCount), desc="PR 수집") as pbar:
-                for i, pr in enumerate(prs):
-                    if i >= max_prs:
-                        break
+            commits_data = []
+            for commit in page:
+                try:
+                    # 커밋 기본 정보 (목록 응답에 포함된 필드만 사용)
+                    commits_data.append({
+                        "repo": repo_name,
+                        "sha": commit.sha,
+                        "author_name": commit.commit.author.name if commit.commit.author else None,
+                        "author_email": commit.commit.author.email if commit.commit.author else None,
+                        "author_login": commit.author.login if commit.author else None,
+                        "committer_name": commit.commit.committer.name if commit.commit.committer else None,
+                        "committer_email": commit.commit.committer.email if commit.commit.committer else None,
+                        "committer_login": commit.committer.login if commit.committer else None,
+                        "date": commit.commit.author.date.isoformat() if commit.commit.author else None,
+                        "message": commit.commit.message,
+                        "url": commit.html_url
+                    })
                     
-                    try:
-                        # API 속도 제한 확인
-                        if i % 30 == 0:
-                            self.check_rate_limit()
-                        
-                        # PR 기본 정보
-                        pr_data = {
-                            "repo": repo_name,
-                            "number": pr.number,
-                            "title": pr.title,
-                            "body": pr.body,
-                            "state": pr.state,
-                            "created_at": pr.created_at.isoformat(),
-                            "updated_at": pr.updated_at.isoformat(),
-                            "closed_at": pr.closed_at.isoformat() if pr.closed_at else None,
-                            "merged_at": pr.merged_at.isoformat() if pr.merged_at else None,
-                            "merge_commit_sha": pr.merge_commit_sha,
-                            "author_login": pr.user.login if pr.user else None,
-                            "additions": pr.additions,
-                            "deletions": pr.deletions,
-                            "changed_files": pr.changed_files,
-                            "comments": pr.comments,
-                            "review_comments": pr.review_comments,
-                            "commits": pr.commits,
-                            "is_merged": pr.merged,
-                            "url": pr.html_url
+                except RateLimitExceededException:
+                    logger.warning("API 속도 제한 도달. 대기 중...")
+                    self.check_rate_limit(min_remaining=0)
+                    
+                except Exception as e:
+                    logger.error(f"커밋 {commit.sha if hasattr(commit, 'sha') else 'unknown'} 처리 중 오류: {e}")
+            
+            # 변경 통계 추가 (커밋당 API 추가 호출 필요 - 병렬 처리)
+            self.hydrate_commits(repo_name, commits_data)
+            
+            yield commits_data, next_page
+
+    def fetch_commit_stats(self, repo_name, sha):
+        """단일 커밋의 변경 통계 조회 (작업자 스레드에서 호출됨)"""
+        for attempt in range(2):
+            try:
+                detailed_commit = self.github.get_repo(repo_name, lazy=True).get_commit(sha)
+                
+                # PyGithub 2.x의 files는 PaginatedList이므로 이미 받은 응답의 파일 목록을 사용
+                # (파일이 300개를 넘어 목록이 잘린 커밋만 Link 헤더의 다음 페이지들을 추가로 조회)
+                files = detailed_commit.raw_data.get("files", [])
+                if 'rel="next"' in (detailed_commit.raw_headers or {}).get("link", ""):
+                    files = [file.raw_data for file in detailed_commit.files]
+                stats = {
+                    "additions": detailed_commit.stats.additions,
+                    "deletions": detailed_commit.stats.deletions,
+                    "total_changes": detailed_commit.stats.total,
+                    "files_changed": len(files),
+                    # 파일별 변경 내역 (commit_files 하위 테이블로 저장, 추가 API 호출 없음)
+                    "files": [
+                        {
+                            "filename": file["filename"],
+                            "status": file["status"],
+                            "additions": file["additions"],
+                            "deletions": file["deletions"]
                         }
-                        
-                        # PR 리뷰어 정보 (선택적)
-                        try:
-                            reviews = pr.get_reviews()
-                            reviewers = {}
-                            
-                            for review in reviews:
-                                reviewer = review.user.login if review.user else "unknown"
-                                if reviewer not in reviewers:
-                                    reviewers[reviewer] = []
-                                
-                                reviewers[reviewer].append({
-                                    "state": review.state,
-                                    "submitted_at": review.submitted_at.isoformat() if review.submitted_at else None
-                                })
-                            
-                            pr_data["reviewers"] = reviewers
-                            
-                        except Exception as e:
-                            logger.warning(f"PR {pr.number} 리뷰 정보 가져오기 실패: {e}")
-                        
-                        prs_data.append(pr_data)
-                        time.sleep(REQUEST_DELAY)
-                        pbar.update(1)
-                        
-                    except RateLimitExceededException:
-                        logger.warning("API 속도 제한 도달. 대기 중...")
-                        self.check_rate_limit(min_remaining=0)
-                        
-                    except Exception as e:
-                        logger.error(f"PR {pr.number if hasattr(pr, 'number') else 'unknown'} 처리 중 오류: {e}")
+                        for file in files
+                    ]
+                }
+                
+                return stats
+                
+            except RateLimitExceededException:
+                logger.warning("API 속도 제한 도달. 대기 중...")
+                self.check_rate_limit(min_remaining=0)
+                
+            except Exception as e:
+                logger.warning(f"커밋 {sha} 상세 정보 가져오기 실패: {e}")
+                break
+        
+        return {
+            "additions": None,
+            "deletions": None,
+            "total_changes": None,
+            "files_changed": None,
+            "files": None
+        }
+    
+    def hydrate_commits(self, repo_name, commits_data):
+        """커밋 목록에 변경 통계를 병렬로 채움 (수집기의 상세 정보 작업 스레드 사용, 원래 순서 유지)
+        
+        커밋 상세 정보 캐시에 이미 있는 SHA(다른 포크/미러나 이전 수집에서 받은 커밋)는 API를 호출하지 않고
+        저장된 통계를 사용하며, 새로 받은 커밋은 캐시에 추가합니다.
+        """
+        if not commits_data:
+            return commits_data
+        
+        known = self.commit_store.get_stats(commit_data["sha"] for commit_data in commits_data) if self.commit_store else {}
+        pending = [commit_data for commit_data in commits_data if commit_data["sha"] not in known]
+        if known:
+            logger.info(f"{repo_name}: 커밋 {len(known)}개는 캐시된 상세 정보 사용")
+        
+        # executor.map은 입력 순서대로 결과를 반환
+        results = self._hydration.map(
+            lambda commit_data: self.fetch_commit_stats(repo_name, commit_data["sha"]),
+            pending
+        )
+        for commit_data, stats in zip(pending, tqdm(results, total=len(pending), desc="커밋 상세 정보")):
+            commit_data.update(stats)
+        
+        for commit_data in commits_data:
+            if commit_data["sha"] in known:
+                commit_data.update(known[commit_data["sha"]])
+        
+        if self.commit_store:
+            self.commit_store.add(repo_name, commits_data)
+        return commits_data
+
+    def add_commit_files(self, repo_name, commits_data):
+        """GraphQL로 수집한 커밋 행에 REST 커밋 상세 API(또는 커밋 상세 정보 캐시)의 파일별 변경 내역 추가
+        
+        GraphQL Commit 객체에는 파일 목록이 없으므로 REST 모드와 같은 commit_files 테이블을 만들려면
+        커밋마다 상세 요청이 필요합니다. 상세 정보를 가져오지 못한 커밋은 GraphQL 응답의 변경 통계를 유지합니다.
+        """
+        totals = {
+            commit_data["sha"]: {col: commit_data[col] for col in ("additions", "deletions", "total_changes", "files_changed")}
+            for commit_data in commits_data
+        }
+        self.hydrate_commits(repo_name, commits_data)
+        
+        for commit_data in commits_data:
+            if commit_data["files"] is None:
+                commit_data.update(totals[commit_data["sha"]])
+        return commits_data
+
+    def collect_pull_requests(self, repo_name, state='all', max_prs=500, updated_since=None):
+        """저장소의 PR 데이터 수집 (updated_since가 주어지면 그 이후 갱신된 PR만)"""
+        logger.info(f"저장소 PR 수집 중: {repo_name}, 상태={state}, 최대 {max_prs}개")
+        
+        try:
+            prs_data = [row for rows, _ in self.iter_pull_request_pages(repo_name, state, max_prs, updated_since) for row in rows]
             
             logger.info(f"{len(prs_data)} PR 수집됨")
             return prs_data
@@ -258,58 +305,177 @@ class GitHubDataCollector:
         except Exception as e:
             logger.error(f"PR 데이터 수집 중 오류 발생: {e}")
             return []
-
-    def collect_issues(self, repo_name, state='all', max_issues=500):
-        """저장소의 이슈 데이터 수집"""
-        logger.info(f"저장소 이슈 수집 중: {repo_name}, 상태={state}, 최대 {max_issues}개")
+    
+    def iter_pull_request_pages(self, repo_name, state='all', max_prs=500, updated_since=None, start=None):
+        """PR을 한 페이지씩 수집, (행 목록, 다음 페이지 위치) 반환
         
-        try:
-            repo = self.github.get_repo(repo_name)
-            issues_data = []
-            issues = repo.get_issues(state=state)
+        목록 응답에 포함된 필드로 행을 만든 뒤, defer_pr_details가 False이면
+        상세 정보와 리뷰어를 병렬로 채웁니다. True이면 상세 필드는 비워 두고
+        (hydrated=False) hydrate_pull_requests로 나중에 채웁니다.
+        """
+        def fetch_page(page_number):
+            repo = self.github.get_repo(repo_name, lazy=True)
+            if updated_since:
+                # 증분 수집: 최근 갱신 순으로 조회하다가 커서에 도달하면 중단
+                return repo.get_pulls(state=state, sort="updated", direction="desc").get_page(page_number)
+            return repo.get_pulls(state=state).get_page(page_number)
+        
+        count = 0
+        for page, next_page in iter_pages(fetch_page, start or 0, self.per_page, max_prs):
+            page = page[:max_prs - count]
+            count += len(page)
             
-            with tqdm(total=min(max_issues, issues.totalCount), desc="이슈 수집") as pbar:
-                for i, issue in enumerate(issues):
-                    if i >= max_issues:
-                        break
-                    
-                    # PR인 경우 건너뛰기 (PR은 이슈이기도 함)
-                    if issue.pull_request:
-                        continue
+            prs_data = []
+            for pr in page:
+                if updated_since and to_utc(pr.updated_at) <= updated_since:
+                    next_page = None
+                    break
+                
+                try:
+                    # PR 기본 정보 (목록 응답에 포함된 필드만 사용 - 지연 로딩 요청 없음)
+                    prs_data.append({
+                        "repo": repo_name,
+                        "number": pr.number,
+                        "title": pr.title,
+                        "body": pr.body,
+                        "state": pr.state,
+                        "created_at": pr.created_at.isoformat(),
+                        "updated_at": pr.updated_at.isoformat(),
+                        "closed_at": pr.closed_at.isoformat() if pr.closed_at else None,
+                        "merged_at": pr.merged_at.isoformat() if pr.merged_at else None,
+                        "merge_commit_sha": pr.merge_commit_sha,
+                        "author_login": pr.user.login if pr.user else None,
+                        "is_merged": pr.merged_at is not None,
+                        "url": pr.html_url,
+                        "hydrated": False
+                    })
                     
-                    try:
-                        # API 속도 제한 확인
-                        if i % 30 == 0:
-                            self.check_rate_limit()
-                        
-                        # 이슈 기본 정보
-                        issue_data = {
-                            "repo": repo_name,
-                            "number": issue.number,
-                            "title": issue.title,
-                            "body": issue.body,
-                            "state": issue.state,
-                            "created_at": issue.created_at.isoformat(),
-                            "updated_at": issue.updated_at.isoformat(),
-                            "closed_at": issue.closed_at.isoformat() if issue.closed_at else None,
-                            "author_login": issue.user.login if issue.user else None,
-                            "assignees": [assignee.login for assignee in issue.assignees],
-                            "comments": issue.comments,
-                            "labels": [label.name for label in issue.labels],
-                            "milestone": issue.milestone.title if issue.milestone else None,
-                            "url": issue.html_url
-                        }
-                        
-                        issues_data.append(issue_data)
-                        time.sleep(REQUEST_DELAY)
-                        pbar.update(1)
-                        
-                    except RateLimitExceededException:
-                        logger.warning("API 속도 제한 도달. 대기 중...")
-                        self.check_rate_limit(min_remaining=0)
-                        
-                    except Exception as e:
-                        logger.error(f"이슈 {issue.number if hasattr(issue, 'number') else 'unknown'} 처리 중 오류: {e}")
+                except Exception as e:
+                    logger.error(f"PR {pr.number if hasattr(pr, 'number') else 'unknown'} 처리 중 오류: {e}")
+            
+            # 상세 정보 및 리뷰어 추가 (PR당 API 추가 호출 필요 - 병렬 처리)
+            if not self.defer_pr_details:
+                self.hydrate_pr_rows(repo_name, prs_data)
+            
+            yield prs_data, next_page
+            if next_page is None:
+                return
+    
+    def fetch_pull_request_details(self, repo_name, number):
+        """단일 PR의 상세 정보와 리뷰어 조회 (작업자 스레드에서 호출됨)"""
+        for attempt in range(2):
+            try:
+                pr = self.github.get_repo(repo_name, lazy=True).get_pull(number)
+                details = {
+                    "additions": pr.additions,
+                    "deletions": pr.deletions,
+                    "changed_files": pr.changed_files,
+                    "comments": pr.comments,
+                    "review_comments": pr.review_comments,
+                    "commits": pr.commits,
+                    "is_merged": pr.merged,
+                    "hydrated": True
+                }
+                
+            except RateLimitExceededException:
+                logger.warning("API 속도 제한 도달. 대기 중...")
+                self.check_rate_limit(min_remaining=0)
+                continue
+                
+            except Exception as e:
+                logger.warning(f"PR {number} 상세 정보 가져오기 실패: {e}")
+                return {}
+            
+            # PR 리뷰 목록 (pr_reviews 테이블로 저장, 실패하면 hydrated=False로 남겨 다음 보강 때 다시 시도)
+            try:
+                details["reviews"] = [
+                    {
+                        "reviewer": review.user.login if review.user else "unknown",
+                        "state": review.state,
+                        "submitted_at": review.submitted_at.isoformat() if review.submitted_at else None
+                    }
+                    for review in pr.get_reviews()
+                ]
+                
+            except Exception as e:
+                logger.warning(f"PR {number} 리뷰 정보 가져오기 실패: {e}")
+                details["hydrated"] = False
+            
+            return details
+        
+        return {}
+    
+    def hydrate_pr_rows(self, repo_name, prs_data):
+        """PR 행 목록에 상세 정보와 리뷰어를 병렬로 채움 (수집기의 상세 정보 작업 스레드 사용, 원래 순서 유지)"""
+        if not prs_data:
+            return prs_data
+        
+        results = self._hydration.map(
+            lambda pr_data: self.fetch_pull_request_details(repo_name, pr_data["number"]),
+            prs_data
+        )
+        for pr_data, details in zip(prs_data, tqdm(results, total=len(prs_data), desc="PR 상세 정보")):
+            pr_data.update(details)
+        
+        return prs_data
+    
+    def hydrate_pull_requests(self, repo_name, batch_size=100):
+        """빠른 수집(defer_pr_details)으로 저장된 PR의 상세 정보를 나중에 채움
+        
+        pull_requests 테이블에서 hydrated가 아닌 PR만 골라 batch_size개씩 병렬로 조회하고,
+        배치마다 CSV를 다시 저장하므로 중단되더라도 다시 실행하면 남은 PR부터 이어서 채웁니다.
+        리뷰는 pr_reviews 테이블에 PR 단위로 교체하여 PR 행보다 먼저 저장합니다.
+        """
+        repo_dir = os.path.join(DATA_DIR, repo_name.replace("/", "_"))
+        if not storage.table_exists(repo_dir, "pull_requests"):
+            logger.warning(f"{repo_name}: 보강할 PR 데이터가 없습니다.")
+            return 0
+        
+        prs_df = storage.read_table(repo_dir, "pull_requests", text=True)
+        if "hydrated" not in prs_df.columns:
+            prs_df["hydrated"] = None
+        
+        # 이전 버전에서 수집한 행(hydrated 없음)은 상세 정보가 있으면 보강된 것으로 간주
+        prs_df["hydrated"] = prs_df["hydrated"].astype(object).fillna(prs_df["additions"].notna())
+        
+        pending = prs_df.index[prs_df["hydrated"] != True].tolist()
+        logger.info(f"{repo_name}: PR {len(pending)}개 상세 정보 보강 시작")
+        
+        hydrated = 0
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            rows = self.hydrate_pr_rows(repo_name, [{"repo": repo_name, "number": int(prs_df.at[i, "number"])} for i in batch])
+            hydrated += sum(bool(row.get("hydrated")) for row in rows)
+            
+            # 리뷰를 가져온 PR의 기존 리뷰 행 교체
+            reviewed = [row for row in rows if "reviews" in row]
+            if reviewed:
+                reviews_df = pd.DataFrame(child_rows(reviewed, "pull_requests"), columns=CHILD_TABLES["pull_requests"]["columns"])
+                existing = storage.read_table(repo_dir, "pr_reviews") if storage.table_exists(repo_dir, "pr_reviews") else None
+                merged = upsert_child_rows(existing, reviews_df, "pull_requests", [row["number"] for row in reviewed])
+                storage.write_table(merged, repo_dir, "pr_reviews")
+            
+            # 조회에 실패한 PR은 값이 비어 있으므로 update()가 기존 값을 유지함
+            updates = pd.DataFrame(rows, index=batch).drop(columns=["repo", "number", "reviews"], errors="ignore")
+            updates = updates.map(lambda x: json.dumps(x) if isinstance(x, (dict, list)) else x)
+            for col in updates.columns:
+                if col not in prs_df.columns:
+                    prs_df[col] = None
+                prs_df[col] = prs_df[col].astype(object)
+            prs_df.update(updates)
+            
+            # 배치마다 저장 (임시 파일에 쓴 뒤 교체)
+            storage.write_table(prs_df, repo_dir, "pull_requests")
+            logger.info(f"{repo_name}: PR 상세 정보 {start + len(batch)}/{len(pending)} 처리됨")
+        
+        return hydrated
+    
+    def collect_issues(self, repo_name, state='all', max_issues=500, updated_since=None):
+        """저장소의 이슈 데이터 수집 (updated_since가 주어지면 그 이후 갱신된 이슈만)"""
+        logger.info(f"저장소 이슈 수집 중: {repo_name}, 상태={state}, 최대 {max_issues}개")
+        
+        try:
+            issues_data = [row for rows, _ in self.iter_issue_pages(repo_name, state, max_issues, updated_since) for row in rows]
             
             logger.info(f"{len(issues_data)} 이슈 수집됨")
             return issues_data
@@ -317,10 +483,73 @@ class GitHubDataCollector:
         except Exception as e:
             logger.error(f"이슈 데이터 수집 중 오류 발생: {e}")
             return []
+    
+    def iter_issue_pages(self, repo_name, state='all', max_issues=500, updated_since=None, start=None):
+        """이슈를 한 페이지씩 수집 (PR 제외), (행 목록, 다음 페이지 위치) 반환
+        
+        이슈 목록에는 PR도 섞여 있으므로 PR을 걸러낸 이슈만 max_issues에 포함합니다.
+        """
+        def fetch_page(page_number):
+            repo = self.github.get_repo(repo_name, lazy=True)
+            if updated_since:
+                return repo.get_issues(state=state, since=updated_since).get_page(page_number)
+            return repo.get_issues(state=state).get_page(page_number)
+        
+        count = 0
+        for page, next_page in iter_pages(fetch_page, start or 0, self.per_page):
+            issues_data = []
+            for issue in page:
+                # PR인 경우 건너뛰기 (PR은 이슈이기도 함)
+                if is_pull_request(issue):
+                    continue
+                if count >= max_issues:
+                    break
+                count += 1
+                
+                try:
+                    # 이슈 기본 정보
+                    issues_data.append({
+                        "repo": repo_name,
+                        "number": issue.number,
+                        "title": issue.title,
+                        "body": issue.body,
+                        "state": issue.state,
+                        "created_at": issue.created_at.isoformat(),
+                        "updated_at": issue.updated_at.isoformat(),
+                        "closed_at": issue.closed_at.isoformat() if issue.closed_at else None,
+                        "author_login": issue.user.login if issue.user else None,
+                        "assignees": [assignee.login for assignee in issue.assignees],
+                        "comments": issue.comments,
+                        "labels": [label.name for label in issue.labels],
+                        "milestone": issue.milestone.title if issue.milestone else None,
+                        "url": issue.html_url
+                    })
+                    
+                except RateLimitExceededException:
+                    logger.warning("API 속도 제한 도달. 대기 중...")
+                    self.check_rate_limit(min_remaining=0)
+                    
+                except Exception as e:
+                    logger.error(f"이슈 {issue.number if hasattr(issue, 'number') else 'unknown'} 처리 중 오류: {e}")
+            
+            yield issues_data, next_page
+            if count >= max_issues:
+                return
 
-    def collect_repository_data(self, repo_name, days_back=30, max_items=None):
-        """저장소의 전체 데이터 수집"""
-        logger.info(f"저장소 {repo_name} 전체 데이터 수집 시작")
+    def collect_repository_data(self, repo_name, days_back=30, max_items=None, incremental=False, resume=False):
+        """저장소의 전체 데이터 수집
+        
+        커밋/PR/이슈는 페이지 단위로 <entity>.partial.csv에 이어 쓰고 페이지마다
+        체크포인트를 남기므로, 메모리 사용량이 저장소 크기와 무관하게 일정합니다.
+        엔터티 수집이 끝나면 partial 파일을 최종 테이블(STORAGE_FORMAT에 따라 <entity>.csv 또는 .parquet)로 교체합니다.
+        
+        incremental=True이면 저장된 커서 이후 변경분만 가져와 기존 데이터에 병합(upsert)합니다.
+        Parquet/partitioned 형식은 기존 파일을 다시 쓰지 않고 변경분을 델타 조각으로 추가하며,
+        테이블의 델타가 COMPACT_MIN_DELTAS개 이상 쌓이면 수집 끝에 기본 파일로 압축합니다.
+        resume=True이면 중단된 이전 수집의 체크포인트부터 이어서 수집합니다.
+        반환값의 commits/pull_requests/issues는 수집된 행 수입니다.
+        """
+        logger.info(f"저장소 {repo_name} 전체 데이터 수집 시작{' (증분)' if incremental else ''}{' (재개)' if resume else ''}")
         
         # 기본값 설정
         if max_items is None:
@@ -330,62 +559,258 @@ class GitHubDataCollector:
                 "issues": 100
             }
         
-        # 저장소 메타데이터 수집
-        metadata = self.collect_repository_metadata(repo_name)
-        
-        # 커밋 데이터 수집
-        commits = self.collect_commits(repo_name, days_back=days_back, max_commits=max_items["commits"])
+        repo_dir = os.path.join(DATA_DIR, repo_name.replace("/", "_"))
+        os.makedirs(repo_dir, exist_ok=True)
+        state = CollectionState(repo_dir)
         
-        # PR 데이터 수집
-        pull_requests = self.collect_pull_requests(repo_name, max_prs=max_items["pull_requests"])
+        # 재개하지 않으면 이전 체크포인트와 partial 파일 삭제
+        if not resume:
+            state.clear_checkpoints()
+            for table in list(ENTITY_KEYS) + [child["table"] for child in CHILD_TABLES.values()]:
+                partial_path = os.path.join(repo_dir, f"{table}.partial.csv")
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
         
-        # 이슈 데이터 수집
-        issues = self.collect_issues(repo_name, max_issues=max_items["issues"])
+        # 증분 수집 커서 (첫 수집이면 None → 전체 기간 수집)
+        cursors = {entity: state.cursor_time(entity) if incremental else None for entity in ENTITY_KEYS}
         
-        # 각 데이터 판다스 DataFrame으로 변환
-        metadata_df = pd.DataFrame([metadata]) if metadata else pd.DataFrame()
-        commits_df = pd.DataFrame(commits) if commits else pd.DataFrame()
-        prs_df = pd.DataFrame(pull_requests) if pull_requests else pd.DataFrame()
-        issues_df = pd.DataFrame(issues) if issues else pd.DataFrame()
+        # 저장소 메타데이터 수집
+        metadata = self.collect_repository_metadata(repo_name)
+        if metadata:
+            pd.DataFrame([metadata]).to_csv(os.path.join(repo_dir, "metadata.csv"), index=False)
         
-        # JSON 형태로 저장된 열 처리
-        for df in [prs_df, issues_df]:
-            for col in df.columns:
-                if df[col].apply(lambda x: isinstance(x, (dict, list))).any():
-                    df[col] = df[col].apply(lambda x: json.dumps(x) if isinstance(x, (dict, list)) else x)
+        # 커밋/PR/이슈를 페이지 단위로 수집하여 바로 저장
+        counts = {}
+        completed = True
+        for entity in ENTITY_KEYS:
+            counts[entity] = self.stream_entity(repo_name, entity, state, repo_dir, max_items[entity],
+                                                days_back, cursors[entity], incremental)
+            completed = completed and state.get_checkpoint(entity)["done"]
+            
+            # 최대 개수에 도달하면 커서 이후 변경분 일부가 누락될 수 있음
+            if cursors[entity] and counts[entity] >= max_items[entity]:
+                logger.warning(f"{repo_name} {entity}: 증분 변경분이 최대 개수({max_items[entity]})에 도달했습니다. 일부 변경이 누락되었을 수 있습니다.")
         
-        # 결과 저장
-        repo_dir = os.path.join(DATA_DIR, repo_name.replace("/", "_"))
-        os.makedirs(repo_dir, exist_ok=True)
+        # 모든 엔터티가 끝난 경우에만 체크포인트 삭제 (실패 시 --resume으로 이어서 수집)
+        if completed:
+            state.clear_checkpoints()
+        state.save()
         
-        if not metadata_df.empty:
-            metadata_df.to_csv(os.path.join(repo_dir, "metadata.csv"), index=False)
-        if not commits_df.empty:
-            commits_df.to_csv(os.path.join(repo_dir, "commits.csv"), index=False)
-        if not prs_df.empty:
-            prs_df.to_csv(os.path.join(repo_dir, "pull_requests.csv"), index=False)
-        if not issues_df.empty:
-            issues_df.to_csv(os.path.join(repo_dir, "issues.csv"), index=False)
+        # 증분 수집으로 델타 조각이 많이 쌓인 테이블은 기본 파일에 합침
+        if incremental and storage.COMPACT_MIN_DELTAS > 0:
+            storage.compact_repository(repo_dir, storage.COMPACT_MIN_DELTAS)
         
-        logger.info(f"저장소 {repo_name} 데이터 수집 완료")
-        logger.info(f"수집된 데이터: {len(commits)} 커밋, {len(pull_requests)} PR, {len(issues)} 이슈")
+        logger.info(f"저장소 {repo_name} 데이터 수집 {'완료' if completed else '중단 (--resume으로 재개 가능)'}")
+        logger.info(f"수집된 데이터: {counts['commits']} 커밋, {counts['pull_requests']} PR, {counts['issues']} 이슈")
+        if self.http_cache:
+            logger.info(f"HTTP 캐시: {self.http_cache.stats()}")
         
         return {
             "metadata": metadata,
-            "commits": commits,
-            "pull_requests": pull_requests,
-            "issues": issues
+            **counts,
+            "completed": completed
         }
+    
+    def collect_repositories(self, repo_names, workers=REPO_WORKERS, **kwargs):
+        """여러 저장소를 동시에 수집하고 저장소별 처리량 요약 출력
+        
+        저장소마다 작업자 스레드 하나가 collect_repository_data를 실행하며,
+        속도 제한기와 토큰 풀은 모든 저장소가 공유합니다. 한 저장소에서 발생한
+        오류는 해당 저장소만 실패로 기록하고 나머지 수집은 계속합니다.
+        kwargs는 collect_repository_data에 그대로 전달됩니다.
+        """
+        def collect_one(repo_name):
+            start_time = time.time()
+            summary = {"repo": repo_name, "status": "완료", "commits": 0, "pull_requests": 0, "issues": 0}
+            
+            try:
+                result = self.collect_repository_data(repo_name, **kwargs)
+                summary.update({entity: result[entity] for entity in ENTITY_KEYS})
+                if not result["completed"]:
+                    summary["status"] = "중단"
+                
+            except Exception as e:
+                logger.error(f"{repo_name} 처리 중 예상치 못한 오류 발생: {e}")
+                summary["status"] = "실패"
+            
+            summary["elapsed_sec"] = round(time.time() - start_time, 1)
+            return summary
+        
+        logger.info(f"저장소 {len(repo_names)}개 수집 시작 (동시 작업 {workers}개)")
+        start_time = time.time()
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            summaries = list(executor.map(collect_one, repo_names))
+        
+        # 저장소별 처리량 요약
+        summary_df = pd.DataFrame(summaries)
+        summary_df["items"] = summary_df[list(ENTITY_KEYS)].sum(axis=1)
+        summary_df["items_per_sec"] = (summary_df["items"] / summary_df["elapsed_sec"].clip(lower=0.1)).round(1)
+        
+        elapsed = time.time() - start_time
+        logger.info(
+            f"저장소 수집 요약 (총 {elapsed:.1f}초, {summary_df['items'].sum()}개 항목, "
+            f"{summary_df['items'].sum() / max(elapsed, 0.1):.1f}개/초):\n{summary_df.to_string(index=False)}"
+        )
+        
+        failed = summary_df[summary_df["status"] != "완료"]["repo"].tolist()
+        if failed:
+            logger.warning(f"완료되지 않은 저장소 {len(failed)}개: {', '.join(failed)}")
+        
+        return summaries
+    
+    def stream_entity(self, repo_name, entity, state, repo_dir, max_items, days_back, cursor, incremental):
+        """엔터티 하나를 페이지 단위로 partial CSV에 쓰고 체크포인트 갱신 후, 끝나면 최종 테이블로 반영
+        
+        체크포인트에는 다음 페이지 위치와 그때까지의 partial 파일 크기를 기록합니다.
+        재개 시 마지막 체크포인트 이후에 쓰인 부분은 잘라내므로 중복 행이 생기지 않습니다.
+        하위 테이블(CHILD_TABLES, 예: commit_files)은 같은 페이지에서 함께 기록됩니다.
+        """
+        partial_path = os.path.join(repo_dir, f"{entity}.partial.csv")
+        child = CHILD_TABLES.get(entity)
+        child_partial_path = os.path.join(repo_dir, f"{child['table']}.partial.csv") if child else None
+        checkpoint = state.get_checkpoint(entity)
+        
+        if checkpoint and checkpoint["mode"] != self.mode:
+            logger.warning(f"{repo_name} {entity}: 수집 방식이 달라 체크포인트를 무시하고 처음부터 수집합니다.")
+            checkpoint = None
+        if checkpoint and not checkpoint["done"] and checkpoint["rows"] and not os.path.exists(partial_path):
+            logger.warning(f"{repo_name} {entity}: partial 파일이 없어 처음부터 수집합니다.")
+            checkpoint = None
+        
+        if checkpoint is None:
+            # 커밋 기준 시각은 재개 시에도 같은 범위를 수집하도록 체크포인트에 고정
+            since = cursor if entity != "commits" else cursor or datetime.now(timezone.utc) - timedelta(days=days_back)
+            checkpoint = {"mode": self.mode, "position": None, "rows": 0, "bytes": 0, "child_bytes": 0,
+                          "params": {"since": since.isoformat() if since else None}, "done": False}
+            for path in (partial_path, child_partial_path):
+                if path and os.path.exists(path):
+                    os.remove(path)
+        elif checkpoint["done"]:
+            logger.info(f"{repo_name} {entity}: 이전 수집에서 완료됨")
+            return checkpoint["rows"]
+        else:
+            logger.info(f"{repo_name} {entity}: {checkpoint['rows']}개 수집된 체크포인트부터 재개")
+            with open(partial_path, "r+b") as f:
+                f.truncate(checkpoint["bytes"])
+            if child_partial_path and os.path.exists(child_partial_path):
+                with open(child_partial_path, "r+b") as f:
+                    f.truncate(checkpoint.get("child_bytes", 0))
+        
+        since = to_utc(checkpoint["params"]["since"])
+        remaining = max_items - checkpoint["rows"]
+        
+        # 수집 방식 선택 (REST 또는 GraphQL - 두 방식 모두 같은 스키마의 행 반환)
+        source = self.graphql if self.mode == "graphql" else self
+        if entity == "commits":
+            pages = source.iter_commit_pages(repo_name, since, remaining, start=checkpoint["position"])
+            if self.mode == "graphql" and GRAPHQL_COMMIT_FILES:
+                pages = ((self.add_commit_files(repo_name, rows), position) for rows, position in pages)
+            elif self.mode == "graphql":
+                logger.warning(f"{repo_name}: GraphQL 모드에서는 파일별 변경 내역(commit_files)을 수집하지 않습니다 "
+                               f"(GRAPHQL_COMMIT_FILES=true이면 REST 커밋 상세 API로 채움)")
+        elif entity == "pull_requests":
+            pages = source.iter_pull_request_pages(repo_name, "all", remaining, since, start=checkpoint["position"])
+        else:
+            pages = source.iter_issue_pages(repo_name, "all", remaining, since, start=checkpoint["position"])
+        
+        logger.info(f"저장소 {entity} 수집 중: {repo_name}, 최대 {max_items}개")
+        
+        try:
+            with tqdm(total=max_items, initial=checkpoint["rows"], desc=f"{entity} 수집") as pbar:
+                for rows, position in pages if remaining > 0 else []:
+                    df = pd.DataFrame(rows, columns=ENTITY_COLUMNS[entity])
+                    
+                    # JSON 형태로 저장된 열 처리
+                    for col in df.columns:
+                        if df[col].apply(lambda x: isinstance(x, (dict, list))).any():
+                            df[col] = df[col].apply(lambda x: json.dumps(x) if isinstance(x, (dict, list)) else x)
+                    
+                    df.to_csv(partial_path, mode="a", header=checkpoint["bytes"] == 0, index=False)
+                    
+                    # 하위 테이블 행 (상위 행을 만들 때 이미 받은 데이터에서 추출)
+                    if child:
+                        child_df = pd.DataFrame(child_rows(rows, entity), columns=child["columns"])
+                        if not child_df.empty:
+                            child_df.to_csv(child_partial_path, mode="a", header=not checkpoint.get("child_bytes"), index=False)
+                            checkpoint["child_bytes"] = os.path.getsize(child_partial_path)
+                    
+                    checkpoint.update(position=position, rows=checkpoint["rows"] + len(df),
+                                      bytes=os.path.getsize(partial_path))
+                    state.set_checkpoint(entity, checkpoint)
+                    state.save()
+                    pbar.update(len(df))
+        
+        except Exception as e:
+            logger.error(f"{repo_name} {entity} 수집 중 오류 발생 ({checkpoint['rows']}개 저장됨): {e}")
+            state.set_checkpoint(entity, checkpoint)
+            return checkpoint["rows"]
+        
+        # 최종 테이블에 반영 (수집된 행이 없으면 기존 파일 유지)
+        if checkpoint["rows"]:
+            if child:
+                self.finalize_child_table(repo_dir, entity, partial_path, incremental)
+            
+            if incremental and storage.supports_deltas(repo_dir, entity):
+                # 증분 수집 (Parquet/partitioned): 기존 파일은 그대로 두고 변경분만 델타 조각으로 추가
+                storage.append_delta(storage.read_csv(partial_path, entity), repo_dir, entity)
+                os.remove(partial_path)
+            elif incremental and storage.table_exists(repo_dir, entity):
+                # 증분 수집: 기존 데이터와 키(sha/number) 기준으로 병합
+                merged = upsert_rows(storage.read_table(repo_dir, entity, text=True), storage.read_csv(partial_path, entity), entity)
+                storage.write_table(merged, repo_dir, entity)
+                os.remove(partial_path)
+            else:
+                storage.finalize_partial(partial_path, repo_dir, entity)
+            
+            keys = ENTITY_KEYS[entity]
+            state.update_cursor(entity, storage.read_table(repo_dir, entity, columns=list({keys["key"], keys["cursor"]})))
+        else:
+            for path in (partial_path, child_partial_path):
+                if path and os.path.exists(path):
+                    os.remove(path)
+        
+        logger.info(f"{checkpoint['rows']} {entity} 수집됨")
+        checkpoint["done"] = True
+        state.set_checkpoint(entity, checkpoint)
+        state.save()
+        return checkpoint["rows"]
+    
+    def finalize_child_table(self, repo_dir, entity, partial_path, incremental):
+        """하위 테이블 partial CSV를 최종 테이블로 반영 (상위 partial 파일을 교체하기 전에 호출)
+        
+        증분 수집이면 이번에 수집된 상위 키의 기존 행을 새 행으로 교체합니다
+        (Parquet/partitioned 형식은 상위 키의 삭제 표시와 새 행을 델타 조각으로 추가).
+        하위 행이 하나도 없으면 (GraphQL 모드 등) 기존 파일을 유지합니다.
+        """
+        table = CHILD_TABLES[entity]["table"]
+        child_partial_path = os.path.join(repo_dir, f"{table}.partial.csv")
+        if not os.path.exists(child_partial_path):
+            return
+        
+        if incremental and storage.table_exists(repo_dir, table):
+            key = ENTITY_KEYS[entity]["key"]
+            parent_keys = storage.read_csv(partial_path, entity, usecols=[key])[key]
+            if storage.supports_deltas(repo_dir, table):
+                storage.append_delta(storage.read_csv(child_partial_path, table), repo_dir, table, deleted_keys=parent_keys.unique())
+                os.remove(child_partial_path)
+                return
+            
+            merged = upsert_child_rows(storage.read_table(repo_dir, table), storage.read_csv(child_partial_path, table), entity, parent_keys)
+            storage.write_table(merged, repo_dir, table)
+            os.remove(child_partial_path)
+        else:
+            storage.finalize_partial(child_partial_path, repo_dir, table)
 
 def main():
     """메인 함수"""
     # 토큰 유효성 확인
-    if not GITHUB_TOKEN or GITHUB_TOKEN == "your_github_token_here":
+    if not GITHUB_TOKENS:
         logger.error("유효한 GitHub 토큰이 필요합니다. .env 파일에 GITHUB_TOKEN을 설정하세요.")
         sys.exit(1)
     
     # 수집기 초기화
-    collector = GitHubDataCollector(GITHUB_TOKEN)
+    collector = GitHubDataCollector(GITHUB_TOKENS)
     
     # 분석할 리포지토리 리스트
     repositories = [
@@ -414,22 +839,14 @@ def main():
         "issues": 50         # 저장소당 최대 이슈 수
     }
     
-    # 모든 저장소에 대한 데이터 수집
-    for repo_name in repos_to_collect:
-        logger.info(f"===== {repo_name} 데이터 수집 시작 =====")
-        
-        try:
-            collector.collect_repository_data(
-                repo_name=repo_name,
-                days_back=days_back,
-                max_items=max_items
-            )
-            
-        except Exception as e:
-            logger.error(f"{repo_name} 처리 중 예상치 못한 오류 발생: {e}")
-        
-        logger.info(f"===== {repo_name} 데이터 수집 완료 =====\n")
+    # 모든 저장소에 대한 데이터 수집 (저장소별 오류는 격리되어 요약에 표시됨)
+    collector.collect_repositories(
+        repos_to_collect,
+        days_back=days_back,
+        max_items=max_items
+    )
     
+    collector.close()
     logger.info("모든 데이터 수집 작업 완료!")
 
 if __name__ == "__main__":
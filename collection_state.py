@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# github_analyzer/collection_state.py
+
+import os
+import json
+import pandas as pd
+from datetime import datetime, timezone
+
+# 저장소별 수집 상태 파일 이름
+STATE_FILE = "collection_state.json"
+
+# 엔터티별 고유 키, 정렬 기준 열, 증분 커서 기준 열
+ENTITY_KEYS = {
+    "commits": {"key": "sha", "sort": "date", "cursor": "date"},
+    "pull_requests": {"key": "number", "sort": "created_at", "cursor": "updated_at"},
+    "issues": {"key": "number", "sort": "created_at", "cursor": "updated_at"}
+}
+
+# 엔터티별 CSV 열 순서 (페이지 단위로 이어 쓰므로 모든 페이지가 같은 열을 가져야 함)
+ENTITY_COLUMNS = {
+    "commits": [
+        "repo", "sha", "author_name", "author_email", "author_login",
+        "committer_name", "committer_email", "committer_login", "date", "message", "url",
+        "additions", "deletions", "total_changes", "files_changed"
+    ],
+    "pull_requests": [
+        "repo", "number", "title", "body", "state", "created_at", "updated_at", "closed_at",
+        "merged_at", "merge_commit_sha", "author_login", "additions", "deletions", "changed_files",
+        "comments", "review_comments", "commits", "is_merged", "url", "hydrated"
+    ],
+    "issues": [
+        "repo", "number", "title", "body", "state", "created_at", "updated_at", "closed_at",
+        "author_login", "assignees", "comments", "labels", "milestone", "url"
+    ]
+}
+
+# 엔터티별 하위 테이블: 상위 행의 목록 필드(field)를 한 항목당 한 행으로 펼쳐 별도 CSV로 저장
+# (상위 행의 repo와 키 열이 앞에 붙음, 키 열 이름은 parent_key로 바꿀 수 있음, 상위 CSV에는 목록 필드가 저장되지 않음)
+CHILD_TABLES = {
+    "commits": {
+        "table": "commit_files",
+        "field": "files",
+        "columns": ["repo", "sha", "filename", "status", "additions", "deletions"]
+    },
+    "pull_requests": {
+        "table": "pr_reviews",
+        "field": "reviews",
+        "parent_key": "pr_number",
+        "columns": ["repo", "pr_number", "reviewer", "state", "submitted_at"]
+    }
+}
+
+def to_utc(value):
+    """ISO 문자열 또는 datetime을 UTC 기준 aware datetime으로 변환"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        # PyGithub 1.x는 UTC 기준 naive datetime을 반환
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+class CollectionState:
+    """저장소별 증분 수집 커서(high-water mark) 관리
+
+    data/<owner_repo>/collection_state.json 형식:
+        {"cursors": {"commits": {"date": ..., "sha": ...},
+                     "pull_requests": {"updated_at": ...},
+                     "issues": {"updated_at": ...}}}
+    """
+    
+    def __init__(self, repo_dir):
+        """수집 상태 로드 (파일이 없으면 빈 상태)"""
+        self.path = os.path.join(repo_dir, STATE_FILE)
+        self.data = {"cursors": {}, "checkpoints": {}}
+        
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.data = json.load(f)
+            self.data.setdefault("cursors", {})
+            self.data.setdefault("checkpoints", {})
+    
+    def get_cursor(self, entity):
+        """엔터티의 마지막 커서 반환 (없으면 None)"""
+        return self.data["cursors"].get(entity)
+    
+    def cursor_time(self, entity):
+        """엔터티 커서의 기준 시각을 UTC datetime으로 반환"""
+        cursor = self.get_cursor(entity)
+        if not cursor:
+            return None
+        return to_utc(cursor[ENTITY_KEYS[entity]["cursor"]])
+    
+    def update_cursor(self, entity, df):
+        """수집된 데이터의 최댓값으로 엔터티 커서 갱신"""
+        column = ENTITY_KEYS[entity]["cursor"]
+        if df.empty or column not in df.columns:
+            return
+        
+        times = pd.to_datetime(df[column], errors='coerce', utc=True)
+        if times.isna().all():
+            return
+        
+        latest = times.idxmax()
+        cursor = {column: times[latest].isoformat()}
+        if entity == "commits":
+            cursor["sha"] = df.loc[latest, "sha"]
+        
+        # 커서는 뒤로 이동하지 않음
+        previous = self.cursor_time(entity)
+        if previous is None or times[latest] >= previous:
+            self.data["cursors"][entity] = cursor
+    
+    def get_checkpoint(self, entity):
+        """엔터티의 페이지 체크포인트 반환 (없으면 None)"""
+        return self.data["checkpoints"].get(entity)
+    
+    def set_checkpoint(self, entity, checkpoint):
+        """엔터티의 페이지 체크포인트 기록 (save() 호출 시 저장)"""
+        self.data["checkpoints"][entity] = checkpoint
+    
+    def clear_checkpoints(self):
+        """모든 체크포인트 삭제"""
+        self.data["checkpoints"] = {}
+    
+    def save(self):
+        """상태 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+def child_key(entity):
+    """하위 테이블에서 상위 행을 가리키는 키 열 이름"""
+    return CHILD_TABLES[entity].get("parent_key", ENTITY_KEYS[entity]["key"])
+
+def child_rows(rows, entity):
+    """상위 행 목록에서 하위 테이블 행 추출 (목록 필드가 없거나 None인 행은 건너뜀)"""
+    key = ENTITY_KEYS[entity]["key"]
+    field = CHILD_TABLES[entity]["field"]
+    return [
+        {"repo": row["repo"], child_key(entity): row[key], **item}
+        for row in rows
+        for item in row.get(field) or []
+    ]
+
+def upsert_child_rows(existing_df, new_df, entity, parent_keys):
+    """하위 테이블 병합: 새로 수집된 상위 키(parent_keys)의 기존 행을 모두 새 행으로 교체"""
+    if existing_df is None or existing_df.empty:
+        return new_df
+    
+    key = child_key(entity)
+    kept = existing_df[~existing_df[key].isin(parent_keys)]
+    return pd.concat([new_df, kept], ignore_index=True)
+
+def upsert_rows(existing_df, new_df, entity):
+    """기존 데이터에 새 데이터를 키 기준으로 병합 (같은 키는 새 행으로 교체)"""
+    if existing_df is None or existing_df.empty:
+        return new_df
+    if new_df.empty:
+        return existing_df
+    
+    key = ENTITY_KEYS[entity]["key"]
+    sort_col = ENTITY_KEYS[entity]["sort"]
+    
+    merged = pd.concat([existing_df, new_df], ignore_index=True)
+    merged = merged.drop_duplicates(subset=key, keep='last')
+    
+    # 최신 항목이 먼저 오도록 정렬 (API 반환 순서와 동일)
+    if sort_col in merged.columns:
+        merged["_order"] = pd.to_datetime(merged[sort_col], errors='coerce', utc=True)
+        merged = merged.sort_values("_order", ascending=False, kind='stable', na_position='last')
+        merged = merged.drop(columns="_order")
+    
+    return merged.reset_index(drop=True)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# github_analyzer/commit_store.py
+
+"""SHA를 키로 커밋 상세 정보(변경 통계)를 보관하는 조회 캐시 (SQLite)
+
+포크나 미러처럼 이력을 공유하는 저장소들은 같은 커밋의 상세 정보를 저장소마다 다시 요청합니다.
+커밋 상세 API(get_commit)로 받은 변경 통계와 파일별 변경 내역만 commits 테이블에 SHA당 한 행으로 두고,
+수집기는 이미 있는 SHA의 통계를 여기서 채우므로 get_commit을 다시 호출하지 않습니다.
+어느 저장소에서 그 커밋을 보았는지는 repo_commits 테이블에 (저장소, SHA)로 기록합니다.
+
+저장소별 커밋 테이블이 여전히 원본이며 이 파일은 요청을 줄이기 위한 캐시입니다 (지워도 다음 수집에서
+다시 요청할 뿐 데이터는 바뀌지 않음). 작성자/메시지 같은 목록 응답의 필드는 저장하지 않으며,
+분석에서 여러 저장소의 같은 커밋을 한 번만 세는 것은 frames.dedup_commits가 담당합니다.
+
+커밋을 SHA당 한 번만 저장하지는 않습니다. 저장소별 커밋 테이블(과 commit_files)은 포크/미러에 중복된
+커밋도 통계와 함께 모두 저장하고, 이 캐시는 그 위에 통계를 한 벌 더 보관하므로 디스크 사용량은 줄지 않고
+조금 늘어납니다. 저장소별 테이블을 (저장소, SHA, 날짜) 멤버십만 남기고 통계를 여기서 조인하도록 바꾸면
+저장소 단위 로드, 파티션, 델타 조각, 웨어하우스 적재와 migrate가 모두 이 파일에 의존하게 되므로 하지 않았습니다.
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger("GitHubCollector")
+
+# 커밋 상세 정보 캐시 설정
+COMMIT_STORE_ENABLED = os.getenv("COMMIT_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+COMMIT_STORE_PATH = os.getenv("COMMIT_STORE_PATH", os.path.join("data", "commit_store.sqlite"))
+
+# 이미 저장된 커밋에서 채우는 상세 정보 열 (fetch_commit_stats 결과와 같음)
+STATS_COLUMNS = ["additions", "deletions", "total_changes", "files_changed", "files"]
+
+QUERY_BATCH = 500  # IN 조건 하나에 넣을 SHA 수 (SQLite 변수 수 제한)
+
+class CommitStore:
+    """SHA 기준 커밋 상세 정보 캐시와 저장소별 멤버십 색인
+
+    이전 버전 파일의 commits 테이블에 있는 작성자/메시지 열은 더 이상 채우지 않습니다 (NULL로 남음).
+
+    수집기의 작업 스레드들이 하나의 연결을 공유하므로 모든 쿼리를 잠금 안에서 실행합니다.
+    WAL 모드이므로 다른 프로세스가 같은 파일을 읽는 동안에도 쓸 수 있습니다.
+    """
+    
+    def __init__(self, path=COMMIT_STORE_PATH):
+        """저장소 파일 열기 (없으면 테이블 생성)"""
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        self.con = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.con.execute("PRAGMA journal_mode=WAL")
+        self.con.execute(f"""
+            CREATE TABLE IF NOT EXISTS commits (
+                sha TEXT,
+                {', '.join(f'{col} INTEGER' if col != "files" else f'{col} TEXT' for col in STATS_COLUMNS)},
+                PRIMARY KEY (sha)
+            )
+        """)
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS repo_commits (
+                repo TEXT NOT NULL,
+                sha TEXT NOT NULL,
+                PRIMARY KEY (repo, sha)
+            )
+        """)
+        self.con.execute("CREATE INDEX IF NOT EXISTS repo_commits_sha ON repo_commits (sha)")
+        self.con.commit()
+    
+    def get_stats(self, shas):
+        """저장된 커밋의 상세 정보 {sha: {additions, deletions, total_changes, files_changed, files}} (없는 SHA는 빠짐)"""
+        shas = list(dict.fromkeys(shas))
+        found = {}
+        with self._lock:
+            for start in range(0, len(shas), QUERY_BATCH):
+                batch = shas[start:start + QUERY_BATCH]
+                rows = self.con.execute(
+                    f"SELECT sha, {', '.join(STATS_COLUMNS)} FROM commits WHERE sha IN ({', '.join('?' for _ in batch)})", batch
+                ).fetchall()
+                for sha, *values in rows:
+                    stats = dict(zip(STATS_COLUMNS, values))
+                    stats["files"] = json.loads(stats["files"])
+                    found[sha] = stats
+            self.hits += len(found)
+            self.misses += len(shas) - len(found)
+        return found
+    
+    def add(self, repo_name, commits_data):
+        """수집한 커밋 행의 상세 정보를 저장 (SHA당 한 번, 멤버십은 저장소마다)
+
+        상세 정보를 가져오지 못한 행(files가 None)은 멤버십만 기록하므로 다음 수집에서 다시 조회합니다.
+        """
+        columns = ["sha"] + STATS_COLUMNS
+        stats = [
+            [row.get(col) if col != "files" else json.dumps(row["files"]) for col in columns]
+            for row in commits_data if row.get("files") is not None
+        ]
+        members = [(repo_name, row["sha"]) for row in commits_data]
+        with self._lock:
+            self.con.executemany(
+                f"INSERT OR IGNORE INTO commits ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                stats
+            )
+            self.con.executemany("INSERT OR IGNORE INTO repo_commits (repo, sha) VALUES (?, ?)", members)
+            self.con.commit()
+    
+    def repositories(self, sha):
+        """커밋이 수집된 저장소 목록"""
+        with self._lock:
+            rows = self.con.execute("SELECT repo FROM repo_commits WHERE sha = ? ORDER BY repo", [sha]).fetchall()
+        return [row[0] for row in rows]
+    
+    def stats(self):
+        """저장된 커밋 수, 멤버십 행 수, 여러 저장소에 속한 커밋 수와 이번 실행의 조회 적중/실패 수"""
+        with self._lock:
+            commits = self.con.execute("SELECT count(*) FROM commits").fetchone()[0]
+            members = self.con.execute("SELECT count(*) FROM repo_commits").fetchone()[0]
+            shared = self.con.execute(
+                "SELECT count(*) FROM (SELECT sha FROM repo_commits GROUP BY sha HAVING count(*) > 1)"
+            ).fetchone()[0]
+        return {"commits": commits, "memberships": members, "shared": shared, "hits": self.hits, "misses": self.misses}
+    
+    def close(self):
+        with self._lock:
+            self.con.close()
+
+_store = None
+
+def open_commit_store(path=COMMIT_STORE_PATH):
+    """프로세스에서 공유하는 커밋 상세 정보 캐시 열기 (여러 번 호출해도 한 번만 엶)"""
+    global _store
+    
+    if _store is None:
+        _store = CommitStore(path)
+        logger.info(f"커밋 상세 정보 캐시 사용: {path} (커밋 {_store.stats()['commits']}개)")
+    
+    return _store
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# github_analyzer/frames.py
+
+import os
+import sys
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import storage
+
+logger = logging.getLogger("GitHubAnalyzer")
+
+# 메모리 압축 설정
+COMPACT_FRAMES = os.getenv("COMPACT_FRAMES", "true").lower() == "true"      # 분석용 DataFrame 압축 여부
+DROP_TEXT_COLUMNS = [col for col in os.getenv("DROP_TEXT_COLUMNS", "url").split(",") if col]  # 로드할 때 버릴 텍스트 열 (분석에 쓰지 않는 열)
+DEDUP_COMMITS = os.getenv("DEDUP_COMMITS", "true").lower() == "true"  # 여러 저장소(포크/미러)에 있는 같은 SHA의 커밋을 한 번만 분석
+CATEGORY_MAX_RATIO = 0.5  # 스키마에 없는 문자열 열은 고유값 비율이 이보다 낮을 때만 범주형으로 변환
+
+# 스키마의 사전 인코딩 열 외에 범주형으로 바꿀 열 (반복되는 이름/이메일, 정제 단계의 요일 이름)
+CATEGORY_COLUMNS = ["author_name", "author_email", "committer_name", "committer_email", "milestone", "day_name"]
+
+# 정제된 DataFrame 표시 (df.attrs, 슬라이스/스냅샷에도 유지됨): 날짜 열이 datetime으로 변환되어 있고
+# 날짜 없는 커밋이 제거되었으며 요일/시간 열이 있으므로 분석 단계에서 다시 변환하거나 복사하지 않음
+CLEANED_ATTR = "cleaned"
+
+# 작은 정수형부터 순서대로 (값 범위에 맞는 가장 작은 형식 사용)
+INT_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+def memory_mb(df):
+    """DataFrame이 차지하는 메모리 (MB, 문자열 등 객체 내용 포함)"""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+def _schema_types(table):
+    """테이블 스키마의 (범주형 열 목록, 정수 열 목록), 스키마가 없는 테이블이면 빈 목록"""
+    schema = storage.SCHEMAS.get(table)
+    if schema is None:
+        return [], []
+    categories = [field.name for field in schema if field.type == storage.CATEGORY]
+    ints = [field.name for field in schema if field.type == pa.int64()]
+    return categories, ints
+
+def _downcast_int(values):
+    """정수 열을 값 범위에 맞는 가장 작은 형식으로 (결측값이 있으면 nullable Int 형식)"""
+    present = values.dropna()
+    if present.empty:
+        return values
+    
+    low, high = present.min(), present.max()
+    int_type = next(t for t in INT_TYPES if np.iinfo(t).min <= low and high <= np.iinfo(t).max)
+    if len(present) < len(values):
+        return values.astype(f"Int{np.iinfo(int_type).bits}")
+    return values.astype(int_type)
+
+def _intern_lists(values):
+    """목록 열(라벨, 담당자 등)의 문자열을 intern하여 같은 값이 한 객체를 공유하도록"""
+    return values.map(
+        lambda items: [sys.intern(item) if isinstance(item, str) else item for item in items]
+        if isinstance(items, list) else items
+    )
+
+def compact_frame(df, table=None, restore_ints=False):
+    """DataFrame을 메모리를 적게 쓰는 형식으로 변환 (값은 그대로 유지)
+
+    - 저장소/작성자/상태 같은 반복 문자열 열은 범주형(category)으로
+    - 정수 열은 값 범위에 맞는 가장 작은 정수형으로
+    - restore_ints가 참이면 결측값 때문에 float64로 읽힌 스키마 정수 열(변경량, 코멘트 수 등)을
+      nullable 정수형으로 되돌림 (로드 직후에만 사용, 정제 후의 이상치 제한 값은 실수이므로 그대로 둠)
+    - 목록 열의 문자열은 intern
+    """
+    if df.empty:
+        return df
+    
+    df = df.copy(deep=False)
+    schema_categories, schema_ints = _schema_types(table)
+    
+    for col in df.columns:
+        values = df[col]
+        
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            df[col] = values.cat.remove_unused_categories()
+        elif pd.api.types.is_bool_dtype(values.dtype) or pd.api.types.is_datetime64_any_dtype(values.dtype):
+            continue
+        elif pd.api.types.is_integer_dtype(values.dtype):
+            df[col] = _downcast_int(values)
+        elif pd.api.types.is_float_dtype(values.dtype):
+            present = values.dropna()
+            if restore_ints and col in schema_ints and (present == np.floor(present)).all():
+                df[col] = _downcast_int(values.astype("Int64"))
+        elif col in schema_categories:
+            df[col] = values.astype("category")
+        elif col in CATEGORY_COLUMNS:
+            if values.nunique() <= len(values) * CATEGORY_MAX_RATIO:
+                df[col] = values.astype("category")
+        elif values.dtype == object and values.map(lambda x: isinstance(x, list)).any():
+            df[col] = _intern_lists(values)
+    
+    return df
+
+def drop_text(df):
+    """DROP_TEXT_COLUMNS의 열 제거
+
+    저장소별로 읽은 직후에 호출하면 합치기 전에 버리므로 최대 메모리도 줄어듭니다.
+    본문/메시지는 storage가 글자 수만 읽으므로 여기서 다루지 않습니다.
+    """
+    columns = [col for col in DROP_TEXT_COLUMNS if col in df.columns]
+    return df.drop(columns=columns) if columns else df
+
+def dedup_commits(df):
+    """여러 저장소에 수집된 같은 SHA의 커밋 중 저장소 이름이 가장 앞선 행만 남김 (행 순서 유지)
+
+    포크/미러를 함께 분석하면 같은 커밋이 저장소마다 한 번씩 집계되므로 합친 뒤에 호출합니다.
+    웨어하우스 백엔드도 같은 규칙으로 중복을 제거합니다.
+    """
+    if not DEDUP_COMMITS or df.empty or "sha" not in df.columns or "repo" not in df.columns:
+        return df
+    
+    order = df["repo"].astype(str).sort_values(kind='stable').index
+    duplicated = df.loc[order, "sha"].duplicated()
+    if not duplicated.any():
+        return df
+    
+    logger.info(f"여러 저장소에 중복된 커밋 {int(duplicated.sum())}개 제외")
+    return df.drop(index=duplicated[duplicated].index).reset_index(drop=True)
+
+# 두 분석 백엔드(pandas, 웨어하우스)가 같은 행 순서로 정제 데이터를 반환하도록 하는 정렬 기준
+# (열, 오름차순 여부), 결측값은 마지막. PR 승인 모델의 학습/평가 분할처럼 행 순서에 따라 결과가 바뀌는 단계가 있음
+ROW_ORDER = {
+    "commits": [("repo", True), ("date", False), ("sha", True)],
+    "pull_requests": [("repo", True), ("created_at", False), ("number", True)],
+    "issues": [("repo", True), ("created_at", False), ("number", True)],
+    "pr_reviews": [("repo", True), ("pr_number", True), ("submitted_at", True), ("reviewer", True)]
+}
+
+def sort_rows(df, table):
+    """ROW_ORDER 순서로 정렬 (범주형 열은 범주 순서가 아닌 값 순서)"""
+    order = [(col, ascending) for col, ascending in ROW_ORDER[table] if col in df.columns]
+    if df.empty or not order:
+        return df
+    
+    return df.sort_values(
+        [col for col, _ in order], ascending=[ascending for _, ascending in order],
+        na_position='last', kind='stable',
+        key=lambda values: values.astype(object) if isinstance(values.dtype, pd.CategoricalDtype) else values
+    ).reset_index(drop=True)
+
+def order_by_sql(table):
+    """ROW_ORDER와 같은 정렬의 SQL ORDER BY 절"""
+    return "ORDER BY " + ", ".join(
+        f"{col} {'ASC' if ascending else 'DESC'} NULLS LAST" for col, ascending in ROW_ORDER[table]
+    )
+
+def parse_dates(values):
+    """날짜 열 변환 (이미 datetime이면 그대로, 문자열은 ISO 8601 형식으로 한 번에 파싱, 잘못된 값은 NaT)"""
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values
+    return pd.to_datetime(values, errors='coerce', format='ISO8601')
+
+def mark_cleaned(frames):
+    """테이블별 DataFrame 사전의 DataFrame에 정제 표시 (CLEANED_ATTR)"""
+    for df in frames.values():
+        if isinstance(df, pd.DataFrame):
+            df.attrs[CLEANED_ATTR] = True
+    return frames
+
+def is_cleaned(df):
+    return bool(df.attrs.get(CLEANED_ATTR))
+
+def compact_frames(frames, stage, restore_ints=False):
+    """테이블별 DataFrame 사전을 압축하고 DataFrame마다 메모리 사용량을 로그로 남김
+
+    COMPACT_FRAMES가 꺼져 있으면 변환 없이 메모리 사용량만 기록합니다.
+    DataFrame이 아닌 값(메타데이터 등)은 그대로 반환합니다.
+    """
+    compacted = dict(frames)
+    
+    for table, df in frames.items():
+        if not isinstance(df, pd.DataFrame):
+            continue
+        
+        before = memory_mb(df)
+        if COMPACT_FRAMES:
+            df = compact_frame(df, table, restore_ints)
+            compacted[table] = df
+            logger.info(f"메모리 ({stage}) {table}: {len(df)}행, {before:.1f}MB -> {memory_mb(df):.1f}MB")
+        else:
+            logger.info(f"메모리 ({stage}) {table}: {len(df)}행, {before:.1f}MB")
+    
+    return compacted
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# github_analyzer/github_transport.py
+
+import threading
+from github.Requester import Requester, HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass
+
+# PyGithub 연결 클래스에 씌울 계층 목록 (설치 순서대로 안쪽부터 감쌈)
+_layers = {}
+_lock = threading.Lock()
+
+def install_layer(name, wrap):
+    """PyGithub 요청 계층에 연결 래퍼 설치
+
+    wrap은 연결 클래스를 받아 그 하위 클래스를 반환하는 함수입니다.
+    같은 이름으로 다시 설치하면 기존 계층을 교체하며, 설치 이후 생성되는
+    모든 Github 클라이언트(collect_data, realtime_analyzer 등)에 적용됩니다.
+    """
+    with _lock:
+        _layers[name] = wrap
+        
+        http_class, https_class = HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass
+        for layer in _layers.values():
+            http_class, https_class = layer(http_class), layer(https_class)
+        
+        Requester.injectConnectionClasses(http_class, https_class)
+        
+        # injectConnectionClasses는 테스트용으로 연결 재사용을 끄므로 다시 켬
+        # (끄면 요청마다 새 세션과 TLS 연결을 만듦)
+        Requester._Requester__persist = True
+
+def installed_layers():
+    """설치된 계층 이름 목록"""
+    return list(_layers)
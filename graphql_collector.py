@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# github_analyzer/graphql_collector.py
+
+import os
+import logging
+import requests
+from datetime import datetime, timedelta, timezone
+from rate_limiter import is_rate_limited
+from token_pool import TokenPool
+from replay import mount_replay
+
+logger = logging.getLogger("GitHubCollector")
+
+# GraphQL 엔드포인트 (로컬 스텁 서버로 테스트할 때 변경 가능)
+GITHUB_GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
+PAGE_SIZE = 100  # GraphQL 연결(connection)당 최대 노드 수
+
+COMMITS_QUERY = """
+query($owner: String!, $name: String!, $since: GitTimestamp, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: $first, after: $after, since: $since) {
+            pageInfo { hasNextPage endCursor }
+            nodes {
+              oid
+              message
+              url
+              additions
+              deletions
+              changedFilesIfAvailable
+              author { name email date user { login } }
+              committer { name email date user { login } }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+PULL_REQUESTS_QUERY = """
+query($owner: String!, $name: String!, $states: [PullRequestState!], $orderBy: IssueOrder!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: $first, after: $after, states: $states, orderBy: $orderBy) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        body
+        state
+        createdAt
+        updatedAt
+        closedAt
+        mergedAt
+        mergeCommit { oid }
+        author { login }
+        additions
+        deletions
+        changedFiles
+        comments { totalCount }
+        commits { totalCount }
+        merged
+        url
+        reviews(first: 100) {
+          totalCount
+          nodes { author { login } state submittedAt comments { totalCount } }
+        }
+      }
+    }
+  }
+}
+"""
+
+ISSUES_QUERY = """
+query($owner: String!, $name: String!, $states: [IssueState!], $since: DateTime, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: $first, after: $after, states: $states, filterBy: {since: $since}, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        body
+        state
+        createdAt
+        updatedAt
+        closedAt
+        author { login }
+        assignees(first: 100) { nodes { login } }
+        comments { totalCount }
+        labels(first: 100) { nodes { name } }
+        milestone { title }
+        url
+      }
+    }
+  }
+}
+"""
+
+# REST API의 state 인자를 GraphQL 상태 목록으로 변환
+PR_STATES = {"all": None, "open": ["OPEN"], "closed": ["CLOSED", "MERGED"]}
+ISSUE_STATES = {"all": None, "open": ["OPEN"], "closed": ["CLOSED"]}
+
+def _to_iso(value):
+    """GraphQL 타임스탬프를 REST 수집기와 같은 UTC isoformat 문자열로 변환"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc).isoformat()
+
+def _login(actor):
+    """author/user 객체에서 로그인 이름 추출"""
+    if not actor:
+        return None
+    if "user" in actor:
+        return actor["user"]["login"] if actor["user"] else None
+    return actor.get("login")
+
+class GitHubGraphQLCollector:
+    """GraphQL API 기반 수집기
+
+    커밋 변경 통계와 PR 리뷰를 목록 조회와 함께 100개 단위로 가져오므로
+    REST 수집기의 항목당 추가 호출(N+1)이 필요 없습니다.
+    반환하는 행은 REST 수집기와 같은 스키마를 따릅니다.
+    """
+    
+    def __init__(self, token, api_url=GITHUB_GRAPHQL_URL, page_size=PAGE_SIZE):
+        """GraphQL 수집기 초기화 (token은 토큰 하나 또는 토큰 목록)"""
+        self.api_url = api_url
+        self.page_size = page_size
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": "github-developer-analyzer"})
+        mount_replay(self.session)
+        
+        # GraphQL은 REST와 별도의 한도(포인트)를 사용하므로 토큰별 제한기를 따로 둠
+        tokens = [token] if isinstance(token, str) else list(token)
+        self.token_pool = TokenPool(tokens, name="graphql")
+    
+    def query(self, query, variables, max_retries=3):
+        """GraphQL 쿼리 실행 (속도 제한 시 다른 토큰 또는 제한기 대기 후 재시도)"""
+        for attempt in range(max_retries + 1):
+            entry = self.token_pool.acquire()
+            response = self.session.post(
+                self.api_url,
+                json={"query": query, "variables": variables},
+                headers={"Authorization": f"bearer {entry.token}"}
+            )
+            headers = {k.lower(): v for k, v in response.headers.items()}
+            entry.limiter.update(headers)
+            
+            if response.status_code == 401 and self.token_pool.disable(entry, "인증 실패 (401)"):
+                continue
+            
+            if not is_rate_limited(response.status_code, headers, response.text):
+                response.raise_for_status()
+                result = response.json()
+                errors = result.get("errors") or []
+                if not any(error.get("type") == "RATE_LIMITED" for error in errors):
+                    if errors:
+                        raise RuntimeError(f"GraphQL 오류: {errors[0].get('message')}")
+                    return result["data"]
+            
+            if attempt == max_retries:
+                raise RuntimeError("GraphQL 속도 제한 재시도 횟수 초과")
+            
+            # 1차 한도 소진 토큰은 뒤로 밀리고, 모두 소진되면 acquire()가 리셋 시각까지 대기
+            if headers.get("x-ratelimit-remaining") != "0":
+                entry.limiter.backoff(headers.get("retry-after"))
+    
+    def _iter_pages(self, query, repo_name, variables, path, max_items, after=None):
+        """커서 기반 페이지네이션으로 최대 max_items개까지 (노드 목록, 다음 커서) 순회
+        
+        마지막 페이지의 다음 커서는 None입니다. after를 넘기면 그 커서 이후부터 조회합니다.
+        """
+        owner, name = repo_name.split("/", 1)
+        variables = dict(variables, owner=owner, name=name, after=after)
+        
+        count = 0
+        while count < max_items:
+            variables["first"] = min(self.page_size, max_items - count)
+            connection = self.query(query, variables)
+            for key in path:
+                connection = connection[key] if connection else None
+            if not connection:
+                return
+            
+            count += len(connection["nodes"])
+            page_info = connection["pageInfo"]
+            end_cursor = page_info["endCursor"] if page_info["hasNextPage"] else None
+            yield connection["nodes"], end_cursor
+            
+            if end_cursor is None:
+                return
+            variables["after"] = end_cursor
+    
+    def collect_commits(self, repo_name, days_back=30, max_commits=1000, since=None):
+        """저장소의 커밋 데이터 수집 (변경 통계 포함)"""
+        logger.info(f"[GraphQL] 저장소 커밋 수집 중: {repo_name}, {since or f'{days_back}일 전'}부터, 최대 {max_commits}개")
+        
+        try:
+            since_date = since or datetime.now(timezone.utc) - timedelta(days=days_back)
+            commits_data = [row for rows, _ in self.iter_commit_pages(repo_name, since_date, max_commits) for row in rows]
+            
+            logger.info(f"{len(commits_data)} 커밋 수집됨")
+            return commits_data
+        
+        except Exception as e:
+            logger.error(f"커밋 데이터 수집 중 오류 발생: {e}")
+            return []
+    
+    def iter_commit_pages(self, repo_name, since, max_commits, start=None):
+        """커밋을 한 페이지씩 수집, (행 목록, 다음 커서) 반환"""
+        pages = self._iter_pages(
+            COMMITS_QUERY,
+            repo_name,
+            {"since": since.strftime("%Y-%m-%dT%H:%M:%SZ")},
+            ["repository", "defaultBranchRef", "target", "history"],
+            max_commits,
+            after=start
+        )
+        
+        for nodes, end_cursor in pages:
+            commits_data = []
+            for node in nodes:
+                author = node.get("author") or {}
+                committer = node.get("committer") or {}
+                commits_data.append({
+                    "repo": repo_name,
+                    "sha": node["oid"],
+                    "author_name": author.get("name"),
+                    "author_email": author.get("email"),
+                    "author_login": _login(author),
+                    "committer_name": committer.get("name"),
+                    "committer_email": committer.get("email"),
+                    "committer_login": _login(committer),
+                    "date": _to_iso(author.get("date")),
+                    "message": node["message"],
+                    "url": node["url"],
+                    "additions": node["additions"],
+                    "deletions": node["deletions"],
+                    "total_changes": node["additions"] + node["deletions"],
+                    "files_changed": node.get("changedFilesIfAvailable")
+                })
+            
+            yield commits_data, end_cursor
+    
+    def collect_pull_requests(self, repo_name, state='all', max_prs=500, updated_since=None):
+        """저장소의 PR 데이터 수집 (리뷰 정보 포함, updated_since 이후 갱신된 PR만 선택 가능)"""
+        logger.info(f"[GraphQL] 저장소 PR 수집 중: {repo_name}, 상태={state}, 최대 {max_prs}개")
+        
+        try:
+            prs_data = [row for rows, _ in self.iter_pull_request_pages(repo_name, state, max_prs, updated_since) for row in rows]
+            
+            logger.info(f"{len(prs_data)} PR 수집됨")
+            return prs_data
+        
+        except Exception as e:
+            logger.error(f"PR 데이터 수집 중 오류 발생: {e}")
+            return []
+    
+    def iter_pull_request_pages(self, repo_name, state='all', max_prs=500, updated_since=None, start=None):
+        """PR을 한 페이지씩 수집 (리뷰 정보 포함), (행 목록, 다음 커서) 반환"""
+        pages = self._iter_pages(
+            PULL_REQUESTS_QUERY,
+            repo_name,
+            {
+                "states": PR_STATES[state],
+                # 증분 수집: 최근 갱신 순으로 조회하다가 커서에 도달하면 중단
+                "orderBy": {"field": "UPDATED_AT" if updated_since else "CREATED_AT", "direction": "DESC"}
+            },
+            ["repository", "pullRequests"],
+            max_prs,
+            after=start
+        )
+        
+        for nodes, end_cursor in pages:
+            prs_data = []
+            for node in nodes:
+                if updated_since and datetime.fromisoformat(_to_iso(node["updatedAt"])) <= updated_since:
+                    end_cursor = None
+                    break
+                
+                reviews = node["reviews"]
+                if reviews["totalCount"] > len(reviews["nodes"]):
+                    logger.warning(f"PR {node['number']} 리뷰 {reviews['totalCount']}개 중 {len(reviews['nodes'])}개만 수집됨")
+                
+                prs_data.append({
+                    "repo": repo_name,
+                    "number": node["number"],
+                    "title": node["title"],
+                    "body": node["body"],
+                    "state": "open" if node["state"] == "OPEN" else "closed",
+                    "created_at": _to_iso(node["createdAt"]),
+                    "updated_at": _to_iso(node["updatedAt"]),
+                    "closed_at": _to_iso(node["closedAt"]),
+                    "merged_at": _to_iso(node["mergedAt"]),
+                    "merge_commit_sha": node["mergeCommit"]["oid"] if node["mergeCommit"] else None,
+                    "author_login": _login(node["author"]),
+                    "additions": node["additions"],
+                    "deletions": node["deletions"],
+                    "changed_files": node["changedFiles"],
+                    "comments": node["comments"]["totalCount"],
+                    # 리뷰에 달린 코멘트 합계 (REST의 review_comments에 해당)
+                    "review_comments": sum(review["comments"]["totalCount"] for review in reviews["nodes"]),
+                    "commits": node["commits"]["totalCount"],
+                    "is_merged": node["merged"],
+                    "url": node["url"],
+                    "reviews": [
+                        {
+                            "reviewer": _login(review["author"]) or "unknown",
+                            "state": review["state"],
+                            "submitted_at": _to_iso(review["submittedAt"])
+                        }
+                        for review in reviews["nodes"]
+                    ],
+                    "hydrated": True
+                })
+            
+            yield prs_data, end_cursor
+            if end_cursor is None:
+                return
+    
+    def collect_issues(self, repo_name, state='all', max_issues=500, updated_since=None):
+        """저장소의 이슈 데이터 수집 (GraphQL issues 연결에는 PR이 포함되지 않음)"""
+        logger.info(f"[GraphQL] 저장소 이슈 수집 중: {repo_name}, 상태={state}, 최대 {max_issues}개")
+        
+        try:
+            issues_data = [row for rows, _ in self.iter_issue_pages(repo_name, state, max_issues, updated_since) for row in rows]
+            
+            logger.info(f"{len(issues_data)} 이슈 수집됨")
+            return issues_data
+        
+        except Exception as e:
+            logger.error(f"이슈 데이터 수집 중 오류 발생: {e}")
+            return []
+    
+    def iter_issue_pages(self, repo_name, state='all', max_issues=500, updated_since=None, start=None):
+        """이슈를 한 페이지씩 수집, (행 목록, 다음 커서) 반환"""
+        pages = self._iter_pages(
+            ISSUES_QUERY,
+            repo_name,
+            {
+                "states": ISSUE_STATES[state],
+                "since": updated_since.strftime("%Y-%m-%dT%H:%M:%SZ") if updated_since else None
+            },
+            ["repository", "issues"],
+            max_issues,
+            after=start
+        )
+        
+        for nodes, end_cursor in pages:
+            issues_data = []
+            for node in nodes:
+                issues_data.append({
+                    "repo": repo_name,
+                    "number": node["number"],
+                    "title": node["title"],
+                    "body": node["body"],
+                    "state": node["state"].lower(),
+                    "created_at": _to_iso(node["createdAt"]),
+                    "updated_at": _to_iso(node["updatedAt"]),
+                    "closed_at": _to_iso(node["closedAt"]),
+                    "author_login": _login(node["author"]),
+                    "assignees": [assignee["login"] for assignee in node["assignees"]["nodes"]],
+                    "comments": node["comments"]["totalCount"],
+                    "labels": [label["name"] for label in node["labels"]["nodes"]],
+                    "milestone": node["milestone"]["title"] if node["milestone"] else None,
+                    "url": node["url"]
+                })
+            
+            yield issues_data, end_cursor
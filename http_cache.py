@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# github_analyzer/http_cache.py
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from github_transport import install_layer
+
+logger = logging.getLogger("GitHubCollector")
+
+# 캐시 설정
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".http_cache")
+HTTP_CACHE_MAX_MB = int(os.getenv("HTTP_CACHE_MAX_MB", 256))
+
+# 호출자가 직접 조건부 요청을 보내는 경우 (GithubObject.update 등) 캐시를 거치지 않음
+CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+# 항상 최신 값이 필요한 경로
+UNCACHED_PATHS = ("/rate_limit",)
+
+# 캐시 키에 넣는 요청 헤더 (응답 형식이 달라지는 헤더, 인증 헤더는 넣지 않음)
+KEY_HEADERS = ("Accept",)
+
+class CachedResponse:
+    """캐시된 응답 (PyGithub RequestsResponse와 같은 인터페이스)"""
+    
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.text = body
+    
+    def getheaders(self):
+        return self.headers.items()
+    
+    def read(self):
+        return self.text
+
+class HTTPResponseCache:
+    """ETag / Last-Modified 기반 디스크 응답 캐시 (크기 제한 LRU)
+
+    항목 하나가 파일 하나(<key>.json)이며, 파일 수정 시각을 마지막 사용 시각으로
+    사용해 크기 제한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+    """
+    
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_MB * 1024 * 1024):
+        """캐시 디렉토리 스캔 및 초기화"""
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        self._sizes = {}
+        for name in os.listdir(cache_dir):
+            if name.endswith(".json"):
+                self._sizes[name[:-5]] = os.path.getsize(os.path.join(cache_dir, name))
+        self._total = sum(self._sizes.values())
+    
+    @staticmethod
+    def make_key(url, headers):
+        """URL(쿼리 파라미터 포함)과 KEY_HEADERS로 캐시 키 생성
+
+        토큰(Authorization 헤더)은 키에 넣지 않으므로 토큰 풀의 어느 토큰으로 받은 응답이든 같은 항목을
+        갱신하고 재사용합니다. 캐시된 본문은 서버가 지금 요청한 토큰으로 조건부 요청을 확인해 304를
+        보낸 경우에만 제공되므로, 토큰마다 볼 수 있는 내용이 달라 ETag가 다르면 200 응답으로 항목이 바뀔 뿐
+        다른 토큰이 볼 수 없는 내용을 돌려주지는 않습니다.
+        """
+        raw = "|".join([url] + [headers.get(header, "") for header in KEY_HEADERS])
+        return hashlib.sha256(raw.encode()).hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key):
+        """캐시 항목 조회 (사용 시각 갱신), 없으면 None"""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)
+            return entry
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, key, url, headers, body):
+        """응답 저장 후 크기 제한 초과분 정리"""
+        data = json.dumps({"url": url, "headers": headers, "body": body})
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        
+        with self._lock:
+            self._total += len(data) - self._sizes.get(key, 0)
+            self._sizes[key] = len(data)
+            if self._total > self.max_bytes:
+                self._evict()
+    
+    def _evict(self):
+        """가장 오래 사용하지 않은 항목부터 삭제하여 최대 크기의 90%까지 줄임"""
+        entries = []
+        for key in self._sizes:
+            try:
+                entries.append((os.path.getmtime(self._path(key)), key))
+            except OSError:
+                entries.append((0, key))
+        
+        for _, key in sorted(entries):
+            if self._total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self._total -= self._sizes.pop(key)
+    
+    def count(self, hit):
+        """적중/실패 수 갱신 (여러 스레드의 요청이 함께 갱신하므로 잠금 안에서)"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+    
+    def stats(self):
+        """캐시 적중 통계"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._sizes),
+            "size_mb": self._total / 1024 / 1024
+        }
+
+def caching_connection(base_class, cache):
+    """GET 요청에 조건부 헤더를 붙이고 304 응답을 캐시에서 제공하는 연결 클래스 생성"""
+    
+    class CachingConnection(base_class):
+        def getresponse(self):
+            if self.verb != "GET" or getattr(self, "stream", False) or \
+                    self.url.split("?")[0].endswith(UNCACHED_PATHS) or \
+                    any(header in self.headers for header in CONDITIONAL_HEADERS):
+                return super().getresponse()
+            
+            url = f"{self.host}:{self.port}{self.url}"
+            key = cache.make_key(url, self.headers)
+            entry = cache.get(key)
+            
+            if entry:
+                self.headers = dict(self.headers)
+                if "etag" in entry["headers"]:
+                    self.headers["If-None-Match"] = entry["headers"]["etag"]
+                if "last-modified" in entry["headers"]:
+                    self.headers["If-Modified-Since"] = entry["headers"]["last-modified"]
+            
+            response = super().getresponse()
+            headers = {k.lower(): v for k, v in response.getheaders()}
+            
+            # 304: 본문은 캐시에서, 속도 제한 등 최신 헤더는 응답에서 가져옴
+            if response.status == 304 and entry:
+                cache.count(hit=True)
+                return CachedResponse(200, dict(entry["headers"], **headers), entry["body"])
+            
+            cache.count(hit=False)
+            if response.status == 200 and ("etag" in headers or "last-modified" in headers):
+                cache.put(key, url, headers, response.read())
+            
+            return response
+    
+    CachingConnection.__name__ = f"Caching{base_class.__name__}"
+    return CachingConnection
+
+_cache = None
+
+def install_http_cache(cache_dir=HTTP_CACHE_DIR, max_mb=HTTP_CACHE_MAX_MB):
+    """PyGithub 요청 계층에 디스크 캐시 설치 (여러 번 호출해도 한 번만 설치)"""
+    global _cache
+    
+    if _cache is None:
+        _cache = HTTPResponseCache(cache_dir, max_mb * 1024 * 1024)
+        install_layer("http_cache", lambda base_class: caching_connection(base_class, _cache))
+        logger.info(f"HTTP 응답 캐시 사용: {cache_dir} (최대 {max_mb}MB, 현재 {_cache.stats()['entries']}개 항목)")
+    
+    return _cache
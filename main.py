@@ -33,8 +33,8 @@ def parse_arguments():
     
     parser.add_argument(
         "action", 
-        choices=["collect", "analyze", "dashboard", "all"],
-        help="실행할 작업 (collect: 데이터 수집, analyze: 데이터 분석, dashboard: 대시보드 실행, all: 모두 실행)"
+        choices=["collect", "hydrate", "analyze", "dashboard", "migrate", "compact", "all"],
+        help="실행할 작업 (collect: 데이터 수집, hydrate: PR 상세 정보 보강, analyze: 데이터 분석, dashboard: 대시보드 실행, migrate: CSV 데이터를 Parquet/partitioned 형식으로 변환 (원본 CSV는 <테이블>.csv.orig로 남김, --delete-source이면 삭제), compact: 증분 수집 델타 조각을 기본 파일에 합치기, all: 모두 실행)"
     )
     
     parser.add_argument(
@@ -57,6 +57,61 @@ def parse_arguments():
         help="저장소당 최대 항목 수 (기본값: 200)"
     )
     
+    parser.add_argument(
+        "--mode", 
+        choices=["rest", "graphql"],
+        default=os.getenv("COLLECTION_MODE", "rest"),
+        help="데이터 수집 방식 (rest: REST API, graphql: GraphQL 배치 쿼리) (기본값: rest)"
+    )
+    
+    parser.add_argument(
+        "--incremental", 
+        action="store_true",
+        help="저장된 커서 이후 변경분만 수집하여 기존 데이터에 병합"
+    )
+    
+    parser.add_argument(
+        "--resume", 
+        action="store_true",
+        help="중단된 이전 수집을 마지막으로 저장된 페이지 다음부터 이어서 수집"
+    )
+    
+    parser.add_argument(
+        "--defer-pr-details", 
+        action="store_true",
+        help="PR 목록 필드만 빠르게 수집하고 상세 정보/리뷰어는 hydrate 작업으로 나중에 채움"
+    )
+    
+    parser.add_argument(
+        "--start", 
+        help="분석 기간 시작일 (예: 2024-01-01, 커밋 날짜/PR·이슈 생성일 기준)"
+    )
+    
+    parser.add_argument(
+        "--end", 
+        help="분석 기간 종료일 (해당 날짜 미만, 예: 2024-04-01)"
+    )
+    
+    parser.add_argument(
+        "--workers", 
+        type=int, 
+        default=int(os.getenv("REPO_WORKERS", 4)),
+        help="동시에 수집할 저장소 수 (기본값: 4)"
+    )
+    
+    parser.add_argument(
+        "--format", 
+        choices=["parquet", "partitioned"],
+        default=os.getenv("STORAGE_FORMAT") if os.getenv("STORAGE_FORMAT") in ("parquet", "partitioned") else "partitioned",
+        help="migrate 작업의 변환 대상 형식 (기본값: STORAGE_FORMAT이 parquet/partitioned이면 그 값, 아니면 partitioned)"
+    )
+    
+    parser.add_argument(
+        "--delete-source", 
+        action="store_true",
+        help="migrate 작업에서 검증에 통과한 원본 CSV를 삭제 (기본값: <테이블>.csv.orig로 이름을 바꿔 남김)"
+    )
+    
     return parser.parse_args()
 
 def main():
@@ -70,9 +125,31 @@ def main():
     # 명령줄 인자 파싱
     args = parse_arguments()
     
-    # GitHub 토큰 확인
-    github_token = os.getenv("GITHUB_TOKEN")
-    if not github_token:
+    # CSV 데이터 변환 (GitHub 토큰 불필요, --repos를 생략하면 data 디렉토리의 모든 저장소)
+    if args.action == "migrate":
+        from migrate import migrate_repositories
+        
+        report = migrate_repositories("data", args.repos, fmt=args.format, workers=args.workers, delete_source=args.delete_source)
+        if (report["status"] != "완료").any():
+            logger.error("일부 테이블 변환에 실패했습니다. 원본 CSV는 그대로 남아 있습니다 (data/migration_report.csv 참고).")
+        logger.info(f"변환 완료! 이후 수집/분석에는 STORAGE_FORMAT={args.format}을 설정하세요.")
+        return
+    
+    # 델타 조각 압축 (GitHub 토큰 불필요, --repos를 생략하면 data 디렉토리의 모든 저장소)
+    if args.action == "compact":
+        import storage
+        
+        for repo_name in args.repos or storage.list_repositories("data"):
+            compacted = storage.compact_repository(os.path.join("data", repo_name.replace("/", "_")))
+            if compacted:
+                logger.info(f"{repo_name} 압축: {', '.join(f'{table} 델타 {count}개' for table, count in compacted.items())}")
+        logger.info("압축 완료!")
+        return
+    
+    # GitHub 토큰 확인 (GITHUB_TOKENS / GITHUB_TOKENS_FILE로 여러 토큰 사용 가능)
+    from token_pool import load_tokens
+    github_tokens = load_tokens()
+    if not github_tokens:
         logger.error("GitHub 토큰이 설정되지 않았습니다. .env 파일에 GITHUB_TOKEN을 추가하세요.")
         return
     
@@ -90,28 +167,41 @@ def main():
         logger.info("데이터 수집 시작...")
         from collect_data import GitHubDataCollector
         
-        collector = GitHubDataCollector(github_token)
+        collector = GitHubDataCollector(github_tokens, mode=args.mode, defer_pr_details=args.defer_pr_details)
         
-        for repo_name in repositories:
-            logger.info(f"저장소 {repo_name} 데이터 수집 중...")
-            collector.collect_repository_data(
-                repo_name=repo_name,
-                days_back=args.days,
-                max_items={
-                    "commits": args.max_items,
-                    "pull_requests": args.max_items // 2,
-                    "issues": args.max_items // 2
-                }
-            )
+        collector.collect_repositories(
+            repositories,
+            workers=args.workers,
+            days_back=args.days,
+            max_items={
+                "commits": args.max_items,
+                "pull_requests": args.max_items // 2,
+                "issues": args.max_items // 2
+            },
+            incremental=args.incremental,
+            resume=args.resume
+        )
+        collector.close()
         
         logger.info("데이터 수집 완료!")
     
+    if args.action == "hydrate":
+        logger.info("PR 상세 정보 보강 시작...")
+        from collect_data import GitHubDataCollector
+        
+        collector = GitHubDataCollector(github_tokens)
+        for repo_name in repositories:
+            collector.hydrate_pull_requests(repo_name)
+        collector.close()
+        
+        logger.info("PR 상세 정보 보강 완료!")
+    
     if args.action in ["analyze", "all"]:
         logger.info("데이터 분석 시작...")
         from analyze_data import GitHubDataAnalyzer
         
         analyzer = GitHubDataAnalyzer()
-        analyzer.run_analysis(repositories)
+        analyzer.run_analysis(repositories, args.start, args.end)
         
         logger.info("데이터 분석 완료!")
     
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# github_analyzer/migrate.py
+
+"""CSV로 저장된 수집 데이터를 Parquet/partitioned 형식으로 일괄 변환
+
+저장소별 CSV를 MIGRATE_CHUNK_ROWS행씩 나눠 읽어 테이블 스키마(시각, 정수, 목록/사전 JSON 열)로
+변환하고, 커밋 메시지와 PR/이슈 본문은 텍스트 파일로 나눠 저장합니다. 파일 전체를 메모리에
+올리지 않으며, 저장소들은 여러 프로세스에서 동시에 변환합니다.
+
+변환한 테이블은 다시 읽어 행 수, 정수 열 합계, 키/시각 열 값 개수를 원본과 비교하고,
+검증에 통과하면 원본 CSV를 <테이블>.csv.orig로 남겨 두고 (delete_source이면 삭제),
+실패하면 새 파일을 지우고 원본을 복원합니다.
+"""
+
+import os
+import time
+import shutil
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import storage
+from collection_state import ENTITY_KEYS, CHILD_TABLES
+
+logger = logging.getLogger("GitHubCollector")
+
+# 변환 설정
+MIGRATE_CHUNK_ROWS = int(os.getenv("MIGRATE_CHUNK_ROWS", storage.CSV_CHUNK_ROWS))  # 한 번에 읽을 행 수
+MIGRATE_TABLES = list(ENTITY_KEYS) + [child["table"] for child in CHILD_TABLES.values()]
+BACKUP_SUFFIX = ".migrating"  # 변환하는 동안 원본 CSV 이름 (다른 형식 파일 정리와 읽기에서 제외됨)
+SOURCE_SUFFIX = ".orig"  # 변환이 끝난 뒤 남겨 두는 원본 CSV 이름 (읽기와 다음 변환에서 제외됨)
+
+def _keep_mask(path, table, chunk_rows):
+    """키가 중복된 행을 뺀 나머지 행 표시 (중복이 없으면 None)
+
+    같은 키는 커서 열(updated_at, 커밋은 date)이 가장 최근인 행을, 같으면 파일에서 나중 행을
+    남깁니다 (증분 수집의 병합 규칙과 같음). 먼저 키의 64비트 해시와 커서 값만 나눠 읽어
+    (행당 16바이트) 해시가 겹치는 행을 찾고, 그 행들의 실제 키만 다시 읽어 비교합니다.
+    하위 테이블(commit_files, pr_reviews)은 고유 키가 없으므로 그대로 둡니다.
+    """
+    if table not in ENTITY_KEYS:
+        return None
+    
+    key, cursor = ENTITY_KEYS[table]["key"], ENTITY_KEYS[table]["cursor"]
+    columns = [col for col in (key, cursor) if col in storage.stored_names(path)]
+    if key not in columns:
+        return None
+    
+    hashes, orders = [], []
+    for chunk in storage.read_csv(path, table, usecols=columns, chunksize=chunk_rows):
+        hashes.append(pd.util.hash_pandas_object(chunk[key].astype(str), index=False).to_numpy())
+        order = pd.to_datetime(chunk[cursor], errors='coerce', utc=True) if cursor in columns else pd.Series(pd.NaT, index=chunk.index)
+        orders.append(order.to_numpy(dtype="datetime64[us]"))
+    if not hashes:
+        return None
+    
+    hashes = np.concatenate(hashes)
+    candidates = np.flatnonzero(pd.Series(hashes).duplicated(keep=False).to_numpy())
+    if len(candidates) == 0:
+        return None
+    
+    # 해시가 겹치는 행의 실제 키로 중복 판단 (해시 충돌이면 서로 다른 행으로 유지)
+    keys, offset = [], 0
+    for chunk in storage.read_csv(path, table, usecols=[key], chunksize=chunk_rows):
+        positions = candidates[(candidates >= offset) & (candidates < offset + len(chunk))]
+        keys.append(chunk[key].astype(str).to_numpy()[positions - offset])
+        offset += len(chunk)
+    
+    rows = pd.DataFrame({"key": np.concatenate(keys), "order": np.concatenate(orders)[candidates]}, index=candidates)
+    latest = rows.sort_values("order", kind='stable', na_position='first').drop_duplicates("key", keep='last').index
+    
+    mask = np.ones(len(hashes), dtype=bool)
+    mask[candidates] = False
+    mask[latest] = True
+    return mask
+
+def _add_stats(stats, arrow_table, table):
+    """검증용 통계 누적: 행 수, 정수 열 합계, 키/시각 열의 값 개수"""
+    key = ENTITY_KEYS.get(table, {}).get("key")
+    stats["rows"] = stats.get("rows", 0) + arrow_table.num_rows
+    for field in storage.SCHEMAS[table]:
+        if field.name not in arrow_table.column_names:
+            continue
+        
+        column = arrow_table.column(field.name)
+        if pa.types.is_integer(field.type):
+            name = f"sum({field.name})"
+            stats[name] = stats.get(name, 0) + (pc.sum(column).as_py() or 0)
+        elif field.type == storage.TIMESTAMP or field.name == key:
+            name = f"count({field.name})"
+            stats[name] = stats.get(name, 0) + pc.count(column).as_py()
+    return stats
+
+def _text_rows(repo_dir, table):
+    """텍스트 파일의 행 수 (메모리 매핑으로 묶음 크기만 확인)"""
+    reader = pa.ipc.open_file(pa.memory_map(storage.text_path(repo_dir, table)))
+    return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+
+def _restore(repo_dir, table, backup_path, inline_text):
+    """변환 결과(테이블 파일, 원본에서 나눈 텍스트 파일)를 삭제하고 원본 CSV 복원"""
+    path = storage.table_path(repo_dir, table)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+    
+    if inline_text:
+        for text_path in (storage.text_path(repo_dir, table), storage.text_path(repo_dir, table) + ".tmp"):
+            if os.path.exists(text_path):
+                os.remove(text_path)
+    
+    os.replace(backup_path, storage.table_path(repo_dir, table, "csv"))
+
+def migrate_table(repo_dir, table, chunk_rows=MIGRATE_CHUNK_ROWS, delete_source=False):
+    """저장소 하나의 CSV 테이블을 STORAGE_FORMAT 형식으로 변환하고 검증 결과 반환 (CSV가 없으면 None)
+
+    검증에 통과한 원본 CSV는 <테이블>.csv.orig로 이름을 바꿔 남기며, delete_source이면 삭제합니다.
+    """
+    path = storage.table_path(repo_dir, table, "csv")
+    backup_path = path + BACKUP_SUFFIX
+    if os.path.exists(backup_path) and not os.path.exists(path):
+        # 이전 변환이 중단된 경우 원본부터 복원
+        os.replace(backup_path, path)
+    if not os.path.exists(path):
+        return None
+    
+    start_time = time.time()
+    report = {"table": table, "source_rows": 0, "duplicates": 0}
+    mask = _keep_mask(path, table, chunk_rows)
+    inline_text = storage.inline_text_columns(table, storage.stored_names(path))
+    
+    # 원본은 이름을 바꿔두어 새 파일을 쓰는 동안 CSV로 읽히거나 다른 형식 정리로 삭제되지 않도록 함
+    os.replace(path, backup_path)
+    written = {}
+    
+    def chunks():
+        offset = 0
+        for chunk in storage.read_csv(backup_path, table, chunksize=chunk_rows):
+            rows = len(chunk)
+            report["source_rows"] += rows
+            if mask is not None:
+                keep = mask[offset:offset + rows]
+                report["duplicates"] += int((~keep).sum())
+                chunk = chunk[keep]
+            offset += rows
+            yield chunk
+    
+    def arrow_tables():
+        frames = storage.split_text_chunks(chunks(), repo_dir, table) if inline_text else chunks()
+        for chunk in frames:
+            arrow_table = storage.to_arrow(chunk, table)
+            _add_stats(written, arrow_table, table)
+            yield arrow_table
+    
+    tables = arrow_tables()
+    try:
+        storage.write_arrow_tables(tables, repo_dir, table)
+        
+        stored = {}
+        for arrow_table in storage.iter_table(repo_dir, table, chunk_rows):
+            _add_stats(stored, arrow_table, table)
+        
+        mismatched = [name for name in written if written[name] != stored.get(name, 0)]
+        if inline_text and _text_rows(repo_dir, table) != written.get("rows", 0):
+            mismatched.append("text_rows")
+    except Exception as e:
+        tables.close()
+        _restore(repo_dir, table, backup_path, inline_text)
+        report.update({"rows": 0, "status": f"오류: {e}", "elapsed_sec": round(time.time() - start_time, 1)})
+        return report
+    
+    if mismatched:
+        _restore(repo_dir, table, backup_path, inline_text)
+        status = f"검증 실패: {', '.join(mismatched)}"
+    elif delete_source:
+        os.remove(backup_path)
+        status = "완료"
+    else:
+        os.replace(backup_path, path + SOURCE_SUFFIX)
+        status = "완료"
+    
+    report.update({
+        "rows": stored.get("rows", 0),
+        "text": ",".join(inline_text),
+        "status": status,
+        "elapsed_sec": round(time.time() - start_time, 1)
+    })
+    return report
+
+def migrate_repository(data_dir, repo_name, fmt, chunk_rows=MIGRATE_CHUNK_ROWS, delete_source=False):
+    """저장소 하나의 모든 CSV 테이블 변환 (작업 프로세스에서 실행, 저장 형식은 이 프로세스에만 적용)"""
+    storage.STORAGE_FORMAT = fmt
+    repo_dir = os.path.join(data_dir, repo_name.replace("/", "_"))
+    
+    reports = []
+    for table in MIGRATE_TABLES:
+        report = migrate_table(repo_dir, table, chunk_rows, delete_source)
+        if report is not None:
+            reports.append({"repo": repo_name, **report})
+            logger.info(f"저장소 {repo_name} {table} 변환 {report['status']}: {report['source_rows']}행 -> {report['rows']}행")
+    return reports
+
+def migrate_repositories(data_dir, repositories=None, fmt="partitioned", workers=4, chunk_rows=MIGRATE_CHUNK_ROWS,
+                         delete_source=False):
+    """여러 저장소의 CSV를 동시에 변환하고 검증 보고서(DataFrame) 반환
+
+    보고서는 <data_dir>/migration_report.csv에도 저장합니다. 원본 CSV는 delete_source일 때만 삭제합니다.
+    """
+    if fmt not in ("parquet", "partitioned"):
+        raise ValueError(f"변환 대상 형식은 parquet 또는 partitioned여야 합니다: {fmt}")
+    if repositories is None:
+        repositories = storage.list_repositories(data_dir)
+    
+    logger.info(f"저장소 {len(repositories)}개 CSV -> {fmt} 변환 시작 (동시 작업 {workers}개)")
+    start_time = time.time()
+    reports = []
+    
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(migrate_repository, data_dir, repo_name, fmt, chunk_rows, delete_source): repo_name
+            for repo_name in repositories
+        }
+        for future in as_completed(futures):
+            try:
+                reports += future.result()
+            except Exception as e:
+                logger.error(f"저장소 {futures[future]} 변환 중 오류: {e}")
+                reports.append({"repo": futures[future], "status": f"오류: {e}"})
+    
+    report_df = pd.DataFrame(reports, columns=["repo", "table", "source_rows", "duplicates", "rows", "text", "status", "elapsed_sec"])
+    report_df = report_df.sort_values(["repo", "table"], kind='stable').reset_index(drop=True)
+    report_df.to_csv(os.path.join(data_dir, "migration_report.csv"), index=False)
+    
+    failed = report_df[report_df["status"] != "완료"]
+    logger.info(
+        f"CSV 변환 요약 (총 {time.time() - start_time:.1f}초, {report_df['rows'].sum():.0f}행, "
+        f"중복 {report_df['duplicates'].sum():.0f}행 제거, 실패 {len(failed)}개):\n{report_df.to_string(index=False)}"
+    )
+    return report_df
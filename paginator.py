@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# github_analyzer/paginator.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+# GitHub REST API 목록 엔드포인트의 최대 페이지 크기
+MAX_PAGE_SIZE = 100
+
+def iter_pages(fetch_page, start=0, page_size=MAX_PAGE_SIZE, max_items=None, prefetch=True):
+    """페이지 번호 기반 목록을 순회하며 다음 페이지를 미리 요청
+
+    fetch_page(page_number)는 0부터 시작하는 페이지 번호를 받아 항목 목록을 반환하며,
+    전용 작업자 스레드에서 호출됩니다. PyGithub 연결 객체는 스레드 간 공유할 수 없으므로
+    fetch_page 안에서 해당 스레드의 클라이언트로 목록을 만들어야 하고, 호출자는 반환된
+    객체에서 추가 요청(지연 로딩)을 일으키는 속성에 접근하지 않아야 합니다.
+
+    (항목 목록, 다음 페이지 번호)를 반환하며, 마지막 페이지의 다음 번호는 None입니다.
+    max_items개를 받으면 더 이상 요청하지 않습니다.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        page_number = start
+        future = executor.submit(fetch_page, page_number)
+        fetched = 0
+        
+        while future is not None:
+            items = future.result()
+            fetched += len(items)
+            page_number += 1
+            
+            last_page = len(items) < page_size or (max_items is not None and fetched >= max_items)
+            future = None if last_page or not prefetch else executor.submit(fetch_page, page_number)
+            
+            # 다음 페이지를 받는 동안 호출자가 현재 페이지를 처리
+            yield items, None if last_page else page_number
+            
+            if future is None and not last_page:
+                future = executor.submit(fetch_page, page_number)
+
+def is_pull_request(issue):
+    """이슈 목록 항목이 PR인지 확인 (지연 로딩 요청 없이)
+
+    issue.pull_request와 issue.raw_data는 일반 이슈에서 전체 이슈를 다시 조회하므로
+    목록 응답 원본에 pull_request 키가 있는지 직접 확인합니다.
+    """
+    return "pull_request" in issue._rawData
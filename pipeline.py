@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# github_analyzer/pipeline.py
+
+"""run_analysis 분석 단계의 의존성 그래프 실행과 단계별 결과 캐시
+
+각 단계(STAGES)는 입력으로 정제 테이블 또는 앞 단계의 결과를 선언합니다. 단계의 캐시 키는
+입력 테이블 파일 목록(경로, 크기, 수정 시각, 앞뒤 내용 해시), 입력 단계의 키, 분석 범위와 설정, 분석 코드로 만들므로
+실행 전에 모든 단계의 키를 계산할 수 있습니다. 키가 같은 결과가 있는 단계는 실행하지 않고 저장해 둔
+반환값과 결과 파일(results 디렉토리에 쓴 CSV/JSON/그래프/모델)을 복원합니다.
+
+단계가 쓴 결과 파일 목록은 results 디렉토리의 OUTPUTS_FILE에 기록합니다. 단계를 다시 실행하거나 캐시에서
+복원하기 전에 그 단계가 이전에 쓴 파일을 지우므로, 이번 결과에 없는 파일(예: 줄어든 클러스터의 그래프)이 남지 않습니다.
+
+정제 데이터는 다시 실행할 단계가 있을 때만, 그 단계들의 입력 테이블만 로드합니다. 예를 들어 한 저장소의
+PR만 다시 수집했으면 커밋만 쓰는 단계(개발자/시간 패턴, 커밋 수)는 캐시를 사용하고 커밋 테이블은 읽지 않습니다.
+"""
+
+import os
+import json
+import time
+import pickle
+import shutil
+import hashlib
+import inspect
+import logging
+import storage
+import frames
+import snapshot
+
+logger = logging.getLogger("GitHubAnalyzer")
+
+# 단계 캐시 설정
+PIPELINE_CACHE_ENABLED = os.getenv("PIPELINE_CACHE_ENABLED", "true").lower() == "true"
+PIPELINE_CACHE_DIR = os.getenv("PIPELINE_CACHE_DIR", ".stage_cache")
+PIPELINE_CACHE_KEEP = int(os.getenv("PIPELINE_CACHE_KEEP", 4))  # 단계별로 유지할 최근 결과 수
+OUTPUTS_FILE = ".stage_outputs.json"  # results 디렉토리에 두는 단계별 결과 파일 목록
+
+# 정제 테이블을 만드는 입력 테이블 (pr_reviews는 이전 버전 PR의 reviewers 열에서도 만들어짐)
+TABLE_SOURCES = {
+    "commits": ["commits"],
+    "pull_requests": ["pull_requests"],
+    "issues": ["issues"],
+    "pr_reviews": ["pr_reviews", "pull_requests"]
+}
+
+# 분석 단계 (실행 순서): 분석기 메서드, 입력(정제 테이블 또는 앞 단계 이름, 메서드 인자 순서),
+# params(run의 params에서 키워드 인자로 전달할 값)
+STAGES = {
+    "dev_patterns": {"method": "analyze_developer_patterns", "inputs": ["commits"]},
+    "pr_patterns": {"method": "analyze_pr_patterns", "inputs": ["pull_requests", "pr_reviews"]},
+    "clustering": {"method": "cluster_developers", "inputs": ["commits", "pull_requests"]},
+    "time_patterns": {"method": "analyze_time_patterns", "inputs": ["commits"]},
+    "pr_model": {"method": "train_pr_approval_model", "inputs": ["pull_requests"]},
+    "commit_counts": {"method": "count_rows", "inputs": ["commits"]},
+    "pr_counts": {"method": "count_rows", "inputs": ["pull_requests"]},
+    "issue_counts": {"method": "count_rows", "inputs": ["issues"]},
+    "summary": {
+        "method": "save_summary",
+        "inputs": ["commit_counts", "pr_counts", "issue_counts", "clustering", "pr_model"],
+        "params": ["repositories"]
+    }
+}
+
+def _code_hash(analyzer):
+    """분석 코드(분석기 모듈과 storage, frames, 웨어하우스 백엔드이면 warehouse 모듈)의 해시
+
+    단계별 메서드가 모듈의 보조 함수들을 함께 쓰므로 모듈 단위로 비교합니다 (코드가 바뀌면 모든 단계를 다시 실행).
+    """
+    modules = [inspect.getmodule(type(analyzer)), storage, frames]
+    if analyzer.warehouse is not None:
+        modules.append(inspect.getmodule(type(analyzer.warehouse)))
+    return hashlib.sha256("".join(inspect.getsource(module) for module in modules).encode()).hexdigest()
+
+def stage_keys(analyzer, data_dir, repositories, params):
+    """단계별 캐시 키 (입력 테이블 파일, 입력 단계의 키, params, 분석 코드의 해시)"""
+    code = _code_hash(analyzer)
+    sources = {table: snapshot.fingerprint(data_dir, repositories, tables=[table]) for table in snapshot.SNAPSHOT_TABLES}
+    
+    keys = {}
+    for name, stage in STAGES.items():
+        inputs = [
+            [sources[source] for source in TABLE_SOURCES[item]] if item in TABLE_SOURCES else keys[item]
+            for item in stage["inputs"]
+        ]
+        raw = json.dumps(
+            {"stage": name, "method": stage["method"], "inputs": inputs, "params": params, "code": code},
+            default=str, sort_keys=True
+        )
+        keys[name] = hashlib.sha256(raw.encode()).hexdigest()[:32]
+    return keys
+
+def _cache_path(name, key):
+    return os.path.join(PIPELINE_CACHE_DIR, name, key)
+
+def _result_files(results_dir):
+    """결과 디렉토리의 파일별 (크기, 수정 시각) (상대 경로 기준)"""
+    files = {}
+    for root, _, names in os.walk(results_dir):
+        for file_name in names:
+            if root == results_dir and file_name == OUTPUTS_FILE:
+                continue
+            stat = os.stat(os.path.join(root, file_name))
+            files[os.path.relpath(os.path.join(root, file_name), results_dir)] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+def _load_outputs(results_dir):
+    """이전 실행에서 단계별로 쓴 결과 파일 목록 {단계 이름: [상대 경로]} (없거나 읽을 수 없으면 빈 사전)"""
+    try:
+        with open(os.path.join(results_dir, OUTPUTS_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_outputs(results_dir, outputs):
+    """단계별 결과 파일 목록 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = os.path.join(results_dir, OUTPUTS_FILE)
+    try:
+        os.makedirs(results_dir, exist_ok=True)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(outputs, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(f"{path}.tmp", path)
+    except OSError as e:
+        logger.warning(f"분석 단계 결과 파일 목록 저장 실패: {e}")
+
+def _remove_outputs(results_dir, relatives):
+    """단계가 이전에 쓴 결과 파일 삭제 (이미 없는 파일은 무시)"""
+    for relative in relatives:
+        try:
+            os.remove(os.path.join(results_dir, relative))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"이전 결과 파일 {relative} 삭제 실패: {e}")
+
+def _load_result(name, key, results_dir):
+    """캐시된 단계 결과를 (반환값, 결과 파일 목록)으로 읽고 결과 파일을 results_dir에 복원 (없거나 읽을 수 없으면 None)"""
+    path = _cache_path(name, key)
+    if not os.path.exists(os.path.join(path, "result.pkl")):
+        return None
+    
+    try:
+        with open(os.path.join(path, "result.pkl"), "rb") as f:
+            result = pickle.load(f)
+        
+        files_dir = os.path.join(path, "files")
+        outputs = []
+        for root, _, names in os.walk(files_dir):
+            for file_name in names:
+                relative = os.path.relpath(os.path.join(root, file_name), files_dir)
+                target = os.path.join(results_dir, relative)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(os.path.join(root, file_name), target)
+                outputs.append(relative)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        logger.warning(f"분석 단계 {name} 캐시 {key} 읽기 실패, 다시 실행합니다: {e}")
+        return None
+    
+    # 최근에 사용한 결과가 정리되지 않도록 수정 시각 갱신
+    os.utime(path)
+    return result, sorted(outputs)
+
+def _save_result(name, key, result, outputs, results_dir):
+    """단계 반환값과 실행 중 쓴 결과 파일(outputs: results_dir 기준 상대 경로)을 캐시에 저장 (실패해도 분석은 계속)"""
+    path = _cache_path(name, key)
+    if os.path.isdir(path):
+        return
+    
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(tmp_path, exist_ok=True)
+        with open(os.path.join(tmp_path, "result.pkl"), "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        for relative in outputs:
+            target = os.path.join(tmp_path, "files", relative)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(os.path.join(results_dir, relative), target)
+        os.replace(tmp_path, path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+        logger.warning(f"분석 단계 {name} 캐시 저장 실패: {e}")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        return
+    
+    prune(name)
+
+def prune(name, keep=PIPELINE_CACHE_KEEP):
+    """단계의 캐시 결과 중 최근에 사용한 keep개를 제외하고 삭제"""
+    stage_dir = os.path.join(PIPELINE_CACHE_DIR, name)
+    if not os.path.isdir(stage_dir):
+        return
+    
+    entries = sorted(
+        (entry for entry in os.scandir(stage_dir) if entry.is_dir() and not entry.name.endswith(".tmp")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True
+    )
+    for entry in entries[keep:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+def run(analyzer, load, data_dir, repositories, params, results_dir):
+    """STAGES를 순서대로 실행하고 단계 이름별 결과 사전 반환
+
+    load(tables)는 정제 테이블 이름 목록(None이면 전부)을 받아 정제 데이터 사전을 반환하는 함수로,
+    다시 실행할 단계가 있을 때 한 번만 호출됩니다. repositories는 입력 파일을 찾을 저장소 목록,
+    params는 분석 범위와 설정(JSON으로 직렬화 가능한 값)이며 모든 단계의 키에 포함됩니다.
+    PIPELINE_CACHE_ENABLED가 꺼져 있으면 모든 단계를 실행하고 캐시에 저장하지 않습니다.
+    각 단계의 이전 결과 파일은 복원하거나 다시 실행하기 전에 지웁니다.
+    """
+    start_time = time.time()
+    keys = stage_keys(analyzer, data_dir, repositories, params) if PIPELINE_CACHE_ENABLED else {}
+    previous = _load_outputs(results_dir)
+    stage_outputs = {}
+    
+    results, pending = {}, []
+    for name in STAGES:
+        _remove_outputs(results_dir, previous.get(name, []))
+        cached = _load_result(name, keys[name], results_dir) if PIPELINE_CACHE_ENABLED else None
+        if cached is None:
+            pending.append(name)
+        else:
+            results[name], stage_outputs[name] = cached
+    _save_outputs(results_dir, stage_outputs)
+    
+    if PIPELINE_CACHE_ENABLED:
+        logger.info(
+            f"분석 단계 캐시 사용: {', '.join(name for name in STAGES if name in results) or '없음'} / "
+            f"다시 실행: {', '.join(pending) or '없음'} ({time.time() - start_time:.2f}초)"
+        )
+    
+    # 다시 실행할 단계들의 입력 테이블만 로드 (캐시를 쓰지 않으면 전체)
+    tables = sorted({
+        source
+        for name in pending for item in STAGES[name]["inputs"] if item in TABLE_SOURCES
+        for source in TABLE_SOURCES[item]
+    })
+    data = {}
+    if tables:
+        data = load(tables if PIPELINE_CACHE_ENABLED else None)
+    
+    for name in pending:
+        stage = STAGES[name]
+        args = [data[item] if item in TABLE_SOURCES else results[item] for item in stage["inputs"]]
+        kwargs = {param: params[param] for param in stage.get("params", [])}
+        
+        before = _result_files(results_dir)
+        results[name] = getattr(analyzer, stage["method"])(*args, **kwargs)
+        after = _result_files(results_dir)
+        stage_outputs[name] = sorted(relative for relative, stat in after.items() if before.get(relative) != stat)
+        _save_outputs(results_dir, stage_outputs)
+        if PIPELINE_CACHE_ENABLED:
+            _save_result(name, keys[name], results[name], stage_outputs[name], results_dir)
+    
+    return results
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# github_analyzer/rate_limiter.py
+
+import os
+import time
+import logging
+import threading
+from github_transport import install_layer
+
+logger = logging.getLogger("GitHubCollector")
+
+# 속도 제한 설정
+RATE_LIMIT_RESERVE = int(os.getenv("RATE_LIMIT_RESERVE", 50))     # 항상 남겨둘 요청 수
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", 500))        # 한 번에 몰아서 보낼 수 있는 최대 요청 수
+SECONDARY_LIMIT_BACKOFF = 60                                      # 2차 제한 기본 대기 시간(초)
+MAX_RATE_LIMIT_RETRIES = 5
+RATE_LIMIT_STATUSES = (403, 429)  # 속도 제한 응답일 수 있는 상태 코드 (이때만 본문을 읽어 확인)
+
+class AdaptiveRateLimiter:
+    """X-RateLimit-* 응답 헤더로 갱신되는 토큰 버킷 (스레드 간 공유)
+
+    남은 요청 수(remaining)에서 예비분을 뺀 만큼을 리셋 시각까지 균등하게
+    채우므로, 한도가 넉넉하면 대기 없이 요청하고 부족할 때만 속도를 줄입니다.
+    2차(abuse) 제한에 걸리면 Retry-After 또는 지수 백오프만큼 모든 요청을 멈춥니다.
+    """
+    
+    def __init__(self, reserve=RATE_LIMIT_RESERVE, burst=RATE_LIMIT_BURST, name="core"):
+        """속도 제한기 초기화 (첫 응답 헤더를 받기 전까지는 제한 없음)"""
+        self.name = name
+        self.reserve = reserve
+        self.burst = burst
+        self.remaining = None
+        self.limit = None
+        self.reset_at = None
+        self.tokens = float(burst)
+        self.rate = None  # 초당 충전되는 토큰 수
+        self._updated_at = time.time()
+        self._blocked_until = 0
+        self._backoff_count = 0
+        self._lock = threading.Lock()
+    
+    def _refill(self, now):
+        if self.rate is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+    
+    def acquire(self):
+        """요청 하나를 보낼 수 있을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.time()
+                self._refill(now)
+                
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self.remaining is None:
+                    return
+                elif self.reset_at is not None and now >= self.reset_at:
+                    # 리셋 시각이 지남: 다음 응답 헤더로 다시 갱신될 때까지 제한 없음
+                    self.remaining = None
+                    self.tokens = float(self.burst)
+                    return
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.remaining -= 1
+                    return
+                elif self.rate:
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    wait = self.reset_at - now + 1
+            
+            if wait > 5:
+                logger.warning(f"API 속도 제한({self.name}): {self.remaining} 남음. {wait:.0f}초 대기 중...")
+            time.sleep(wait)
+    
+    def update(self, headers):
+        """응답 헤더(소문자 키)로 남은 요청 수와 충전 속도 갱신"""
+        if "x-ratelimit-remaining" not in headers or "x-ratelimit-reset" not in headers:
+            return
+        
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            
+            self.remaining = int(float(headers["x-ratelimit-remaining"]))
+            self.reset_at = float(headers["x-ratelimit-reset"])
+            if "x-ratelimit-limit" in headers:
+                self.limit = int(float(headers["x-ratelimit-limit"]))
+            
+            usable = max(self.remaining - self.reserve, 0)
+            self.rate = usable / max(self.reset_at - now, 1)
+            self.tokens = min(self.tokens, usable)
+            
+            if self._blocked_until <= now:
+                self._backoff_count = 0
+    
+    def backoff(self, retry_after=None):
+        """2차 속도 제한: Retry-After가 없으면 60초부터 두 배씩 늘려가며 모든 요청 중지"""
+        with self._lock:
+            if retry_after is not None:
+                wait = float(retry_after)
+            else:
+                wait = min(SECONDARY_LIMIT_BACKOFF * 2 ** self._backoff_count, 900)
+                self._backoff_count += 1
+            self._blocked_until = max(self._blocked_until, time.time() + wait)
+        
+        logger.warning(f"2차 속도 제한 감지({self.name}). {wait:.0f}초 후 재시도...")
+    
+    def wait_if_below(self, min_remaining):
+        """남은 요청 수가 min_remaining 미만이면 리셋 시각까지 대기"""
+        with self._lock:
+            wait = 0
+            if self.remaining is not None and self.remaining < min_remaining and self.reset_at:
+                wait = max(self.reset_at - time.time(), 0) + 10  # 10초 추가 여유
+        
+        if wait > 0:
+            logger.warning(f"API 속도 제한 거의 도달: {self.remaining} 남음. {wait:.0f}초 대기 중...")
+            time.sleep(wait)
+    
+    def headroom(self):
+        """예비분을 제외하고 지금 사용할 수 있는 요청 수 (헤더를 받기 전이면 None)"""
+        with self._lock:
+            now = time.time()
+            if now < self._blocked_until:
+                return 0
+            if self.remaining is None or (self.reset_at is not None and now >= self.reset_at):
+                return None
+            return max(self.remaining - self.reserve, 0)
+    
+    def ready_at(self):
+        """다시 요청할 수 있게 되는 시각 (2차 제한 해제 또는 한도 리셋 시각)"""
+        with self._lock:
+            if self.remaining is not None and self.remaining <= self.reserve and self.reset_at:
+                return max(self._blocked_until, self.reset_at)
+            return self._blocked_until
+    
+    def status(self):
+        """현재 속도 제한 상태"""
+        return {
+            "remaining": self.remaining,
+            "limit": self.limit,
+            "reset_at": self.reset_at,
+            "rate_per_sec": self.rate
+        }
+
+class ResourceLimiters:
+    """속도 제한 리소스(x-ratelimit-resource)별 AdaptiveRateLimiter
+
+    검색 API(search, 분당 30회)처럼 core(시간당 5000회)와 한도와 리셋 시각이 다른 리소스의
+    응답이 core 버킷을 덮어쓰지 않도록 리소스마다 제한기를 따로 둡니다. core 제한기는 처음부터
+    있고, 나머지는 처음 사용할 때 만듭니다. core 외 리소스는 한도가 예비분(RATE_LIMIT_RESERVE)보다
+    작을 수 있으므로 예비분 없이 한도를 모두 사용합니다.
+    """
+    
+    def __init__(self, core, name="core"):
+        self.name = name
+        self._limiters = {"core": core}
+        self._lock = threading.Lock()
+    
+    def get(self, resource):
+        """리소스의 제한기 (없으면 생성)"""
+        with self._lock:
+            if resource not in self._limiters:
+                self._limiters[resource] = AdaptiveRateLimiter(reserve=0, name=f"{self.name}/{resource}")
+            return self._limiters[resource]
+
+def request_resource(url):
+    """요청 경로로 정한 속도 제한 리소스 (검색 API는 search, 그 외 REST 요청은 core)"""
+    return "search" if "/search/" in url.split("?")[0] else "core"
+
+def response_resource(headers, default):
+    """응답이 속한 속도 제한 리소스 (x-ratelimit-resource 헤더, 없으면 요청 경로로 정한 리소스)"""
+    return headers.get("x-ratelimit-resource", default)
+
+def is_rate_limited(status, headers, body):
+    """1차/2차 속도 제한 응답 여부 (403/429)"""
+    if status not in RATE_LIMIT_STATUSES:
+        return False
+    return "retry-after" in headers or headers.get("x-ratelimit-remaining") == "0" or "rate limit" in str(body).lower()
+
+def rate_limited_connection(base_class, limiters):
+    """요청 전에 리소스별 제한기에서 토큰을 받고 응답 헤더로 해당 리소스의 제한기를 갱신하는 연결 클래스 생성"""
+    
+    class RateLimitedConnection(base_class):
+        def getresponse(self):
+            resource = request_resource(self.url)
+            limiter = limiters.get(resource)
+            for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+                limiter.acquire()
+                response = super().getresponse()
+                headers = {k.lower(): v for k, v in response.getheaders()}
+                limiters.get(response_resource(headers, resource)).update(headers)
+                
+                # 본문은 속도 제한일 수 있는 응답(403/429)에서만 읽음
+                if attempt == MAX_RATE_LIMIT_RETRIES or getattr(self, "stream", False) or \
+                        response.status not in RATE_LIMIT_STATUSES or \
+                        not is_rate_limited(response.status, headers, response.read()):
+                    return response
+                
+                # 1차 제한이 소진된 경우 acquire()가 리셋 시각까지 대기하므로 2차 제한만 백오프
+                if headers.get("x-ratelimit-remaining") != "0":
+                    limiter.backoff(headers.get("retry-after"))
+    
+    RateLimitedConnection.__name__ = f"RateLimited{base_class.__name__}"
+    return RateLimitedConnection
+
+_limiter = None
+
+def install_rate_limiter():
+    """PyGithub 요청 계층에 공유 속도 제한기 설치 (여러 번 호출해도 한 번만 설치, core 제한기 반환)"""
+    global _limiter
+    
+    if _limiter is None:
+        _limiter = AdaptiveRateLimiter()
+        limiters = ResourceLimiters(_limiter)
+        install_layer("rate_limiter", lambda base_class: rate_limited_connection(base_class, limiters))
+    
+    return _limiter
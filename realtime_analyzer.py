@@ -18,6 +18,9 @@ import json
 import re
 from collections import Counter
 import logging
+from http_cache import HTTP_CACHE_ENABLED, install_http_cache
+from rate_limiter import install_rate_limiter
+from paginator import is_pull_request
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -26,6 +29,10 @@ logger = logging.getLogger(__name__)
 class RealtimeGitHubAnalyzer:
     def __init__(self, github_token: str):
         """실시간 GitHub 분석기 초기화"""
+        # 조건부 요청 캐시 (변경 없는 저장소 재조회 시 304 응답을 디스크에서 제공)
+        if HTTP_CACHE_ENABLED:
+            install_http_cache()
+        install_rate_limiter()
         self.github = Github(github_token)
         self.rate_limit_buffer = 100  # API 속도 제한 버퍼
     
@@ -168,8 +175,8 @@ class RealtimeGitHubAnalyzer:
                 analysis['recent_activity'].update({
                     'open_prs': len([pr for pr in recent_prs if pr.state == 'open']),
                     'closed_prs': len([pr for pr in recent_prs if pr.state == 'closed']),
-                    'open_issues': len([issue for issue in recent_issues if issue.state == 'open' and not issue.pull_request]),
-                    'closed_issues': len([issue for issue in recent_issues if issue.state == 'closed' and not issue.pull_request])
+                    'open_issues': len([issue for issue in recent_issues if issue.state == 'open' and not is_pull_request(issue)]),
+                    'closed_issues': len([issue for issue in recent_issues if issue.state == 'closed' and not is_pull_request(issue)])
                 })
             except:
                 pass
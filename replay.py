@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# github_analyzer/replay.py
+
+import os
+import json
+import time
+import re
+import hashlib
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from github_transport import install_layer
+
+logger = logging.getLogger("GitHubCollector")
+
+# 녹화/재생 설정
+REPLAY_MODE = os.getenv("REPLAY_MODE", "off")                         # off, record, replay
+REPLAY_CASSETTE_DIR = os.getenv("REPLAY_CASSETTE_DIR", "cassettes")
+REPLAY_LATENCY_MS = float(os.getenv("REPLAY_LATENCY_MS", 0))          # 재생 시 요청당 지연 시간
+REPLAY_RATE_LIMIT = int(os.getenv("REPLAY_RATE_LIMIT", 5000))         # 재생 시 토큰당 시간당 요청 수 (0이면 녹화된 헤더 사용)
+REPLAY_RATE_LIMIT_WINDOW = 3600
+
+# 요청 키에서 제외할 시각 값 (since 등은 실행 시각 기준이므로 녹화 때와 재생 때 달라짐)
+TIMESTAMP_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}(?::|%3A)\d{2}(?::|%3A)\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}(?::|%3A)\d{2}|%2B\d{2}%3A\d{2})?")
+
+class Cassette:
+    """녹화된 API 응답 저장소 (요청 하나가 파일 하나: <key>.json)"""
+    
+    def __init__(self, cassette_dir=REPLAY_CASSETTE_DIR):
+        self.cassette_dir = cassette_dir
+        os.makedirs(cassette_dir, exist_ok=True)
+    
+    @staticmethod
+    def make_key(method, url, body):
+        """메서드, URL(쿼리 파라미터 포함), 본문으로 키 생성 (토큰, 시각 값과 무관)"""
+        if isinstance(body, bytes):
+            body = body.decode("utf-8", errors="replace")
+        raw = TIMESTAMP_PATTERN.sub("<time>", f"{method} {url}|{body or ''}")
+        return hashlib.sha256(raw.encode()).hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.cassette_dir, f"{key}.json")
+    
+    def get(self, key):
+        """녹화된 응답 조회, 없으면 None"""
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, key, entry):
+        """응답 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    
+    def __len__(self):
+        return sum(1 for name in os.listdir(self.cassette_dir) if name.endswith(".json"))
+
+class ReplayAdapter(HTTPAdapter):
+    """카세트에 응답을 녹화하거나 네트워크 없이 재생하는 requests 어댑터
+
+    재생 모드에서는 요청마다 latency_ms만큼 지연하고, rate_limit이 주어지면
+    토큰(Authorization 헤더)별로 X-RateLimit-* 헤더를 합성하여 한도를 넘으면
+    403을 반환합니다. If-None-Match가 녹화된 ETag와 같으면 304를 반환하며,
+    304는 실제 API와 마찬가지로 한도에 포함하지 않습니다.
+    """
+    
+    def __init__(self, cassette, mode="replay", latency_ms=REPLAY_LATENCY_MS, rate_limit=REPLAY_RATE_LIMIT):
+        super().__init__()
+        self.cassette = cassette
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.rate_limit = rate_limit
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """요청 통계와 합성 속도 제한 초기화 (벤치마크 실행 사이에 호출)"""
+        with self._lock:
+            self.stats = {"requests": 0, "not_modified": 0, "rate_limited": 0, "misses": 0}
+            self._used = {}
+            self._reset_at = int(time.time()) + REPLAY_RATE_LIMIT_WINDOW
+    
+    def send(self, request, **kwargs):
+        key = self.cassette.make_key(request.method, request.url, request.body)
+        
+        if self.mode == "record":
+            response = super().send(request, **kwargs)
+            if response.status_code != 304:
+                self.cassette.put(key, {
+                    "method": request.method,
+                    "url": request.url,
+                    "status": response.status_code,
+                    "headers": dict(response.headers),
+                    "body": response.content.decode("utf-8", errors="replace")
+                })
+            return response
+        
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        
+        entry = self.cassette.get(key)
+        with self._lock:
+            self.stats["requests"] += 1
+            if entry is None:
+                self.stats["misses"] += 1
+        
+        if entry is None:
+            raise requests.ConnectionError(f"카세트에 녹화되지 않은 요청: {request.method} {request.url}", request=request)
+        
+        headers = CaseInsensitiveDict(entry["headers"])
+        headers.pop("Content-Encoding", None)
+        headers.pop("Transfer-Encoding", None)
+        status, body = entry["status"], entry["body"]
+        
+        if request.headers.get("If-None-Match") and request.headers["If-None-Match"] == headers.get("ETag"):
+            status, body = 304, ""
+        
+        if self.rate_limit:
+            status, body = self._apply_rate_limit(request, headers, status, body)
+        
+        return self._build_response(request, status, headers, body)
+    
+    def _apply_rate_limit(self, request, headers, status, body):
+        """토큰별 사용량으로 X-RateLimit-* 헤더 합성, 한도 초과 시 403"""
+        token = request.headers.get("Authorization", "anonymous")
+        
+        with self._lock:
+            now = time.time()
+            if now >= self._reset_at:
+                self._used = {}
+                self._reset_at = int(now) + REPLAY_RATE_LIMIT_WINDOW
+            
+            used = self._used.get(token, 0)
+            if used >= self.rate_limit:
+                self.stats["rate_limited"] += 1
+                status, body = 403, json.dumps({"message": "API rate limit exceeded (replay)"})
+            elif status == 304:
+                self.stats["not_modified"] += 1
+            else:
+                used += 1
+                self._used[token] = used
+            
+            # /rate_limit 응답 본문도 합성한 값으로 교체
+            if request.path_url.split("?")[0].endswith("/rate_limit") and status == 200:
+                core = {"limit": self.rate_limit, "remaining": self.rate_limit - used,
+                        "reset": self._reset_at, "used": used}
+                body = json.dumps({"resources": {"core": core, "search": core, "graphql": core}, "rate": core})
+            
+            headers["X-RateLimit-Limit"] = str(self.rate_limit)
+            headers["X-RateLimit-Remaining"] = str(max(self.rate_limit - used, 0))
+            headers["X-RateLimit-Reset"] = str(self._reset_at)
+        
+        return status, body
+    
+    @staticmethod
+    def _build_response(request, status, headers, body):
+        response = requests.Response()
+        response.status_code = status
+        response.headers = headers
+        response._content = body.encode("utf-8")
+        response.headers["Content-Length"] = str(len(response._content))
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.reason = "OK" if status < 400 else "Error"
+        return response
+
+def replay_connection(base_class, adapter):
+    """PyGithub 연결의 requests 세션에 녹화/재생 어댑터를 연결하는 연결 클래스 생성"""
+    
+    class ReplayConnection(base_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+    
+    ReplayConnection.__name__ = f"Replay{base_class.__name__}"
+    return ReplayConnection
+
+_adapter = None
+
+def install_replay(mode=REPLAY_MODE, cassette_dir=REPLAY_CASSETTE_DIR, latency_ms=REPLAY_LATENCY_MS,
+                   rate_limit=REPLAY_RATE_LIMIT):
+    """PyGithub 요청 계층에 녹화/재생 어댑터 설치 (mode가 off이면 설치하지 않음)
+
+    GraphQL 수집기처럼 requests 세션을 직접 쓰는 곳은 mount_replay()로 연결합니다.
+    """
+    global _adapter
+    
+    if mode == "off":
+        return None
+    
+    if _adapter is None:
+        _adapter = ReplayAdapter(Cassette(cassette_dir), mode, latency_ms, rate_limit)
+        install_layer("replay", lambda base_class: replay_connection(base_class, _adapter))
+        logger.info(f"API {'녹화' if mode == 'record' else '재생'} 모드: {cassette_dir} ({len(_adapter.cassette)}개 응답)")
+    
+    return _adapter
+
+def mount_replay(session):
+    """녹화/재생 모드가 설치된 경우 requests 세션에도 어댑터 연결"""
+    if _adapter is not None:
+        session.mount("http://", _adapter)
+        session.mount("https://", _adapter)
+    return session
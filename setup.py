@@ -13,10 +13,17 @@ for directory in directories:
 # .env 파일 생성 (GitHub 토큰 저장용)
 env_content = """# GitHub API 토큰
 GITHUB_TOKEN=your_github_token_here
+# 여러 토큰 사용 시 (쉼표 구분)
+# GITHUB_TOKENS=token1,token2
 
 # 기타 설정
 MAX_ITEMS_PER_REQUEST=100
-REQUEST_DELAY=0.5
+RATE_LIMIT_RESERVE=50
+MAX_WORKERS=8
+HTTP_CACHE_ENABLED=true
+HTTP_CACHE_MAX_MB=256
+STORAGE_FORMAT=csv
+ANALYSIS_BACKEND=pandas
 """
 
 with open('.env', 'w') as f:
@@ -25,6 +32,8 @@ print(".env 파일 생성됨 - GitHub 토큰을 추가해주세요")
 
 # requirements.txt 생성
 requirements = """pandas>=1.3.0
+pyarrow>=13.0.0
+duckdb>=0.10.0
 numpy>=1.20.0
 matplotlib>=3.4.0
 seaborn>=0.11.0
@@ -32,6 +41,7 @@ plotly>=5.3.0
 scikit-learn>=1.0.0
 streamlit>=1.10.0
 PyGithub>=1.55.0
+requests>=2.25.0
 python-dotenv>=0.19.0
 networkx>=2.6.0
 joblib>=1.1.0
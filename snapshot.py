@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# github_analyzer/snapshot.py
+
+"""정제된 분석 데이터(clean_data 결과)의 스냅샷 캐시
+
+입력 테이블 파일 목록(경로, 크기, 수정 시각, 앞뒤 내용 해시)과 분석 범위, 정제 설정으로 만든 키마다
+테이블별 DataFrame을 압축하지 않은 Arrow IPC(Feather) 파일로 저장합니다.
+데이터 디렉토리가 바뀌지 않았으면 다음 분석은 load_data/clean_data를 다시 실행하지 않고
+스냅샷을 메모리 매핑으로 읽습니다.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import storage
+
+logger = logging.getLogger("GitHubAnalyzer")
+
+# 스냅샷 설정
+SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "true").lower() == "true"
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", ".snapshots")
+SNAPSHOT_KEEP = int(os.getenv("SNAPSHOT_KEEP", 4))  # 유지할 최근 스냅샷 수
+
+# 정제 결과를 만드는 입력 테이블 (pr_reviews는 이전 버전 PR의 reviewers 열에서도 만들어짐)
+SNAPSHOT_TABLES = ("commits", "pull_requests", "issues", "pr_reviews")
+
+# 파일마다 내용 해시에 읽을 앞/뒤 바이트 수 (Parquet은 끝부분에 행 그룹 통계가 있는 푸터가 포함됨)
+FINGERPRINT_SAMPLE_BYTES = 64 * 1024
+
+def _table_files(repo_dir, table):
+    """테이블을 이루는 파일 목록 (partitioned 형식은 파티션 디렉토리 아래의 모든 파일, 증분 수집의 델타 조각 포함)"""
+    path = storage.find_table(repo_dir, table)
+    if path is None:
+        return []
+    if not os.path.isdir(path):
+        return [path] + storage.list_deltas(repo_dir, table)
+    return sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(path)
+        for name in names
+    ) + storage.list_deltas(repo_dir, table)
+
+def _content_hash(path, size):
+    """파일 앞뒤 FINGERPRINT_SAMPLE_BYTES바이트의 해시 (그 두 배 이하인 파일은 전체)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+        if size > FINGERPRINT_SAMPLE_BYTES:
+            f.seek(max(FINGERPRINT_SAMPLE_BYTES, size - FINGERPRINT_SAMPLE_BYTES))
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def fingerprint(data_dir, repositories, tables=SNAPSHOT_TABLES, **config):
+    """입력 파일 목록(경로, 크기, 수정 시각, 앞뒤 내용 해시)과 설정(config, JSON으로 직렬화 가능한 값)의 해시
+
+    tables를 주면 해당 테이블의 파일만 봅니다 (테이블 목록도 해시에 포함).
+    파일마다 앞뒤 FINGERPRINT_SAMPLE_BYTES바이트만 읽으므로 파일 크기와 관계없이 파일 수에 비례하는 시간만 걸리며,
+    복사/동기화 도구가 크기와 수정 시각을 그대로 둔 채 내용을 바꾼 경우도 (앞뒤 구간이 달라졌으면) 구분합니다.
+    """
+    files = []
+    for repo_name in repositories:
+        repo_dir = os.path.join(data_dir, repo_name.replace("/", "_"))
+        for table in tables:
+            for path in _table_files(repo_dir, table):
+                stat = os.stat(path)
+                files.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns, _content_hash(path, stat.st_size)])
+    
+    raw = json.dumps({"repositories": list(repositories), "tables": list(tables), "files": files, "config": config}, default=str, sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+def _snapshot_path(key):
+    return os.path.join(SNAPSHOT_DIR, key)
+
+def _restore_lists(df, schema):
+    """Arrow 목록 열은 to_pandas에서 numpy 배열이 되므로 수집 데이터와 같이 list로 되돌림"""
+    for field in schema:
+        if pa.types.is_list(field.type) and field.name in df.columns:
+            df[field.name] = df[field.name].map(lambda items: list(items) if items is not None else items)
+    return df
+
+def load(key):
+    """키에 해당하는 스냅샷을 테이블별 DataFrame 사전으로 읽기 (없거나 읽을 수 없으면 None)
+
+    숫자 열은 메모리 매핑된 파일을 복사하지 않고 그대로 사용합니다.
+    """
+    path = _snapshot_path(key)
+    if not os.path.isdir(path):
+        return None
+    
+    start_time = time.time()
+    data = {}
+    try:
+        for name in sorted(os.listdir(path)):
+            if not name.endswith(".arrow"):
+                continue
+            table = pa.ipc.open_file(pa.memory_map(os.path.join(path, name))).read_all()
+            data[name[:-len(".arrow")]] = _restore_lists(table.to_pandas(split_blocks=True), table.schema)
+    except (OSError, pa.ArrowInvalid) as e:
+        logger.warning(f"스냅샷 {key} 읽기 실패, 다시 정제합니다: {e}")
+        return None
+    
+    # 최근에 사용한 스냅샷이 정리되지 않도록 수정 시각 갱신
+    os.utime(path)
+    logger.info(f"정제 스냅샷 사용: {key} ({', '.join(f'{t} {len(df)}행' for t, df in data.items())}, {time.time() - start_time:.2f}초)")
+    return data
+
+def save(key, data):
+    """테이블별 DataFrame 사전을 스냅샷으로 저장 (임시 디렉토리에 쓴 뒤 교체, 실패해도 분석은 계속)"""
+    path = _snapshot_path(key)
+    if os.path.isdir(path):
+        return
+    
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(tmp_path, exist_ok=True)
+        for table, df in data.items():
+            if isinstance(df, pd.DataFrame):
+                feather.write_feather(df, os.path.join(tmp_path, f"{table}.arrow"), compression="uncompressed")
+        os.replace(tmp_path, path)
+    except (OSError, pa.ArrowException) as e:
+        logger.warning(f"스냅샷 {key} 저장 실패: {e}")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        return
+    
+    logger.info(f"정제 스냅샷 저장: {path}")
+    prune()
+
+def prune(keep=SNAPSHOT_KEEP):
+    """최근에 사용한 keep개를 제외한 스냅샷 삭제"""
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return
+    
+    snapshots = sorted(
+        (entry for entry in os.scandir(SNAPSHOT_DIR) if entry.is_dir() and not entry.name.endswith(".tmp")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True
+    )
+    for entry in snapshots[keep:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
@@ -0,0 +1,1027 @@
+#!/usr/bin/env python3
+# github_analyzer/storage.py
+
+import os
+import json
+import time
+import shutil
+import fcntl
+import logging
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from datetime import datetime, timezone
+from urllib.parse import quote
+from collection_state import ENTITY_KEYS, CHILD_TABLES, child_key, to_utc
+
+logger = logging.getLogger("GitHubCollector")
+
+# 저장 형식 설정
+STORAGE_FORMAT = os.getenv("STORAGE_FORMAT", "csv")  # csv, parquet 또는 partitioned
+STORAGE_FORMATS = ("csv", "parquet", "partitioned")
+PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "zstd")
+CSV_CHUNK_ROWS = 50000  # CSV를 나눠 읽을 때(partial CSV 변환, 분석용 typed 로드) 한 번에 읽을 행 수
+COMPACT_MIN_DELTAS = int(os.getenv("COMPACT_MIN_DELTAS", 8))  # 증분 수집 후 자동 압축할 델타 조각 수 (0이면 자동 압축 안 함)
+
+# 증분 수집 변경분(델타 조각): <저장소 디렉토리>/<테이블>.deltas/<순번>.parquet (+ <순번>_text.arrow)
+# 읽을 때 키가 같은 기존 행을 델타 행으로 교체하며, 압축(compact_table) 시 기본 테이블 파일에 합쳐짐
+DELTA_SUFFIX = ".deltas"
+DELETED_COLUMN = "_deleted"  # 델타의 삭제 표시 행 (키만 있고 해당 키의 기존 행을 모두 삭제)
+
+# 읽는 도중 압축/파티션 교체로 파일이 사라졌을 때 델타 목록과 테이블 경로부터 다시 읽을 횟수와 간격(초, 시도마다 증가)
+READ_RETRIES = 5
+READ_RETRY_DELAY = 0.05
+
+# partitioned 형식: <데이터 디렉토리>/dataset/<테이블>/repo=<owner%2Frepo>/year=<연>/month=<월>/part-*.parquet
+DATASET_DIRNAME = "dataset"
+PARTITION_DATE_COLUMNS = {  # 연/월 파티션 기준 열 (없는 테이블은 저장소 단위로만 분할)
+    "commits": "date",
+    "pull_requests": "created_at",
+    "issues": "created_at"
+}
+
+# 반복되는 값이 많은 열은 사전(dictionary) 인코딩
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+# 본문/메시지 같은 긴 텍스트 열은 테이블 파일과 별도로 <테이블>_text.arrow(Arrow IPC, 메모리 매핑으로 읽음)에
+# 키와 함께 저장하고, 테이블 파일에는 같은 위치에 글자 수(<열>_length)만 저장 (테이블: (키 열, 텍스트 열 목록))
+TEXT_COLUMNS = {
+    "commits": ("sha", ["message"]),
+    "pull_requests": ("number", ["body"]),
+    "issues": ("number", ["body"])
+}
+
+# 테이블별 Parquet 스키마 (열 순서는 collection_state.ENTITY_COLUMNS / CHILD_TABLES와 같고 텍스트 열은 글자 수로 대체,
+# reviewers는 이전 버전 데이터용)
+SCHEMAS = {
+    "commits": pa.schema([
+        ("repo", CATEGORY),
+        ("sha", pa.string()),
+        ("author_name", pa.string()),
+        ("author_email", pa.string()),
+        ("author_login", CATEGORY),
+        ("committer_name", pa.string()),
+        ("committer_email", pa.string()),
+        ("committer_login", CATEGORY),
+        ("date", TIMESTAMP),
+        ("message_length", pa.int64()),
+        ("url", pa.string()),
+        ("additions", pa.int64()),
+        ("deletions", pa.int64()),
+        ("total_changes", pa.int64()),
+        ("files_changed", pa.int64())
+    ]),
+    "pull_requests": pa.schema([
+        ("repo", CATEGORY),
+        ("number", pa.int64()),
+        ("title", pa.string()),
+        ("body_length", pa.int64()),
+        ("state", CATEGORY),
+        ("created_at", TIMESTAMP),
+        ("updated_at", TIMESTAMP),
+        ("closed_at", TIMESTAMP),
+        ("merged_at", TIMESTAMP),
+        ("merge_commit_sha", pa.string()),
+        ("author_login", CATEGORY),
+        ("additions", pa.int64()),
+        ("deletions", pa.int64()),
+        ("changed_files", pa.int64()),
+        ("comments", pa.int64()),
+        ("review_comments", pa.int64()),
+        ("commits", pa.int64()),
+        ("is_merged", pa.bool_()),
+        ("url", pa.string()),
+        ("hydrated", pa.bool_()),
+        # 이전 버전에서 수집한 리뷰 {리뷰어: [{state, submitted_at}, ...]} (새로 수집한 리뷰는 pr_reviews 테이블)
+        ("reviewers", pa.map_(pa.string(), pa.list_(pa.struct([
+            ("state", pa.string()),
+            ("submitted_at", pa.string())
+        ]))))
+    ]),
+    "issues": pa.schema([
+        ("repo", CATEGORY),
+        ("number", pa.int64()),
+        ("title", pa.string()),
+        ("body_length", pa.int64()),
+        ("state", CATEGORY),
+        ("created_at", TIMESTAMP),
+        ("updated_at", TIMESTAMP),
+        ("closed_at", TIMESTAMP),
+        ("author_login", CATEGORY),
+        ("assignees", pa.list_(pa.string())),
+        ("comments", pa.int64()),
+        ("labels", pa.list_(pa.string())),
+        ("milestone", pa.string()),
+        ("url", pa.string())
+    ]),
+    "commit_files": pa.schema([
+        ("repo", CATEGORY),
+        ("sha", pa.string()),
+        ("filename", pa.string()),
+        ("status", CATEGORY),
+        ("additions", pa.int64()),
+        ("deletions", pa.int64())
+    ]),
+    "pr_reviews": pa.schema([
+        ("repo", CATEGORY),
+        ("pr_number", pa.int64()),
+        ("reviewer", CATEGORY),
+        ("state", CATEGORY),
+        ("submitted_at", TIMESTAMP)
+    ])
+}
+
+# 텍스트 파일 스키마 (<테이블>_text: 키 열과 텍스트 열)
+for _table, (_key, _columns) in TEXT_COLUMNS.items():
+    SCHEMAS[f"{_table}_text"] = pa.schema([SCHEMAS[_table].field(_key)] + [(col, pa.string()) for col in _columns])
+
+def dataset_dir(data_dir, table):
+    """partitioned 형식 테이블의 루트 디렉토리"""
+    return os.path.join(data_dir, DATASET_DIRNAME, table)
+
+def _repo_partition(repo_name):
+    return f"repo={quote(repo_name, safe='')}"
+
+def table_path(repo_dir, table, fmt=None):
+    """테이블 파일 경로 (fmt를 생략하면 STORAGE_FORMAT, partitioned는 저장소 파티션 디렉토리)"""
+    fmt = fmt or STORAGE_FORMAT
+    if fmt == "partitioned":
+        # 저장소 디렉토리 이름(owner_repo)에서 저장소 이름 복원 (GitHub 소유자 이름에는 _가 없음)
+        repo_dir = os.path.normpath(repo_dir)
+        repo_name = os.path.basename(repo_dir).replace("_", "/", 1)
+        return os.path.join(dataset_dir(os.path.dirname(repo_dir), table), _repo_partition(repo_name))
+    return os.path.join(repo_dir, f"{table}.{fmt}")
+
+def text_path(repo_dir, table):
+    """텍스트 파일 경로 (저장 형식과 관계없이 저장소 디렉토리에 저장)"""
+    return os.path.join(repo_dir, f"{table}_text.arrow")
+
+def delta_dir(repo_dir, table):
+    """델타 조각 디렉토리 (저장 형식과 관계없이 저장소 디렉토리에 저장)"""
+    return os.path.join(repo_dir, f"{table}{DELTA_SUFFIX}")
+
+def _delta_text_path(path):
+    return path[:-len(".parquet")] + "_text.arrow"
+
+def list_deltas(repo_dir, table):
+    """델타 조각 파일 목록 (오래된 것부터)"""
+    path = delta_dir(repo_dir, table)
+    if not os.path.isdir(path):
+        return []
+    return [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".parquet")]
+
+def delta_key(table):
+    """델타를 적용할 키 열 (엔터티는 sha/number, 하위 테이블은 상위 행의 키)"""
+    if table in ENTITY_KEYS:
+        return ENTITY_KEYS[table]["key"]
+    for entity, child in CHILD_TABLES.items():
+        if child["table"] == table:
+            return child_key(entity)
+    return None
+
+def find_table(repo_dir, table):
+    """저장된 테이블 파일 경로 (설정된 형식 우선, 없으면 다른 형식, 둘 다 없으면 None)
+
+    partitioned 디렉토리를 교체하는 중이라 잠시 없으면 빈 테이블로 보지 않고 FileNotFoundError를 냅니다.
+    """
+    for fmt in sorted(STORAGE_FORMATS, key=lambda fmt: fmt != STORAGE_FORMAT):
+        path = table_path(repo_dir, table, fmt)
+        if os.path.exists(path):
+            return path
+        if fmt == "partitioned":
+            _check_swap(path)
+    return None
+
+def _check_swap(path):
+    """partitioned 디렉토리가 교체 중이면 FileNotFoundError (_write_partitions가 기존 디렉토리를 .old로 옮긴 뒤
+    새 디렉토리를 옮기기 전, 또는 그 사이에 중단되어 .old만 남은 경우)"""
+    if not os.path.exists(path) and os.path.exists(path + ".old"):
+        raise FileNotFoundError(f"{path}: 파티션 디렉토리 교체 중 ({path}.old만 있음)")
+
+def _retry_read(read, *args, **kwargs):
+    """read(*args, **kwargs)를 실행하고, 읽던 파일이 사라져 실패하면(FileNotFoundError) 처음부터 다시 실행
+
+    압축(compact_table)이나 전체 저장이 델타 조각을 지우고 기본 테이블 파일/디렉토리를 교체하는 동안
+    읽으면 앞서 본 파일이 없을 수 있습니다. 새 기본 테이블에는 지운 델타가 이미 반영되어 있으므로
+    델타 목록과 테이블 경로부터 다시 읽으면 같은 결과를 얻습니다. READ_RETRIES번 모두 실패하면 예외를 그대로 냅니다.
+    """
+    for attempt in range(READ_RETRIES):
+        try:
+            return read(*args, **kwargs)
+        except FileNotFoundError as e:
+            if attempt == READ_RETRIES - 1:
+                raise
+            logger.debug(f"읽는 중 파일이 교체되어 다시 읽음: {e}")
+            time.sleep(READ_RETRY_DELAY * (attempt + 1))
+
+def table_exists(repo_dir, table):
+    """테이블이 어느 형식으로든 저장되어 있는지 확인"""
+    return find_table(repo_dir, table) is not None
+
+def supports_deltas(repo_dir, table):
+    """기본 테이블 파일이 Parquet/partitioned 형식이라 델타 조각을 추가할 수 있는지
+
+    CSV는 병합 후 다시 쓰며, STORAGE_FORMAT이 csv이면 기존 Parquet 파일도 병합하면서 CSV로 전환합니다.
+    """
+    path = find_table(repo_dir, table)
+    return STORAGE_FORMAT != "csv" and path is not None and not path.endswith(".csv") and delta_key(table) is not None
+
+def _remove_other_formats(repo_dir, table, keep=None):
+    """방금 쓴 형식(keep, 생략하면 STORAGE_FORMAT)이 아닌 같은 테이블 파일 삭제 (형식 전환 후 오래된 파일이 읽히지 않도록)"""
+    keep = keep or STORAGE_FORMAT
+    for fmt in STORAGE_FORMATS:
+        path = table_path(repo_dir, table, fmt)
+        if fmt != keep and os.path.isdir(path):
+            shutil.rmtree(path)
+        elif fmt != keep and os.path.exists(path):
+            os.remove(path)
+
+def _parse_json(value):
+    if isinstance(value, str):
+        return json.loads(value)
+    return None if value is None or (isinstance(value, float) and pd.isna(value)) else value
+
+def _to_str(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    return value if isinstance(value, str) else str(value)
+
+def read_csv(path, table, **kwargs):
+    """문자열 열을 문자열로 고정해 CSV 읽기 (값이 숫자처럼 보여도 float로 추론되지 않음)
+
+    partial CSV와 이전 버전 CSV에 있는 텍스트 열(TEXT_COLUMNS)도 문자열로 읽습니다.
+    """
+    string_columns = {
+        field.name: str for field in SCHEMAS[table]
+        if field.type in (pa.string(), CATEGORY)
+    }
+    if table in TEXT_COLUMNS:
+        string_columns.update({col: str for col in TEXT_COLUMNS[table][1]})
+    return pd.read_csv(path, dtype=string_columns, **kwargs)
+
+def text_lengths(values):
+    """텍스트 열의 글자 수 (결측값은 0)"""
+    return values.astype("string").str.len().fillna(0).astype("int64")
+
+def split_text(df, table):
+    """DataFrame을 (텍스트 열을 글자 수로 바꾼 DataFrame, 키와 텍스트 열 DataFrame)으로 분리
+
+    텍스트 열이 없으면(이미 분리해 저장한 테이블을 읽은 경우) 두 번째 값은 None이며,
+    이때는 저장된 텍스트 파일을 그대로 유지해야 합니다.
+    """
+    if table not in TEXT_COLUMNS:
+        return df, None
+    
+    key, columns = TEXT_COLUMNS[table]
+    columns = [col for col in columns if col in df.columns]
+    if not columns:
+        return df, None
+    
+    text_df = df[[key] + columns]
+    df = df.copy(deep=False)
+    for col in columns:
+        if f"{col}_length" in df.columns:
+            df[f"{col}_length"] = text_lengths(df[col])
+        else:
+            df.insert(df.columns.get_loc(col), f"{col}_length", text_lengths(df[col]))
+    return df.drop(columns=columns), text_df
+
+def to_arrow(df, table):
+    """DataFrame을 테이블 스키마의 Arrow 테이블로 변환
+
+    CSV에서 읽은 문자열 시각, JSON 문자열 목록/사전도 받아들이므로
+    partial CSV와 이미 타입이 지정된 DataFrame 모두에 사용할 수 있습니다.
+    스키마에 없는 열은 버리고, 없는 열은 null로 채웁니다.
+    """
+    schema = SCHEMAS[table]
+    columns = {}
+    
+    for field in schema:
+        values = df[field.name] if field.name in df.columns else pd.Series(None, index=df.index, dtype=object)
+        
+        if field.type == TIMESTAMP:
+            values = pd.to_datetime(values, errors='coerce', utc=True)
+        elif pa.types.is_map(field.type) or pa.types.is_list(field.type):
+            values = values.astype(object).map(_parse_json)
+        elif field.type in (pa.string(), CATEGORY):
+            values = values.astype(object).map(_to_str)
+        elif field.type == pa.bool_():
+            values = values.astype(object).where(values.notna(), None)
+        
+        if field.type == CATEGORY:
+            columns[field.name] = pa.array(values, type=pa.string(), from_pandas=True).dictionary_encode()
+        else:
+            columns[field.name] = pa.array(values, type=field.type, from_pandas=True)
+    
+    return pa.Table.from_arrays(list(columns.values()), schema=schema)
+
+def from_arrow(arrow_table, categorical=False):
+    """Arrow 테이블을 DataFrame으로 변환 (사전 인코딩 열은 기본적으로 일반 문자열로 풀어줌)
+
+    목록 열은 파이썬 list, reviewers 같은 map 열은 dict로 변환되므로
+    CSV에서 JSON 문자열을 파싱한 결과와 같은 형태입니다.
+    """
+    if not categorical:
+        for i, field in enumerate(arrow_table.schema):
+            if pa.types.is_dictionary(field.type):
+                arrow_table = arrow_table.set_column(i, field.name, pc.cast(arrow_table.column(i), pa.string()))
+    
+    df = arrow_table.to_pandas(maps_as_pydicts="strict")
+    
+    # to_pandas는 목록을 numpy 배열로 반환하므로 list로 변환 (JSON 직렬화 등 기존 코드와 호환)
+    for field in arrow_table.schema:
+        if pa.types.is_list(field.type):
+            df[field.name] = [None if x is None else x.tolist() for x in df[field.name]]
+        elif pa.types.is_map(field.type):
+            df[field.name] = [None if x is None else {k: v.tolist() for k, v in x.items()} for x in df[field.name]]
+    return df
+
+def _date_filter(table, start, end):
+    """날짜 범위 조건 (start 이상, end 미만, 기준 열이 없는 테이블이면 None)"""
+    column = PARTITION_DATE_COLUMNS.get(table)
+    if column is None or (start is None and end is None):
+        return None
+    
+    condition = None
+    if start is not None:
+        condition = ds.field(column) >= pa.scalar(to_utc(start), TIMESTAMP)
+    if end is not None:
+        upper = ds.field(column) < pa.scalar(to_utc(end), TIMESTAMP)
+        condition = upper if condition is None else condition & upper
+    return condition
+
+def _month_in_range(year, month, start, end):
+    """year=/month= 파티션이 날짜 범위와 겹치는지 (날짜가 없는 행의 파티션은 범위 조건이 있으면 제외)"""
+    if start is None and end is None:
+        return True
+    if not (year.isdigit() and month.isdigit()):
+        return False
+    
+    year, month = int(year), int(month)
+    month_start = datetime(year, month, 1, tzinfo=timezone.utc)
+    month_end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return (start is None or month_end > to_utc(start)) and (end is None or month_start < to_utc(end))
+
+def _dataset_files(table_dir, repos, start, end):
+    """선택된 저장소/기간에 해당하는 파티션의 파일 목록 (디렉토리 이름만으로 먼저 걸러냄)"""
+    if repos is None:
+        # 교체 중인 임시/이전 디렉토리(.tmp/.old)는 읽지 않음 (.old만 있는 저장소는 아래에서 교체 중으로 처리)
+        names = os.listdir(table_dir)
+        repo_dirs = sorted({name.removesuffix(".old") for name in names if name.startswith("repo=") and not name.endswith(".tmp")})
+    else:
+        repo_dirs = [_repo_partition(repo) for repo in repos]
+    
+    files = []
+    for repo_part in repo_dirs:
+        _check_swap(os.path.join(table_dir, repo_part))
+        partitions = []
+        for root, dirs, names in os.walk(os.path.join(table_dir, repo_part)):
+            parts = dict(part.split("=", 1) for part in os.path.relpath(root, table_dir).split(os.sep) if "=" in part)
+            if "month" in parts and not _month_in_range(parts["year"], parts["month"], start, end):
+                continue
+            
+            # 최신 연/월 파티션부터 (수집 시 API 반환 순서와 같음), 날짜 없는 파티션은 마지막
+            order = (int(parts["year"]), int(parts["month"])) if parts.get("month", "").isdigit() else (0, 0)
+            partitions.append((order, [os.path.join(root, name) for name in sorted(names) if name.endswith(".parquet")]))
+        
+        for _, partition_files in sorted(partitions, key=lambda item: item[0], reverse=True):
+            files += partition_files
+    return files
+
+def load_dataset(data_dir, table, repos=None, start=None, end=None, columns=None, categorical=False):
+    """partitioned 형식 테이블을 저장소/기간 조건으로 읽기
+
+    저장소와 연/월 파티션은 디렉토리 이름으로 먼저 걸러 해당 파일만 열고, 남은 파일은
+    날짜 열 조건(start 이상, end 미만)을 행 그룹 통계로 다시 걸러 필요한 행만 읽습니다.
+    반환 형식은 read_table과 같습니다 (repo 열은 파티션 경로에서 복원).
+    """
+    return _retry_read(_load_dataset, data_dir, table, repos, start, end, columns, categorical)
+
+def _load_dataset(data_dir, table, repos=None, start=None, end=None, columns=None, categorical=False):
+    """partitioned 형식 테이블 읽기 (load_dataset 참고)"""
+    table_dir = dataset_dir(data_dir, table)
+    schema = SCHEMAS[table]
+    names = columns or schema.names
+    if not os.path.isdir(table_dir):
+        return pd.DataFrame(columns=names)
+    
+    files = _dataset_files(table_dir, repos, start, end)
+    if not files:
+        return pd.DataFrame(columns=names)
+    
+    partition_fields = [("repo", pa.string())]
+    if table in PARTITION_DATE_COLUMNS:
+        partition_fields += [("year", pa.int16()), ("month", pa.int8())]
+    dataset = ds.dataset(
+        files,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema(partition_fields), flavor="hive"),
+        partition_base_dir=table_dir
+    )
+    
+    if columns is None:
+        # 이전 버전 파일에 그대로 있는 텍스트 열은 읽은 뒤 글자 수로 바꿈 (read_table)
+        names = [name for name in names if name in dataset.schema.names] + inline_text_columns(table, dataset.schema.names)
+    arrow_table = dataset.to_table(columns=names, filter=_date_filter(table, start, end))
+    if "repo" in names:
+        arrow_table = arrow_table.set_column(names.index("repo"), "repo", arrow_table.column("repo").dictionary_encode())
+    return from_arrow(arrow_table, categorical)
+
+def read_table(repo_dir, table, columns=None, categorical=False, start=None, end=None, text=None, typed=False):
+    """저장된 테이블 읽기 (없으면 빈 DataFrame)
+
+    Parquet은 스키마대로 타입이 지정된 DataFrame을, CSV는 기존처럼 pd.read_csv 결과를
+    반환합니다. columns를 주면 해당 열만 읽습니다. start/end를 주면 날짜 기준 열
+    (PARTITION_DATE_COLUMNS)이 start 이상 end 미만인 행만 반환하며, Parquet은
+    행 그룹 통계로, partitioned는 파티션 디렉토리로 읽기 전에 걸러냅니다.
+
+    본문/메시지 같은 텍스트 열은 기본적으로 읽지 않고 글자 수(<열>_length)만 반환합니다.
+    text에 텍스트 열 목록(또는 True: 전부)을 주면 텍스트 파일에서 키로 찾아 붙입니다.
+
+    증분 수집으로 추가된 델타 조각이 있으면 함께 읽어 키가 같은 기존 행을 교체합니다.
+
+    typed=True이면 CSV도 Parquet과 같이 시각 열을 UTC datetime으로 한 번만 변환해 반환합니다
+    (분석용 로드). 이때 CSV는 CSV_CHUNK_ROWS행씩 읽으며 요청하지 않은 텍스트 열을 묶음마다
+    글자 수로 바꾸므로 전체 텍스트를 메모리에 올리지 않습니다.
+    
+    읽는 동안 압축으로 델타 조각이 지워지거나 테이블 파일이 교체되면 델타 목록부터 다시 읽습니다.
+    """
+    return _retry_read(_read_table, repo_dir, table, columns, categorical, start, end, text, typed)
+
+def _read_table(repo_dir, table, columns=None, categorical=False, start=None, end=None, text=None, typed=False):
+    """저장된 테이블과 델타 조각 읽기 (read_table 참고)"""
+    deltas = list_deltas(repo_dir, table)
+    key = delta_key(table)
+    read_columns = columns
+    if deltas and columns is not None and key not in columns:
+        read_columns = list(columns) + [key]
+    
+    df = _read_stored(repo_dir, table, read_columns, categorical, start, end, typed, text)
+    if deltas:
+        df = _apply_deltas(df, table, deltas, read_columns, categorical, start, end)
+        if read_columns is not columns:
+            df = df.drop(columns=key)
+    
+    if table not in TEXT_COLUMNS:
+        return df
+    
+    # 이전 버전 파일에 그대로 있는 텍스트 열은 글자 수로 바꾸고, 요청한 열만 남김
+    key, text_columns = TEXT_COLUMNS[table]
+    text = text_columns if text is True else list(text or [])
+    df, inline = split_text(df, table)
+    if inline is not None:
+        for col in text:
+            if col in inline.columns:
+                df[col] = inline[col]
+    
+    missing = [col for col in text if col not in df.columns]
+    if missing and key in df.columns:
+        df = df.merge(_read_text(repo_dir, table, columns=missing), on=key, how='left')
+    return df
+
+def _delta_overlay(deltas, table):
+    """델타 조각들을 합친 (교체/삭제할 키 배열, 남는 델타 행 Arrow 테이블)
+
+    델타마다 그 안의 모든 키(삭제 표시 포함)의 이전 행을 교체하므로, 나중 델타와 키가 겹치는
+    이전 델타 행은 버립니다. 남는 행은 엔터티 테이블이면 오래된 델타부터, 하위 테이블이면
+    (upsert_child_rows와 같이) 최근 델타부터 반환합니다.
+    """
+    key = delta_key(table)
+    removed, parts = None, []
+    for path in reversed(deltas):
+        delta = pq.read_table(path)
+        rows = delta.filter(pc.invert(delta.column(DELETED_COLUMN))).drop_columns([DELETED_COLUMN])
+        if removed is not None:
+            rows = rows.filter(pc.invert(pc.is_in(rows.column(key), value_set=removed)))
+        parts.append(rows)
+        
+        keys = delta.column(key).combine_chunks()
+        removed = keys if removed is None else pa.concat_arrays([removed, keys])
+    
+    if table in ENTITY_KEYS:
+        parts.reverse()
+    return pc.unique(removed), pa.concat_tables(parts)
+
+def _apply_deltas(df, table, deltas, columns=None, categorical=False, start=None, end=None):
+    """기본 테이블 DataFrame에 델타 조각 적용 (키가 같은 기존 행은 델타 행으로 교체, 삭제 표시 키의 행은 제거)
+
+    엔터티 테이블은 증분 병합(upsert_rows)과 같이 정렬 기준 열의 최신순으로 정렬합니다.
+    """
+    key = delta_key(table)
+    removed, overlay = _delta_overlay(deltas, table)
+    
+    condition = _date_filter(table, start, end)
+    if condition is not None:
+        overlay = overlay.filter(condition)
+    names = [name for name in (columns or SCHEMAS[table].names) if name in overlay.column_names]
+    delta_df = from_arrow(overlay.select(names), categorical)
+    
+    kept = df[~df[key].isin(removed.to_pylist())] if key in df.columns else df
+    frames = [frame for frame in ([kept, delta_df] if table in ENTITY_KEYS else [delta_df, kept]) if not frame.empty]
+    if not frames:
+        return kept.reset_index(drop=True)
+    merged = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].reset_index(drop=True)
+    
+    if categorical:
+        for col in merged.columns:
+            if isinstance(kept[col].dtype if col in kept.columns else None, pd.CategoricalDtype):
+                merged[col] = merged[col].astype("category")
+    
+    sort_col = ENTITY_KEYS.get(table, {}).get("sort")
+    if sort_col in merged.columns:
+        merged = merged.sort_values(sort_col, ascending=False, kind='stable', na_position='last').reset_index(drop=True)
+    return merged
+
+def _read_stored(repo_dir, table, columns=None, categorical=False, start=None, end=None, typed=False, text=None):
+    """저장된 테이블 파일을 그대로 읽기 (read_table 참고)"""
+    path = find_table(repo_dir, table)
+    if path is None:
+        return pd.DataFrame(columns=columns)
+    
+    if os.path.isdir(path):
+        repo_name = os.path.basename(os.path.normpath(repo_dir)).replace("_", "/", 1)
+        data_dir = os.path.dirname(os.path.normpath(repo_dir))
+        return _load_dataset(data_dir, table, [repo_name], start, end, columns, categorical)
+    
+    condition = _date_filter(table, start, end)
+    if path.endswith(".parquet"):
+        return from_arrow(pq.read_table(path, columns=columns, filters=condition), categorical)
+    
+    if typed:
+        return _read_csv_typed(path, table, columns, start, end, text)
+    
+    df = pd.read_csv(path, usecols=columns)
+    if condition is not None:
+        dates = pd.to_datetime(df[PARTITION_DATE_COLUMNS[table]], errors='coerce', utc=True)
+        mask = pd.Series(True, index=df.index)
+        if start is not None:
+            mask &= dates >= to_utc(start)
+        if end is not None:
+            mask &= dates < to_utc(end)
+        df = df[mask].reset_index(drop=True)
+    return df
+
+def _read_csv_typed(path, table, columns=None, start=None, end=None, text=None):
+    """CSV를 CSV_CHUNK_ROWS행씩 읽어 묶음마다 시각 열 변환, 날짜 범위 필터, 텍스트 열 분리 후 합치기
+
+    시각 열은 ISO 8601 형식으로 한 번만 파싱해 Parquet 스키마와 같은 datetime64[us, UTC]로 만들고,
+    text(텍스트 열 목록 또는 True: 전부)에 없는 텍스트 열은 글자 수(<열>_length)만 남깁니다.
+    """
+    text = TEXT_COLUMNS.get(table, (None, []))[1] if text is True else list(text or [])
+    timestamps = [field.name for field in SCHEMAS[table] if field.type == TIMESTAMP]
+    date_column = PARTITION_DATE_COLUMNS.get(table)
+    
+    chunks = []
+    for chunk in read_csv(path, table, usecols=columns, chunksize=CSV_CHUNK_ROWS):
+        for col in timestamps:
+            if col in chunk.columns:
+                chunk[col] = pd.to_datetime(chunk[col], errors='coerce', format='ISO8601', utc=True).astype("datetime64[us, UTC]")
+        
+        if date_column in chunk.columns and (start is not None or end is not None):
+            mask = pd.Series(True, index=chunk.index)
+            if start is not None:
+                mask &= chunk[date_column] >= to_utc(start)
+            if end is not None:
+                mask &= chunk[date_column] < to_utc(end)
+            chunk = chunk[mask]
+        
+        split, inline = split_text(chunk, table)
+        if inline is not None:
+            chunk = split.assign(**{col: inline[col] for col in text if col in inline.columns})
+        chunks.append(chunk)
+    
+    if not chunks:
+        return read_csv(path, table, usecols=columns, nrows=0)
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0].reset_index(drop=True)
+
+def iter_table(repo_dir, table, batch_rows=CSV_CHUNK_ROWS, columns=None, text=None):
+    """저장된 테이블을 batch_rows행 안팎의 Arrow 테이블(스키마 적용)로 나눠 읽기 (columns: 읽을 열)
+
+    형식과 관계없이 테이블 전체를 메모리에 올리지 않으므로 웨어하우스 적재처럼
+    큰 테이블을 순차 처리할 때 사용합니다. partitioned 형식의 repo 열은 파티션 경로에서 복원합니다.
+    text에 텍스트 열 목록을 주면 메모리 매핑한 텍스트 파일에서 키로 찾아 각 묶음 끝에 붙입니다.
+    델타 조각이 있으면 기본 테이블에서 교체/삭제된 행을 빼고 마지막 묶음으로 델타 행을 반환합니다.
+    
+    델타 조각, 텍스트 파일과 첫 묶음은 먼저 읽으며 그동안 압축으로 파일이 바뀌면 처음부터 다시 읽습니다
+    (이후 묶음을 읽는 중에 partitioned 디렉토리가 교체되면 FileNotFoundError).
+    """
+    first, batches = _retry_read(_start_iter, repo_dir, table, batch_rows, columns, text)
+    yield from first
+    yield from batches
+
+def _start_iter(repo_dir, table, batch_rows, columns, text):
+    """iter_table의 묶음 생성기를 만들고 첫 묶음까지 읽어 (첫 묶음 목록, 나머지 묶음 생성기) 반환"""
+    path = find_table(repo_dir, table)
+    if path is None:
+        return [], iter(())
+    
+    deltas = list_deltas(repo_dir, table)
+    key = delta_key(table)
+    read_columns = columns
+    if deltas and columns is not None and key not in columns:
+        read_columns = list(columns) + [key]
+    
+    batches = _iter_stored(path, repo_dir, table, batch_rows, read_columns)
+    if deltas:
+        batches = _iter_deltas(batches, table, _delta_overlay(deltas, table), read_columns)
+        if read_columns is not columns:
+            batches = (batch.drop_columns([key]) for batch in batches)
+    
+    if table in TEXT_COLUMNS:
+        texts = _open_text(repo_dir, table, deltas) if text else None
+        batches = (_attach_text(arrow_table, table, text, texts) for arrow_table in batches)
+    
+    first = next(batches, None)
+    return ([] if first is None else [first]), batches
+
+def _iter_deltas(batches, table, overlay, columns=None):
+    """기본 테이블 묶음에서 델타로 교체/삭제된 행을 빼고, 끝에 델타 행 추가 (overlay: _delta_overlay 결과)"""
+    key = delta_key(table)
+    removed, overlay = overlay
+    for batch in batches:
+        yield batch.filter(pc.invert(pc.is_in(batch.column(key), value_set=removed)))
+    
+    if overlay.num_rows:
+        yield overlay.select([name for name in (columns or SCHEMAS[table].names) if name in overlay.column_names])
+
+def _iter_stored(path, repo_dir, table, batch_rows, columns):
+    """저장된 테이블 파일을 그대로 나눠 읽기 (iter_table 참고)"""
+    if os.path.isdir(path):
+        partition_fields = [("repo", pa.string())]
+        if table in PARTITION_DATE_COLUMNS:
+            partition_fields += [("year", pa.int16()), ("month", pa.int8())]
+        table_dir = os.path.dirname(path)
+        repo_name = os.path.basename(os.path.normpath(repo_dir)).replace("_", "/", 1)
+        dataset = ds.dataset(
+            _dataset_files(table_dir, [repo_name], None, None),
+            format="parquet",
+            partitioning=ds.partitioning(pa.schema(partition_fields), flavor="hive"),
+            partition_base_dir=table_dir
+        )
+        for batch in dataset.to_batches(columns=columns or SCHEMAS[table].names, batch_size=batch_rows):
+            yield pa.Table.from_batches([batch])
+    elif path.endswith(".parquet"):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=columns):
+            yield pa.Table.from_batches([batch])
+    else:
+        # CSV에 없는 열은 to_arrow가 null로 채움 (이전 버전 CSV의 텍스트 열은 글자 수로 바꾼 뒤 함께 반환)
+        usecols = None if columns is None else (lambda name: name in columns)
+        for chunk in read_csv(path, table, chunksize=batch_rows, usecols=usecols):
+            chunk, inline = split_text(chunk, table)
+            arrow_table = to_arrow(chunk, table)
+            arrow_table = arrow_table if columns is None else arrow_table.select(columns)
+            if inline is not None:
+                inline = to_arrow(inline, f"{table}_text")
+                for col in inline.column_names[1:]:
+                    arrow_table = arrow_table.append_column(col, inline.column(col))
+            yield arrow_table
+
+def inline_text_columns(table, names):
+    """이전 버전 파일에 글자 수 대신 그대로 저장된 텍스트 열"""
+    if table not in TEXT_COLUMNS:
+        return []
+    return [col for col in TEXT_COLUMNS[table][1] if col in names and f"{col}_length" not in names]
+
+def _open_text(repo_dir, table, deltas=None):
+    """텍스트 파일을 메모리 매핑으로 열어 Arrow 테이블로 반환 (없으면 None, 읽는 동안 복사하지 않음)
+
+    델타 조각의 텍스트 파일이 있으면 최근 델타부터 합친 뒤 키마다 가장 최근 텍스트만 남깁니다
+    (deltas: 합칠 델타 조각, 생략하면 전부).
+    """
+    deltas = list_deltas(repo_dir, table) if deltas is None else deltas
+    paths = [_delta_text_path(path) for path in reversed(deltas)] + [text_path(repo_dir, table)]
+    texts = [pa.ipc.open_file(pa.memory_map(path)).read_all() for path in paths if os.path.exists(path)]
+    if not texts:
+        return None
+    if len(texts) == 1:
+        return texts[0]
+    
+    merged = pa.concat_tables(texts)
+    latest = ~merged.column(TEXT_COLUMNS[table][0]).to_pandas().duplicated().to_numpy()
+    return merged.filter(pa.array(latest))
+
+def _attach_text(arrow_table, table, text, texts):
+    """Arrow 테이블의 이전 버전 텍스트 열은 글자 수로 바꾸고, 요청한 텍스트 열(text)은 texts에서 키로 찾아 붙임"""
+    key, text_columns = TEXT_COLUMNS[table]
+    inline = {}
+    for col in text_columns:
+        if col not in arrow_table.column_names:
+            continue
+        
+        i = arrow_table.column_names.index(col)
+        inline[col] = arrow_table.column(i)
+        if f"{col}_length" in arrow_table.column_names:
+            arrow_table = arrow_table.remove_column(i)
+        else:
+            lengths = pc.fill_null(pc.utf8_length(inline[col]), 0).cast(pa.int64())
+            arrow_table = arrow_table.set_column(i, f"{col}_length", lengths)
+    
+    for col in text or []:
+        if col in inline:
+            values = inline[col]
+        elif texts is not None and col in texts.column_names:
+            values = texts.column(col).take(pc.index_in(arrow_table.column(key), value_set=texts.column(key).combine_chunks()))
+        else:
+            values = pa.nulls(arrow_table.num_rows, pa.string())
+        arrow_table = arrow_table.append_column(col, values)
+    return arrow_table
+
+def read_text(repo_dir, table, keys=None, columns=None):
+    """텍스트 파일에서 키와 텍스트 열 읽기 (keys를 주면 해당 키의 행만, columns: 텍스트 열 목록)
+
+    텍스트 파일은 메모리 매핑으로 열어 필요한 행만 DataFrame으로 변환합니다. 텍스트 파일이 없는
+    이전 버전 데이터는 테이블 파일에 그대로 저장된 텍스트 열을 읽습니다.
+    """
+    return _retry_read(_read_text, repo_dir, table, keys, columns)
+
+def _read_text(repo_dir, table, keys=None, columns=None):
+    """텍스트 파일에서 키와 텍스트 열 읽기 (read_text 참고)"""
+    key, text_columns = TEXT_COLUMNS[table]
+    columns = list(columns or text_columns)
+    
+    texts = _open_text(repo_dir, table)
+    if texts is not None:
+        texts = texts.select([key] + columns)
+        if keys is not None:
+            texts = texts.filter(pc.is_in(texts.column(key), value_set=pa.array(keys, texts.schema.field(key).type)))
+        return texts.to_pandas()
+    
+    path = find_table(repo_dir, table)
+    if path is None or not set(columns) <= set(inline_text_columns(table, stored_names(path))):
+        return SCHEMAS[f"{table}_text"].empty_table().select([key] + columns).to_pandas()
+    
+    df = _read_stored(repo_dir, table, columns=[key] + columns)
+    return df if keys is None else df[df[key].isin(keys)].reset_index(drop=True)
+
+def stored_names(path):
+    """테이블 파일에 저장된 열 이름"""
+    if os.path.isdir(path):
+        return ds.dataset(path, format="parquet", partitioning="hive").schema.names
+    if path.endswith(".parquet"):
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+def list_repositories(data_dir):
+    """데이터 디렉토리에 수집된 저장소 이름 목록 (owner_repo 디렉토리 → owner/repo, 이름순)"""
+    if not os.path.isdir(data_dir):
+        return []
+    return [
+        d.replace("_", "/", 1) for d in sorted(os.listdir(data_dir))
+        if os.path.isdir(os.path.join(data_dir, d)) and d != DATASET_DIRNAME
+    ]
+
+def write_table(df, repo_dir, table):
+    """테이블 전체 저장 (임시 파일에 쓴 뒤 교체, 다른 형식의 이전 파일은 삭제)
+
+    텍스트 열은 텍스트 파일로 나눠 저장합니다. df에 텍스트 열이 없으면(텍스트 없이 읽은
+    테이블을 다시 저장하는 경우) 기존 텍스트 파일을 그대로 둡니다.
+    df는 델타 조각까지 반영해 읽은 테이블 전체이므로, 저장한 뒤 기존 델타 조각은 삭제합니다.
+    """
+    deltas = list_deltas(repo_dir, table)
+    df, text_df = split_text(df, table)
+    if text_df is not None:
+        _write_text([to_arrow(text_df, f"{table}_text")], repo_dir, table)
+    elif table in TEXT_COLUMNS and any(os.path.exists(_delta_text_path(path)) for path in deltas):
+        # 델타 조각의 텍스트를 기존 텍스트 파일에 합쳐 둠
+        _write_text([_open_text(repo_dir, table, deltas)], repo_dir, table)
+    
+    path = table_path(repo_dir, table)
+    tmp_path = path + ".tmp"
+    
+    if STORAGE_FORMAT == "partitioned":
+        _write_partitions([to_arrow(df, table)], repo_dir, table)
+        _clear_deltas(deltas)
+        return
+    
+    if STORAGE_FORMAT == "parquet":
+        pq.write_table(to_arrow(df, table), tmp_path, compression=PARQUET_COMPRESSION)
+    else:
+        # 목록/사전 값은 JSON 문자열로 저장
+        df = df.copy()
+        for col in df.columns:
+            if df[col].dtype == object and df[col].map(lambda x: isinstance(x, (dict, list))).any():
+                df[col] = df[col].map(lambda x: json.dumps(x) if isinstance(x, (dict, list)) else x)
+        df.to_csv(tmp_path, index=False)
+    
+    os.replace(tmp_path, path)
+    _remove_other_formats(repo_dir, table)
+    _clear_deltas(deltas)
+
+def finalize_partial(partial_path, repo_dir, table):
+    """수집이 끝난 partial CSV를 최종 테이블 파일로 교체
+
+    CSV 형식이면 파일을 그대로 옮기고, Parquet 형식이면 CSV_CHUNK_ROWS행씩
+    읽어 행 그룹 단위로 변환하므로 메모리 사용량이 테이블 크기와 무관합니다.
+    테이블 전체를 새로 수집한 것이므로 기존 델타 조각은 삭제합니다.
+    """
+    path = table_path(repo_dir, table)
+    deltas = list_deltas(repo_dir, table)
+    
+    if table in TEXT_COLUMNS:
+        chunks = split_text_chunks(read_csv(partial_path, table, chunksize=CSV_CHUNK_ROWS), repo_dir, table)
+    else:
+        chunks = read_csv(partial_path, table, chunksize=CSV_CHUNK_ROWS)
+    
+    if STORAGE_FORMAT in ("parquet", "partitioned"):
+        write_arrow_tables((to_arrow(chunk, table) for chunk in chunks), repo_dir, table)
+        os.remove(partial_path)
+        _clear_deltas(deltas)
+        return
+    
+    if table in TEXT_COLUMNS:
+        # 텍스트 열을 뺀 CSV로 다시 기록 (결측값 때문에 float로 읽힌 정수 열은 정수로)
+        tmp_path = path + ".tmp"
+        int_columns = [field.name for field in SCHEMAS[table] if pa.types.is_integer(field.type)]
+        for i, chunk in enumerate(chunks):
+            for col in int_columns:
+                if col in chunk.columns and pd.api.types.is_float_dtype(chunk[col]):
+                    chunk[col] = chunk[col].astype("Int64")
+            chunk.to_csv(tmp_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        os.replace(tmp_path, path)
+        os.remove(partial_path)
+    else:
+        os.replace(partial_path, path)
+    
+    _remove_other_formats(repo_dir, table)
+    _clear_deltas(deltas)
+
+def write_arrow_tables(arrow_tables, repo_dir, table, fmt=None):
+    """스키마가 적용된 Arrow 테이블 조각들을 Parquet/partitioned 테이블 파일로 저장 (fmt: 생략하면 STORAGE_FORMAT)
+
+    조각을 하나씩 행 그룹(partitioned는 파티션 파일)으로 쓰므로 메모리 사용량이 테이블 크기와
+    무관합니다. 임시 파일에 쓴 뒤 교체하고, 다른 형식의 이전 파일은 삭제합니다.
+    """
+    fmt = fmt or STORAGE_FORMAT
+    if fmt == "partitioned":
+        _write_partitions(arrow_tables, repo_dir, table)
+        return
+    
+    path = table_path(repo_dir, table, fmt)
+    tmp_path = path + ".tmp"
+    with pq.ParquetWriter(tmp_path, SCHEMAS[table], compression=PARQUET_COMPRESSION) as writer:
+        for arrow_table in arrow_tables:
+            writer.write_table(arrow_table)
+    os.replace(tmp_path, path)
+    _remove_other_formats(repo_dir, table, fmt)
+
+def _write_text(arrow_tables, repo_dir, table, path=None):
+    """텍스트 파일 저장 (압축하지 않은 Arrow IPC 파일이므로 메모리 매핑으로 복사 없이 읽을 수 있음, path: 생략하면 text_path)"""
+    path = path or text_path(repo_dir, table)
+    tmp_path = path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, SCHEMAS[f"{table}_text"]) as writer:
+        for arrow_table in arrow_tables:
+            writer.write_table(arrow_table)
+    os.replace(tmp_path, path)
+
+def split_text_chunks(chunks, repo_dir, table):
+    """CSV 조각마다 텍스트 열을 떼어 텍스트 파일에 쓰고 나머지 조각을 차례로 반환
+
+    텍스트도 조각 단위로만 메모리에 올리며, 조각을 끝까지 읽으면 텍스트 파일을 교체합니다.
+    """
+    path = text_path(repo_dir, table)
+    tmp_path = path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, SCHEMAS[f"{table}_text"]) as writer:
+        for chunk in chunks:
+            chunk, text_df = split_text(chunk, table)
+            if text_df is not None:
+                writer.write_table(to_arrow(text_df, f"{table}_text"))
+            yield chunk
+    os.replace(tmp_path, path)
+
+def _write_partitions(arrow_tables, repo_dir, table):
+    """저장소 하나의 테이블 전체를 연/월 파티션으로 저장 (임시 디렉토리에 쓴 뒤 교체)
+
+    repo, year, month 값은 경로에만 기록하고 파일에는 저장하지 않습니다.
+    """
+    path = table_path(repo_dir, table, "partitioned")
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+    
+    date_column = PARTITION_DATE_COLUMNS.get(table)
+    partitioning = None
+    if date_column:
+        partitioning = ds.partitioning(pa.schema([("year", pa.int16()), ("month", pa.int8())]), flavor="hive")
+    
+    os.makedirs(tmp_path)
+    for i, arrow_table in enumerate(arrow_tables):
+        arrow_table = arrow_table.drop_columns(["repo"])
+        if date_column:
+            dates = arrow_table.column(date_column)
+            arrow_table = arrow_table.append_column("year", pc.year(dates).cast(pa.int16()))
+            arrow_table = arrow_table.append_column("month", pc.month(dates).cast(pa.int8()))
+        
+        ds.write_dataset(
+            arrow_table,
+            tmp_path,
+            format="parquet",
+            partitioning=partitioning,
+            basename_template=f"part-{i:05d}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=ds.ParquetFileFormat().make_write_options(compression=PARQUET_COMPRESSION)
+        )
+    
+    # 기존 파티션 교체 (더 이상 없는 연/월 파티션도 함께 삭제됨)
+    # 두 rename 사이에는 디렉토리가 없으므로 읽는 쪽은 .old가 있으면 교체 중으로 보고 다시 읽음 (_check_swap)
+    old_path = path + ".old"
+    if os.path.exists(old_path) and os.path.exists(path):
+        shutil.rmtree(old_path)
+    if os.path.exists(path):
+        os.rename(path, old_path)
+    os.rename(tmp_path, path)
+    if os.path.exists(old_path):
+        shutil.rmtree(old_path)
+    _remove_other_formats(repo_dir, table, "partitioned")
+
+def append_delta(df, repo_dir, table, deleted_keys=None):
+    """증분 수집 변경분을 델타 조각으로 저장 (기본 테이블 파일은 다시 쓰지 않음, 저장한 경로 반환)
+
+    df의 행은 키(delta_key)가 같은 기존 행을 교체하고, deleted_keys의 키는 기존 행을 모두 삭제합니다
+    (하위 테이블은 이번에 수집한 상위 키를 넘겨 해당 상위 행의 기존 하위 행을 교체).
+    텍스트 열은 델타 텍스트 파일에 먼저 쓰고 델타 파일은 임시 파일에 쓴 뒤 교체하므로,
+    읽는 쪽은 완성된 델타만 봅니다.
+    """
+    key = delta_key(table)
+    if table in ENTITY_KEYS:
+        # 같은 키가 여러 번 수집되었으면 나중 행만 (upsert_rows와 같음)
+        df = df.drop_duplicates(subset=key, keep='last')
+    df, text_df = split_text(df, table)
+    
+    rows = to_arrow(df, table)
+    rows = rows.append_column(DELETED_COLUMN, pa.array([False] * rows.num_rows, pa.bool_()))
+    if deleted_keys is not None and len(deleted_keys):
+        tombstones = to_arrow(pd.DataFrame({key: list(deleted_keys)}), table)
+        tombstones = tombstones.append_column(DELETED_COLUMN, pa.array([True] * tombstones.num_rows, pa.bool_()))
+        rows = pa.concat_tables([rows, tombstones])
+    
+    os.makedirs(delta_dir(repo_dir, table), exist_ok=True)
+    path = os.path.join(delta_dir(repo_dir, table), f"{time.time_ns():020d}.parquet")
+    if text_df is not None:
+        _write_text([to_arrow(text_df, f"{table}_text")], repo_dir, table, _delta_text_path(path))
+    
+    pq.write_table(rows, path + ".tmp", compression=PARQUET_COMPRESSION)
+    os.replace(path + ".tmp", path)
+    return path
+
+def _clear_deltas(deltas):
+    """기본 테이블 파일에 반영된 델타 조각과 델타 텍스트 파일 삭제"""
+    for path in deltas:
+        for file_path in (path, _delta_text_path(path)):
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+def compact_table(repo_dir, table):
+    """델타 조각을 기본 테이블 파일에 합쳐 다시 쓰기 (합친 델타 수 반환, 다른 압축이 진행 중이면 0)
+
+    읽을 때와 같은 규칙으로 합친 테이블(엔터티는 정렬 기준 열의 최신순)을 기존 형식 그대로
+    새 파일에 쓴 뒤 교체하고, 합친 델타만 삭제합니다. 교체 후 델타를 지우기 전에 읽더라도
+    델타를 다시 적용한 결과는 같으므로 읽는 쪽을 막지 않으며, 압축하는 동안 추가된 델타는
+    다음 압축에서 합칩니다.
+    """
+    deltas = list_deltas(repo_dir, table)
+    path = find_table(repo_dir, table)
+    if not deltas or path is None:
+        return 0
+    fmt = "partitioned" if os.path.isdir(path) else "parquet"
+    
+    with open(os.path.join(delta_dir(repo_dir, table), ".lock"), "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            logger.info(f"{repo_dir} {table}: 다른 작업이 압축 중이므로 건너뜀")
+            return 0
+        
+        df, inline = split_text(_read_stored(repo_dir, table), table)
+        df = _apply_deltas(df, table, deltas)
+        
+        if table in TEXT_COLUMNS:
+            # 최근 델타의 텍스트부터, 이전 버전 파일에 그대로 있던 텍스트는 마지막 (남은 행의 텍스트만 유지)
+            texts = [t for t in (_open_text(repo_dir, table, deltas),) if t is not None]
+            if inline is not None:
+                texts.append(to_arrow(inline, f"{table}_text"))
+            if texts:
+                key = TEXT_COLUMNS[table][0]
+                merged = pa.concat_tables(texts)
+                latest = ~merged.column(key).to_pandas().duplicated().to_numpy()
+                merged = merged.filter(pa.array(latest))
+                merged = merged.filter(pc.is_in(merged.column(key), value_set=pa.array(df[key], merged.schema.field(key).type)))
+                _write_text([merged], repo_dir, table)
+        
+        write_arrow_tables([to_arrow(df, table)], repo_dir, table, fmt)
+        _clear_deltas(deltas)
+    
+    logger.info(f"{repo_dir} {table}: 델타 {len(deltas)}개 압축 ({len(df)}행)")
+    return len(deltas)
+
+def compact_repository(repo_dir, min_deltas=1):
+    """저장소의 테이블 중 델타 조각이 min_deltas개 이상인 테이블 압축 (테이블별 합친 델타 수 반환)"""
+    compacted = {}
+    for table in list(ENTITY_KEYS) + [child["table"] for child in CHILD_TABLES.values()]:
+        if len(list_deltas(repo_dir, table)) >= max(1, min_deltas):
+            compacted[table] = compact_table(repo_dir, table)
+    return compacted
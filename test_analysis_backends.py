@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# github_analyzer/test_analysis_backends.py
+
+"""분석 백엔드(pandas, 웨어하우스) 결과 비교 테스트 (임시 데이터 디렉토리의 작은 고정 데이터 사용)
+
+    python -m unittest test_analysis_backends
+"""
+
+import io
+import os
+import json
+import math
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+import pandas as pd
+import analyze_data
+import frames
+import pipeline
+import snapshot
+import storage
+from warehouse import Warehouse
+
+BASE = datetime(2024, 5, 1, 9, 0, tzinfo=timezone.utc)
+DEVELOPERS = [f"dev{i}" for i in range(6)]
+
+def commit_rows(repo, shas):
+    """시각이 같은 커밋이 둘씩 있고 추가 줄 수에 이상치가 하나 있는 커밋 행 (오래된 커밋부터)"""
+    rows = []
+    for i, sha in enumerate(shas):
+        additions = 5000 if i == 7 else 10 + i % 9
+        rows.append({
+            "repo": repo, "sha": sha, "author_name": DEVELOPERS[i % 6].upper(), "author_email": f"{DEVELOPERS[i % 6]}@example.com",
+            "author_login": DEVELOPERS[i % 6] if i % 11 else None, "committer_name": "GitHub", "committer_email": "noreply@github.com",
+            "committer_login": "web-flow", "date": (BASE + timedelta(hours=7 * (i // 2))).isoformat(),
+            "message": f"fix parser bug {i % 4} and add test", "url": f"https://github.com/{repo}/commit/{sha}",
+            "additions": additions, "deletions": i % 5, "total_changes": additions + i % 5, "files_changed": 1 + i % 3
+        })
+    return rows
+
+def pull_request_rows(repo, count):
+    """생성 시각이 같은 PR이 셋씩 있는 PR 행 (번호순)"""
+    rows = []
+    for number in range(1, count + 1):
+        created = BASE + timedelta(hours=5 * (number // 3))
+        closed = created + timedelta(hours=number % 7 + 1) if number % 4 else None
+        merged = closed if number % 3 and closed is not None else None
+        rows.append({
+            "repo": repo, "number": number, "title": f"PR {number}", "body": "본문" * (number % 5),
+            "state": "closed" if closed else "open", "created_at": created.isoformat(),
+            "updated_at": (created + timedelta(hours=1)).isoformat(), "closed_at": closed.isoformat() if closed else None,
+            "merged_at": merged.isoformat() if merged else None, "merge_commit_sha": None,
+            "author_login": DEVELOPERS[number % 6], "additions": 3 * number % 40, "deletions": number % 6,
+            "changed_files": 1 + number % 4, "comments": number % 3, "review_comments": number % 2,
+            "commits": 1 + number % 5, "is_merged": merged is not None, "url": f"https://github.com/{repo}/pull/{number}",
+            "hydrated": True
+        })
+    return rows
+
+def review_rows(repo, count):
+    return [
+        {"repo": repo, "pr_number": number, "reviewer": DEVELOPERS[(number + offset) % 6], "state": "APPROVED",
+         "submitted_at": (BASE + timedelta(hours=5 * (number // 3) + 1)).isoformat()}
+        for number in range(1, count + 1) for offset in (1, 2 + number % 3)
+    ]
+
+def issue_rows(repo, count):
+    return [
+        {"repo": repo, "number": number, "title": f"Issue {number}", "body": None, "state": "open",
+         "created_at": (BASE + timedelta(days=number // 2)).isoformat(), "updated_at": None, "closed_at": None,
+         "author_login": DEVELOPERS[number % 6], "assignees": "[]", "comments": number % 4, "labels": "[]",
+         "milestone": None, "url": f"https://github.com/{repo}/issues/{number}"}
+        for number in range(1, count + 1)
+    ]
+
+def write_fixture(data_dir):
+    """포크 저장소(beta/app)가 원본(alpha/app)의 커밋 일부를 공유하는 두 저장소 데이터"""
+    shas = [f"{i:040x}" for i in range(60)]
+    fixtures = {
+        "beta/app": (commit_rows("beta/app", shas[20:] + [f"b{i:039x}" for i in range(20)]), 45),
+        "alpha/app": (commit_rows("alpha/app", shas), 36)
+    }
+    for repo, (commits, pr_count) in fixtures.items():
+        repo_dir = os.path.join(data_dir, repo.replace("/", "_"))
+        os.makedirs(repo_dir)
+        storage.write_table(pd.DataFrame(commits), repo_dir, "commits")
+        storage.write_table(pd.DataFrame(pull_request_rows(repo, pr_count)), repo_dir, "pull_requests")
+        storage.write_table(pd.DataFrame(review_rows(repo, pr_count)), repo_dir, "pr_reviews")
+        storage.write_table(pd.DataFrame(issue_rows(repo, 8)), repo_dir, "issues")
+
+class AnalysisBackendParityTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.data_dir = os.path.join(self.tmp, "data")
+        write_fixture(self.data_dir)
+        
+        for target, name, value in [
+            (analyze_data, "DATA_DIR", self.data_dir),
+            (snapshot, "SNAPSHOT_ENABLED", False),
+            (pipeline, "PIPELINE_CACHE_ENABLED", False),
+            (storage, "STORAGE_FORMAT", "csv")
+        ]:
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def analyzer(self, backend):
+        analyzer = analyze_data.GitHubDataAnalyzer()
+        if backend == "warehouse":
+            analyzer.warehouse = Warehouse(os.path.join(self.tmp, "warehouse.duckdb"))
+            self.addCleanup(analyzer.warehouse.close)
+        return analyzer
+    
+    def run_backend(self, backend):
+        """run_analysis 결과 파일 내용 {상대 경로: 내용} (그림과 모델 파일 제외)"""
+        results_dir = os.path.join(self.tmp, backend)
+        with mock.patch.object(analyze_data, "RESULTS_DIR", results_dir):
+            os.makedirs(results_dir)
+            self.analyzer(backend).run_analysis()
+        
+        outputs = {}
+        for root, _, files in os.walk(results_dir):
+            for name in files:
+                if not name.endswith((".png", ".pkl", ".joblib")):
+                    path = os.path.join(root, name)
+                    with open(path, encoding="utf-8") as f:
+                        outputs[os.path.relpath(path, results_dir)] = f.read()
+        return outputs
+    
+    def test_clean_frames_match(self):
+        pandas_frames = self.analyzer("pandas").load_clean_data()
+        analyzer = self.analyzer("warehouse")
+        analyzer.warehouse.sync(self.data_dir)
+        warehouse_frames = frames.compact_frames(analyzer.warehouse.clean_frames(), "웨어하우스")
+        
+        for table, key in [("commits", ["repo", "sha"]), ("pull_requests", ["repo", "number"]),
+                           ("issues", ["repo", "number"]), ("pr_reviews", ["repo", "pr_number", "reviewer"])]:
+            self.assertEqual(
+                pandas_frames[table][key].astype(str).values.tolist(),
+                warehouse_frames[table][key].astype(str).values.tolist(),
+                table
+            )
+        
+        # 이상치로 제한된 열은 실수형, 나머지 개수 열은 정수형
+        for backend, clean in [("pandas", pandas_frames), ("warehouse", warehouse_frames)]:
+            self.assertTrue(pd.api.types.is_float_dtype(clean["commits"]["additions"]), backend)
+            self.assertTrue(pd.api.types.is_integer_dtype(clean["commits"]["files_changed"]), backend)
+            self.assertTrue(pd.api.types.is_integer_dtype(clean["pull_requests"]["comments"]), backend)
+    
+    def assertResultEqual(self, first, second, name):
+        """결과 파일 내용 비교 (키/행 순서와 정수/실수 형식은 그대로, 실수 값은 연산 순서에 따른 오차 허용)"""
+        if name.endswith(".csv"):
+            first, second = pd.read_csv(io.StringIO(first)), pd.read_csv(io.StringIO(second))
+            pd.testing.assert_frame_equal(first, second, check_exact=False, rtol=1e-9, obj=name)
+            return
+        
+        def compare(a, b, path):
+            if isinstance(a, dict) and isinstance(b, dict):
+                self.assertEqual(list(a), list(b), path)
+                for key in a:
+                    compare(a[key], b[key], f"{path}.{key}")
+            elif isinstance(a, list) and isinstance(b, list):
+                self.assertEqual(len(a), len(b), path)
+                for i, (x, y) in enumerate(zip(a, b)):
+                    compare(x, y, f"{path}[{i}]")
+            elif isinstance(a, float) or isinstance(b, float):
+                self.assertIs(type(a), type(b), path)
+                self.assertTrue(math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12), f"{path}: {a} != {b}")
+            else:
+                self.assertEqual(a, b, path)
+        
+        compare(json.loads(first), json.loads(second), name)
+    
+    def test_results_match(self):
+        pandas_outputs = self.run_backend("pandas")
+        warehouse_outputs = self.run_backend("warehouse")
+        
+        self.assertIn(os.path.join("models", "model_evaluation.json"), pandas_outputs)
+        self.assertIn(os.path.join("pr_patterns", "review_network.json"), pandas_outputs)
+        self.assertEqual(sorted(pandas_outputs), sorted(warehouse_outputs))
+        for name, content in pandas_outputs.items():
+            self.assertResultEqual(content, warehouse_outputs[name], name)
+
+class FileWritingAnalyzer:
+    """params의 count만큼 결과 파일을 쓰는 단계 하나짜리 분석기 (pipeline.run 테스트용)"""
+    
+    warehouse = None
+    
+    def __init__(self, results_dir):
+        self.results_dir = results_dir
+    
+    def write_files(self, count):
+        os.makedirs(os.path.join(self.results_dir, "parts"), exist_ok=True)
+        for i in range(count):
+            with open(os.path.join(self.results_dir, "parts", f"part{i}.json"), "w", encoding="utf-8") as f:
+                json.dump({"part": i, "count": count}, f)
+        return count
+
+class PipelineOutputsTest(unittest.TestCase):
+    """다시 실행하거나 캐시에서 복원한 단계가 이전 실행의 결과 파일을 남기지 않는지 확인"""
+    
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.results_dir = os.path.join(self.tmp, "results")
+        os.makedirs(self.results_dir)
+        
+        for name, value in [
+            ("STAGES", {"parts": {"method": "write_files", "inputs": [], "params": ["count"]}}),
+            ("PIPELINE_CACHE_DIR", os.path.join(self.tmp, "cache"))
+        ]:
+            patcher = mock.patch.object(pipeline, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def run_stage(self, count):
+        """count개 파일을 쓰는 단계를 실행하고 results 디렉토리의 결과 파일 이름 목록 반환"""
+        results = pipeline.run(FileWritingAnalyzer(self.results_dir), None, self.tmp, [], {"count": count}, self.results_dir)
+        self.assertEqual(results["parts"], count)
+        return sorted(os.listdir(os.path.join(self.results_dir, "parts")))
+    
+    def test_rerun_removes_stale_outputs(self):
+        for enabled in (True, False):
+            with self.subTest(cache=enabled), mock.patch.object(pipeline, "PIPELINE_CACHE_ENABLED", enabled):
+                self.assertEqual(self.run_stage(3), ["part0.json", "part1.json", "part2.json"])
+                self.assertEqual(self.run_stage(1), ["part0.json"])
+    
+    def test_cached_result_replaces_outputs(self):
+        with mock.patch.object(pipeline, "PIPELINE_CACHE_ENABLED", True):
+            self.run_stage(1)
+            self.run_stage(3)
+            # 두 결과 모두 캐시에서 복원 (파일 수가 줄어드는 쪽도 이전 파일을 남기지 않음)
+            self.assertEqual(self.run_stage(1), ["part0.json"])
+            self.assertEqual(self.run_stage(3), ["part0.json", "part1.json", "part2.json"])
+            with open(os.path.join(self.results_dir, "parts", "part0.json"), encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["count"], 3)
+
+if __name__ == "__main__":
+    unittest.main()
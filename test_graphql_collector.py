@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# github_analyzer/test_graphql_collector.py
+
+"""GraphQL 수집기 테스트 (로컬 스텁 GraphQL 서버 사용, 네트워크 불필요)
+
+    python -m unittest test_graphql_collector
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
+import pandas as pd
+import collect_data
+import storage
+from graphql_collector import GitHubGraphQLCollector
+from collection_state import ENTITY_COLUMNS, CHILD_TABLES, CollectionState, child_rows, to_utc
+
+REPO = "octo/demo"
+
+def commit_node(i):
+    return {
+        "oid": f"sha{i}",
+        "message": f"commit {i}",
+        "url": f"https://github.com/{REPO}/commit/sha{i}",
+        "additions": 10 * i,
+        "deletions": i,
+        "changedFilesIfAvailable": i + 1,
+        "author": {"name": "Alice", "email": "alice@example.com", "date": f"2024-05-0{i}T09:00:00+09:00", "user": {"login": "alice"}},
+        "committer": {"name": "GitHub", "email": "noreply@github.com", "date": f"2024-05-0{i}T00:00:00Z", "user": None}
+    }
+
+def commit_files(i):
+    """커밋 i의 파일별 변경 내역 (GraphQL의 changedFilesIfAvailable과 같은 i + 1개)"""
+    return [{"filename": f"src/file{j}.py", "status": "modified", "additions": 10 * i, "deletions": i} for j in range(i + 1)]
+
+PULL_REQUEST_NODE = {
+    "number": 7,
+    "title": "Add feature",
+    "body": "본문",
+    "state": "MERGED",
+    "createdAt": "2024-05-01T00:00:00Z",
+    "updatedAt": "2024-05-03T00:00:00Z",
+    "closedAt": "2024-05-02T12:00:00Z",
+    "mergedAt": "2024-05-02T12:00:00Z",
+    "mergeCommit": {"oid": "merge7"},
+    "author": {"login": "bob"},
+    "additions": 30,
+    "deletions": 5,
+    "changedFiles": 3,
+    "comments": {"totalCount": 2},
+    "commits": {"totalCount": 4},
+    "merged": True,
+    "url": f"https://github.com/{REPO}/pull/7",
+    "reviews": {
+        "totalCount": 2,
+        "nodes": [
+            {"author": {"login": "carol"}, "state": "APPROVED", "submittedAt": "2024-05-02T10:00:00Z", "comments": {"totalCount": 1}},
+            {"author": None, "state": "COMMENTED", "submittedAt": "2024-05-02T11:00:00Z", "comments": {"totalCount": 2}}
+        ]
+    }
+}
+
+ISSUE_NODE = {
+    "number": 9,
+    "title": "Bug",
+    "body": None,
+    "state": "CLOSED",
+    "createdAt": "2024-05-01T00:00:00Z",
+    "updatedAt": "2024-05-04T00:00:00Z",
+    "closedAt": "2024-05-04T00:00:00Z",
+    "author": {"login": "dave"},
+    "assignees": {"nodes": [{"login": "alice"}]},
+    "comments": {"totalCount": 3},
+    "labels": {"nodes": [{"name": "bug"}, {"name": "p1"}]},
+    "milestone": None,
+    "url": f"https://github.com/{REPO}/issues/9"
+}
+
+def connection(nodes, end_cursor):
+    return {"pageInfo": {"hasNextPage": end_cursor is not None, "endCursor": end_cursor}, "nodes": nodes}
+
+class StubGraphQLHandler(BaseHTTPRequestHandler):
+    """요청 본문(query, variables)을 server.requests에 기록하고 server.respond(query, variables)의 결과를 JSON으로 반환"""
+    
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append({"authorization": self.headers.get("Authorization"), **payload})
+        
+        body = json.dumps(self.server.respond(payload["query"], payload["variables"])).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+def respond(query, variables):
+    """커밋 3개를 after 커서에 따라 나눠 반환하는 스텁 응답 (PR/이슈는 한 페이지)"""
+    if "history(" in query:
+        commits = [commit_node(i) for i in range(1, 4)]
+        start = {None: 0, "cursor-2": 2}[variables["after"]]
+        nodes = commits[start:start + variables["first"]]
+        end_cursor = f"cursor-{start + len(nodes)}" if start + len(nodes) < len(commits) else None
+        return {"data": {"repository": {"defaultBranchRef": {"target": {"history": connection(nodes, end_cursor)}}}}}
+    if "pullRequests(" in query:
+        return {"data": {"repository": {"pullRequests": connection([PULL_REQUEST_NODE], None)}}}
+    return {"data": {"repository": {"issues": connection([ISSUE_NODE], None)}}}
+
+class GraphQLCollectorTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubGraphQLHandler)
+        self.server.requests = []
+        self.server.respond = respond
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        
+        url = f"http://127.0.0.1:{self.server.server_address[1]}/graphql"
+        self.collector = GitHubGraphQLCollector("test-token", api_url=url, page_size=2)
+    
+    def test_commit_pagination_follows_end_cursor(self):
+        rows = self.collector.collect_commits(REPO, since=datetime(2024, 5, 1, tzinfo=timezone.utc))
+        
+        self.assertEqual([row["sha"] for row in rows], ["sha1", "sha2", "sha3"])
+        self.assertEqual([request["variables"]["after"] for request in self.server.requests], [None, "cursor-2"])
+        self.assertEqual([request["variables"]["first"] for request in self.server.requests], [2, 2])
+        self.assertEqual(self.server.requests[0]["variables"]["owner"], "octo")
+        self.assertEqual(self.server.requests[0]["variables"]["since"], "2024-05-01T00:00:00Z")
+        self.assertEqual(self.server.requests[0]["authorization"], "bearer test-token")
+    
+    def test_pagination_stops_at_max_items(self):
+        pages = list(self.collector.iter_commit_pages(REPO, datetime(2024, 5, 1, tzinfo=timezone.utc), 2))
+        
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual([row["sha"] for row in pages[0][0]], ["sha1", "sha2"])
+        # 한도에서 멈춘 페이지의 다음 커서는 이어서 수집할 때 사용
+        self.assertEqual(pages[0][1], "cursor-2")
+    
+    def test_commit_rows_use_rest_columns(self):
+        row = self.collector.collect_commits(REPO, since=datetime(2024, 5, 1, tzinfo=timezone.utc))[0]
+        
+        self.assertEqual(list(row), ENTITY_COLUMNS["commits"])
+        self.assertEqual(row["date"], "2024-05-01T00:00:00+00:00")
+        self.assertEqual(row["author_login"], "alice")
+        self.assertIsNone(row["committer_login"])
+        self.assertEqual((row["additions"], row["deletions"], row["total_changes"], row["files_changed"]), (10, 1, 11, 2))
+    
+    def test_pull_request_rows_use_rest_columns(self):
+        row = self.collector.collect_pull_requests(REPO)[0]
+        
+        self.assertEqual(list(row), ENTITY_COLUMNS["pull_requests"][:-1] + [CHILD_TABLES["pull_requests"]["field"], "hydrated"])
+        self.assertEqual(row["state"], "closed")
+        self.assertTrue(row["is_merged"])
+        self.assertEqual(row["merge_commit_sha"], "merge7")
+        self.assertEqual((row["comments"], row["review_comments"], row["commits"]), (2, 3, 4))
+        self.assertEqual(row["merged_at"], "2024-05-02T12:00:00+00:00")
+        
+        reviews = child_rows([row], "pull_requests")
+        self.assertEqual([list(review) for review in reviews], [CHILD_TABLES["pull_requests"]["columns"]] * 2)
+        self.assertEqual([review["reviewer"] for review in reviews], ["carol", "unknown"])
+    
+    def test_issue_rows_use_rest_columns(self):
+        row = self.collector.collect_issues(REPO)[0]
+        
+        self.assertEqual(list(row), ENTITY_COLUMNS["issues"])
+        self.assertEqual(row["state"], "closed")
+        self.assertEqual(row["assignees"], ["alice"])
+        self.assertEqual(row["labels"], ["bug", "p1"])
+        self.assertIsNone(row["milestone"])
+    
+    def test_error_payload(self):
+        self.server.respond = lambda query, variables: {
+            "data": None,
+            "errors": [{"type": "NOT_FOUND", "message": "Could not resolve to a Repository with the name 'octo/demo'."}]
+        }
+        
+        with self.assertRaisesRegex(RuntimeError, "GraphQL 오류: Could not resolve"):
+            self.collector.query("query { viewer { login } }", {})
+        
+        # 수집 메서드는 오류를 기록하고 빈 목록 반환 (오류는 재시도하지 않음)
+        self.server.requests.clear()
+        self.assertEqual(self.collector.collect_issues(REPO), [])
+        self.assertEqual(len(self.server.requests), 1)
+
+class StubRestRepository:
+    """REST 모드가 쓰는 PyGithub Repository 메서드(get_commits().get_page, get_commit)만 흉내 낸 객체
+
+    commit_node와 같은 커밋 3개를 REST 목록/상세 응답 형태로 반환합니다.
+    """
+    
+    def get_commits(self, since=None):
+        return SimpleNamespace(get_page=lambda page_number: [self.list_item(i) for i in range(1, 4)] if page_number == 0 else [])
+    
+    def list_item(self, i):
+        node = commit_node(i)
+        person = lambda actor: SimpleNamespace(name=actor["name"], email=actor["email"], date=to_utc(actor["date"]))
+        return SimpleNamespace(
+            sha=node["oid"], html_url=node["url"],
+            commit=SimpleNamespace(author=person(node["author"]), committer=person(node["committer"]), message=node["message"]),
+            author=SimpleNamespace(login=node["author"]["user"]["login"]), committer=None
+        )
+    
+    def get_commit(self, sha):
+        i = int(sha[len("sha"):])
+        return SimpleNamespace(
+            raw_data={"files": commit_files(i)}, raw_headers={},
+            stats=SimpleNamespace(additions=10 * i, deletions=i, total=11 * i)
+        )
+
+class StubRestClient:
+    def __init__(self, *args, **kwargs):
+        pass
+    
+    def get_rate_limit(self):
+        return SimpleNamespace(core=SimpleNamespace(remaining=5000, limit=5000))
+    
+    def get_repo(self, repo_name, lazy=False):
+        return StubRestRepository()
+
+class CollectionModeParityTest(unittest.TestCase):
+    """REST와 GraphQL 수집 방식이 같은 커밋 테이블과 하위 테이블(commit_files)을 만드는지 확인"""
+    
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubGraphQLHandler)
+        self.server.requests = []
+        self.server.respond = respond
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        for target, name, value in [
+            (collect_data, "Github", StubRestClient),
+            (collect_data, "HTTP_CACHE_ENABLED", False),
+            (collect_data, "COMMIT_STORE_ENABLED", False),
+            (storage, "STORAGE_FORMAT", "csv")
+        ]:
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def collect_commits(self, mode):
+        """mode 방식으로 커밋을 수집한 저장소 디렉토리"""
+        collector = collect_data.GitHubDataCollector("test-token", max_workers=2, mode=mode)
+        self.addCleanup(collector.close)
+        if mode == "graphql":
+            collector.graphql = GitHubGraphQLCollector(
+                "test-token", api_url=f"http://127.0.0.1:{self.server.server_address[1]}/graphql", page_size=2
+            )
+        
+        repo_dir = os.path.join(self.tmp, mode)
+        os.makedirs(repo_dir)
+        rows = collector.stream_entity(REPO, "commits", CollectionState(repo_dir), repo_dir, 10, 30, None, False)
+        self.assertEqual(rows, 3)
+        return repo_dir
+    
+    def test_graphql_commit_files_match_rest(self):
+        rest_dir = self.collect_commits("rest")
+        with mock.patch.object(collect_data, "GRAPHQL_COMMIT_FILES", True):
+            graphql_dir = self.collect_commits("graphql")
+        
+        for table in ("commits", "commit_files"):
+            rest = storage.read_table(rest_dir, table, text=True)
+            graphql = storage.read_table(graphql_dir, table, text=True)
+            pd.testing.assert_frame_equal(graphql, rest, obj=table)
+        self.assertEqual(len(storage.read_table(graphql_dir, "commit_files")), sum(len(commit_files(i)) for i in range(1, 4)))
+    
+    def test_graphql_without_commit_files_warns(self):
+        with self.assertLogs("GitHubCollector", level="WARNING") as logs:
+            graphql_dir = self.collect_commits("graphql")
+        
+        self.assertTrue(any("commit_files" in message for message in logs.output))
+        self.assertTrue(storage.table_exists(graphql_dir, "commits"))
+        self.assertFalse(storage.table_exists(graphql_dir, "commit_files"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# github_analyzer/token_pool.py
+
+import os
+import logging
+import threading
+from github_transport import install_layer
+from rate_limiter import (
+    AdaptiveRateLimiter, ResourceLimiters, is_rate_limited, request_resource, response_resource,
+    MAX_RATE_LIMIT_RETRIES, RATE_LIMIT_STATUSES
+)
+
+logger = logging.getLogger("GitHubCollector")
+
+def load_tokens():
+    """GITHUB_TOKEN, GITHUB_TOKENS, GITHUB_TOKENS_FILE에서 토큰 목록 로드 (중복 제거, 순서 유지)
+
+    GITHUB_TOKENS는 쉼표로 구분하고, GITHUB_TOKENS_FILE은 한 줄에 토큰 하나씩
+    적습니다 (#으로 시작하는 줄은 무시). .env 로드 이후에 호출해야 합니다.
+    """
+    tokens = [os.getenv("GITHUB_TOKEN", "")]
+    tokens += os.getenv("GITHUB_TOKENS", "").split(",")
+    
+    tokens_file = os.getenv("GITHUB_TOKENS_FILE")
+    if tokens_file and os.path.exists(tokens_file):
+        with open(tokens_file) as f:
+            tokens += [line for line in f if not line.strip().startswith("#")]
+    
+    tokens = [token.strip() for token in tokens]
+    return list(dict.fromkeys(token for token in tokens if token and not token.startswith("your_")))
+
+def mask_token(token):
+    """로그용 토큰 표시 (마지막 4자리만)"""
+    return f"...{token[-4:]}"
+
+class PooledToken:
+    """풀에 속한 토큰 하나와 그 토큰 전용 속도 제한기 (limiter: 기본 리소스, limiters: 리소스별)"""
+    
+    def __init__(self, token, name):
+        self.token = token
+        self.limiter = AdaptiveRateLimiter(name=f"{name}:{mask_token(token)}")
+        self.limiters = ResourceLimiters(self.limiter, name=f"{name}:{mask_token(token)}")
+        self.disabled = False
+    
+    def score(self, resource="core"):
+        """선택 우선순위 (헤더를 아직 받지 않은 토큰 > 남은 요청 수가 많은 토큰 > 먼저 리셋되는 토큰)"""
+        limiter = self.limiters.get(resource)
+        headroom = limiter.headroom()
+        if headroom is None:
+            return (2, 0)
+        if headroom > 0:
+            return (1, headroom)
+        return (0, -limiter.ready_at())
+
+class TokenPool:
+    """남은 한도가 가장 많은 토큰으로 요청을 보내는 토큰 풀
+
+    토큰마다 AdaptiveRateLimiter를 두고, 요청마다 남은 요청 수가 가장 많은
+    토큰을 고릅니다. 한도가 소진되거나 2차 제한에 걸린 토큰은 자동으로 뒤로
+    밀리며, 인증에 실패한 토큰은 풀에서 제외됩니다. 모든 토큰이 소진되면
+    가장 먼저 리셋되는 토큰의 제한기에서 대기합니다.
+    """
+    
+    def __init__(self, tokens, name="core"):
+        """토큰 풀 초기화"""
+        if not tokens:
+            raise ValueError("토큰 풀에는 토큰이 하나 이상 필요합니다")
+        self.name = name
+        self.entries = [PooledToken(token, name) for token in tokens]
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self.active_entries())
+    
+    def active_entries(self):
+        """인증 실패로 제외되지 않은 토큰 목록"""
+        return [entry for entry in self.entries if not entry.disabled]
+    
+    def acquire(self, resource="core"):
+        """리소스(resource)의 한도가 가장 여유 있는 토큰을 골라 해당 토큰의 요청 권한을 받은 뒤 반환"""
+        with self._lock:
+            entries = self.active_entries()
+            if not entries:
+                raise RuntimeError("사용 가능한 GitHub 토큰이 없습니다")
+            entry = max(entries, key=lambda entry: entry.score(resource))
+        
+        entry.limiters.get(resource).acquire()
+        return entry
+    
+    def disable(self, entry, reason):
+        """토큰을 풀에서 제외 (마지막 토큰은 제외하지 않음)"""
+        with self._lock:
+            if entry.disabled or len(self.active_entries()) <= 1:
+                return False
+            entry.disabled = True
+        
+        logger.warning(f"GitHub 토큰 {mask_token(entry.token)} 제외({self.name}): {reason}")
+        return True
+    
+    def wait_if_below(self, min_remaining):
+        """모든 토큰의 남은 요청 수가 min_remaining 미만이면 가장 먼저 리셋되는 토큰 기준으로 대기"""
+        entries = self.active_entries()
+        if any(entry.limiter.remaining is None or entry.limiter.remaining >= min_remaining for entry in entries):
+            return
+        
+        min(entries, key=lambda entry: entry.limiter.ready_at()).limiter.wait_if_below(min_remaining)
+    
+    def status(self):
+        """토큰별 속도 제한 상태"""
+        return {
+            mask_token(entry.token): dict(entry.limiter.status(), disabled=entry.disabled)
+            for entry in self.entries
+        }
+
+def pooled_connection(base_class, pool):
+    """요청마다 토큰 풀에서 고른 토큰으로 Authorization 헤더를 바꾸는 연결 클래스 생성"""
+    
+    class PooledConnection(base_class):
+        def getresponse(self):
+            resource = request_resource(self.url)
+            for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+                entry = pool.acquire(resource)
+                self.headers = dict(self.headers)
+                self.headers["Authorization"] = f"token {entry.token}"
+                
+                response = super().getresponse()
+                headers = {k.lower(): v for k, v in response.getheaders()}
+                entry.limiters.get(response_resource(headers, resource)).update(headers)
+                
+                if attempt == MAX_RATE_LIMIT_RETRIES or getattr(self, "stream", False):
+                    return response
+                
+                # 인증 실패 토큰은 제외하고 다른 토큰으로 재시도
+                if response.status == 401:
+                    if pool.disable(entry, "인증 실패 (401)"):
+                        continue
+                    return response
+                
+                # 본문은 속도 제한일 수 있는 응답(403/429)에서만 읽음
+                if response.status not in RATE_LIMIT_STATUSES or not is_rate_limited(response.status, headers, response.read()):
+                    return response
+                
+                # 1차 한도 소진 토큰은 점수가 낮아지므로 다음 시도에서 다른 토큰이 선택됨
+                if headers.get("x-ratelimit-remaining") != "0":
+                    entry.limiters.get(resource).backoff(headers.get("retry-after"))
+    
+    PooledConnection.__name__ = f"Pooled{base_class.__name__}"
+    return PooledConnection
+
+_pool = None
+
+def install_token_pool(tokens):
+    """PyGithub 요청 계층에 토큰 풀 설치 (단일 토큰 속도 제한기 계층을 대체)"""
+    global _pool
+    
+    if _pool is None:
+        _pool = TokenPool(tokens)
+        install_layer("rate_limiter", lambda base_class: pooled_connection(base_class, _pool))
+        logger.info(f"GitHub 토큰 풀 사용: {len(tokens)}개 토큰")
+    
+    return _pool
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+# github_analyzer/warehouse.py
+
+"""수집 데이터를 로컬 DuckDB 파일에 적재하고 분석 집계를 SQL로 실행하는 웨어하우스
+
+저장소별 테이블 파일(CSV/Parquet/partitioned)을 나눠 읽어 commits, pull_requests,
+issues, pr_reviews 테이블에 적재하며, 파일이 바뀐 저장소만 다시 적재합니다.
+이전 버전에서 수집한 PR의 reviewers 열은 pr_reviews 행으로 변환해 함께 적재합니다.
+개발자/PR/시간 패턴 집계는 GitHubDataAnalyzer의 pandas 구현과 같은 정제 규칙
+(날짜 없는 커밋 제외, 음수 0 처리, 상위 1% 이상치 제한)을 SQL로 적용하므로,
+원본 행을 메모리에 올리지 않고 집계 결과만 DataFrame으로 받습니다.
+"""
+
+import os
+import logging
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import storage
+import frames
+from collection_state import to_utc
+
+logger = logging.getLogger("GitHubAnalyzer")
+
+# 웨어하우스 설정
+WAREHOUSE_PATH = os.getenv("WAREHOUSE_PATH", os.path.join("data", "warehouse.duckdb"))
+WAREHOUSE_BATCH_ROWS = 100000  # 적재 시 한 번에 읽을 행 수
+
+WAREHOUSE_TABLES = ("commits", "pull_requests", "issues", "pr_reviews")
+
+# 텍스트 파일에서 함께 적재할 텍스트 열 (커밋 메시지 단어 빈도용, PR/이슈 본문은 글자 수만 적재)
+WAREHOUSE_TEXT_COLUMNS = {"commits": ["message"]}
+
+# (repo, 작성자, 날짜) 인덱스
+INDEXES = {
+    "commits": ("repo", "author_login", "date"),
+    "pull_requests": ("repo", "author_login", "created_at"),
+    "issues": ("repo", "author_login", "created_at"),
+    "pr_reviews": ("repo", "reviewer", "submitted_at")
+}
+
+# clean_data와 같은 이상치 처리 대상 열
+COMMIT_CODE_COLUMNS = ["additions", "deletions", "total_changes", "files_changed"]
+PR_CLIP_COLUMNS = ["additions", "deletions", "changed_files", "comments", "review_comments", "commits"]
+PR_CODE_COLUMNS = ["additions", "deletions", "changed_files"]
+INTEGER_TYPES = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT")
+
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+STOPWORDS = ['the', 'and', 'to', 'of', 'a', 'in', 'for', 'is', 'on', 'that', 'by', 'this', 'with', 'i', 'you', 'it']
+
+def _column_type(field):
+    """Arrow 필드 타입에 대응하는 DuckDB 열 타입"""
+    if field.type == storage.TIMESTAMP:
+        return "TIMESTAMP"  # UTC 기준 시각 (세션 시간대를 UTC로 고정)
+    if pa.types.is_list(field.type):
+        return "VARCHAR[]"
+    if pa.types.is_boolean(field.type):
+        return "BOOLEAN"
+    if pa.types.is_integer(field.type):
+        return "BIGINT"
+    return "VARCHAR"
+
+def _table_columns(table):
+    """웨어하우스 테이블 열 목록 (이전 버전 reviewers map 열은 pr_reviews 테이블로 변환하므로 제외)"""
+    columns = [(field.name, _column_type(field)) for field in storage.SCHEMAS[table]
+               if not pa.types.is_map(field.type)]
+    return columns + [(col, "VARCHAR") for col in WAREHOUSE_TEXT_COLUMNS.get(table, [])]
+
+def _quantile_sql(columns, scoped):
+    """열별 상위 1% 경계 (음수/결측을 0으로 바꾼 뒤 pandas quantile과 같은 선형 보간)"""
+    limits = ", ".join(
+        f"quantile_cont(greatest(coalesce({col}, 0), 0), 0.99) AS {col}" for col in columns
+    )
+    return f"SELECT {limits} FROM {scoped}"
+
+def _clip_sql(columns, integers=(), alias="s", limits="l"):
+    """음수/결측을 0으로 바꾸고 상위 1% 경계로 제한한 열 (integers의 열은 pandas처럼 정수형으로 되돌림)"""
+    return ", ".join(
+        f"least(greatest(coalesce({alias}.{col}, 0), 0), {limits}.{col}){'::BIGINT' if col in integers else ''} AS {col}"
+        for col in columns
+    )
+
+class Warehouse:
+    """로컬 DuckDB 분석 웨어하우스"""
+    
+    def __init__(self, path=WAREHOUSE_PATH):
+        """웨어하우스 연결 (파일과 테이블, 인덱스가 없으면 생성)"""
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.con = duckdb.connect(path)
+        self.con.execute("SET TimeZone = 'UTC'")
+        self._create_tables()
+    
+    def close(self):
+        self.con.close()
+    
+    def _create_tables(self):
+        # 저장소/테이블별로 적재한 원본 파일 (경로와 수정 시각이 같으면 다시 적재하지 않음)
+        self.con.execute(
+            "CREATE TABLE IF NOT EXISTS sources (repo VARCHAR, table_name VARCHAR, version VARCHAR, row_count BIGINT)"
+        )
+        
+        for table in WAREHOUSE_TABLES:
+            # 열 구성이 바뀐 이전 버전 테이블은 다시 만들고 전부 다시 적재
+            existing = [row[0] for row in self.con.execute(
+                "SELECT column_name FROM duckdb_columns() WHERE table_name = ? ORDER BY column_index", [table]
+            ).fetchall()]
+            if existing and existing != [name for name, _ in _table_columns(table)]:
+                logger.info(f"웨어하우스 {table} 테이블 열 구성 변경: 다시 적재합니다")
+                self.con.execute(f"DROP TABLE {table}")
+                self.con.execute("DELETE FROM sources WHERE table_name = ?", [table])
+            
+            columns = ", ".join(f"{name} {sql_type}" for name, sql_type in _table_columns(table))
+            self.con.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+            self.con.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(INDEXES[table])} "
+                f"ON {table} ({', '.join(INDEXES[table])})"
+            )
+    
+    def sync(self, data_dir, repositories=None):
+        """저장소별 테이블 파일을 웨어하우스에 적재 (바뀐 저장소/테이블만 교체)
+
+        repositories를 생략하면 데이터 디렉토리의 모든 저장소를 적재하고, 더 이상
+        없는 저장소의 행은 삭제합니다. 적재한 저장소 이름 목록을 반환합니다.
+        """
+        all_repositories = repositories is None
+        if all_repositories:
+            repositories = storage.list_repositories(data_dir)
+        
+        loaded = 0
+        for repo_name in repositories:
+            repo_dir = os.path.join(data_dir, repo_name.replace("/", "_"))
+            for table in WAREHOUSE_TABLES:
+                version = self._version(repo_dir, table)
+                
+                current = self.con.execute(
+                    "SELECT version FROM sources WHERE repo = ? AND table_name = ?", [repo_name, table]
+                ).fetchone()
+                if (current[0] if current else None) == version:
+                    continue
+                
+                rows = self._load_table(repo_name, repo_dir, table, version)
+                loaded += 1
+                logger.info(f"웨어하우스 적재: {repo_name} {table} {rows}행")
+        
+        if all_repositories:
+            stale = [row[0] for row in self.con.execute("SELECT DISTINCT repo FROM sources").fetchall()
+                     if row[0] not in repositories]
+            for repo_name in stale:
+                self._delete_repo(repo_name, WAREHOUSE_TABLES)
+                logger.info(f"웨어하우스에서 삭제: {repo_name}")
+        
+        if loaded:
+            self.con.execute("CHECKPOINT")
+        return repositories
+    
+    @staticmethod
+    def _version(repo_dir, table):
+        """원본 파일 버전 (경로와 수정 시각, 파일이 없으면 None)
+
+        pr_reviews는 이전 버전 reviewers 열을 변환해 함께 적재하므로 pull_requests 버전도,
+        텍스트 열을 함께 적재하는 테이블은 텍스트 파일 버전도, 증분 수집의 델타 조각이 있으면 그 이름도 포함합니다.
+        """
+        path = storage.find_table(repo_dir, table)
+        version = None if path is None else f"{path}@{os.stat(path).st_mtime_ns}"
+        deltas = storage.list_deltas(repo_dir, table)
+        if version is not None and deltas:
+            version = f"{version}|{','.join(os.path.basename(delta) for delta in deltas)}"
+        text_path = storage.text_path(repo_dir, table)
+        if version is not None and table in WAREHOUSE_TEXT_COLUMNS and os.path.exists(text_path):
+            version = f"{version}|{text_path}@{os.stat(text_path).st_mtime_ns}"
+        if table == "pr_reviews":
+            prs_version = Warehouse._version(repo_dir, "pull_requests")
+            if prs_version is not None:
+                version = f"{version}|{prs_version}"
+        return version
+    
+    def _delete_repo(self, repo_name, tables):
+        for table in tables:
+            self.con.execute(f"DELETE FROM {table} WHERE repo = ?", [repo_name])
+            self.con.execute("DELETE FROM sources WHERE repo = ? AND table_name = ?", [repo_name, table])
+    
+    def _load_table(self, repo_name, repo_dir, table, version):
+        """저장소 하나의 테이블을 WAREHOUSE_BATCH_ROWS행씩 교체 적재 (한 트랜잭션)"""
+        names = [name for name, _ in _table_columns(table) if name != "repo"]
+        rows = 0
+        
+        self.con.execute("BEGIN TRANSACTION")
+        try:
+            self._delete_repo(repo_name, [table])
+            
+            for batch in storage.iter_table(repo_dir, table, WAREHOUSE_BATCH_ROWS, text=WAREHOUSE_TEXT_COLUMNS.get(table)):
+                self.con.register("batch", batch)
+                self.con.execute(
+                    f"INSERT INTO {table} (repo, {', '.join(names)}) SELECT ?, {', '.join(names)} FROM batch",
+                    [repo_name]
+                )
+                
+                self.con.unregister("batch")
+                rows += batch.num_rows
+            
+            # 이전 버전 PR의 reviewers {리뷰어: [{state, submitted_at}, ...]} → 리뷰 한 건이 한 행
+            # (pr_reviews 파일에 이미 있는 PR은 제외)
+            if table == "pr_reviews":
+                for batch in storage.iter_table(repo_dir, "pull_requests", WAREHOUSE_BATCH_ROWS, columns=["number", "reviewers"]):
+                    self.con.register("batch", batch)
+                    rows += self.con.execute("""
+                        INSERT INTO pr_reviews
+                        SELECT ?, number, entry.key, review.state, TRY_CAST(review.submitted_at AS TIMESTAMPTZ)
+                        FROM (
+                            SELECT number, unnest(map_entries(reviewers)) AS entry FROM batch
+                            WHERE reviewers IS NOT NULL AND number NOT IN (SELECT pr_number FROM pr_reviews WHERE repo = ?)
+                        ), unnest(entry.value) AS r(review)
+                    """, [repo_name, repo_name]).fetchone()[0]
+                    self.con.unregister("batch")
+            
+            if version is not None:
+                self.con.execute("INSERT INTO sources VALUES (?, ?, ?, ?)", [repo_name, table, version, rows])
+            self.con.execute("COMMIT")
+        except Exception:
+            self.con.execute("ROLLBACK")
+            raise
+        
+        return rows
+    
+    def _scope(self, date_column, repos=None, start=None, end=None):
+        """분석 범위 조건 (저장소 목록, start 이상 end 미만) SQL과 파라미터"""
+        conditions, params = [], []
+        if repos is not None:
+            conditions.append(f"repo IN ({', '.join('?' for _ in repos)})" if repos else "FALSE")
+            params += list(repos)
+        if start is not None:
+            conditions.append(f"{date_column} >= ?")
+            params.append(to_utc(start).replace(tzinfo=None))
+        if end is not None:
+            conditions.append(f"{date_column} < ?")
+            params.append(to_utc(end).replace(tzinfo=None))
+        return " AND ".join(conditions) or "TRUE", params
+    
+    def _clean_commits(self, repos=None, start=None, end=None):
+        """clean_data의 커밋 정제를 SQL로 옮긴 CTE (clean_commits)와 파라미터"""
+        condition, params = self._scope("date", repos, start, end)
+        # 여러 저장소에 있는 같은 SHA는 저장소 이름이 가장 앞선 행만 (frames.dedup_commits와 같음)
+        dedup = "QUALIFY row_number() OVER (PARTITION BY sha ORDER BY repo) = 1" if frames.DEDUP_COMMITS else ""
+        sql = f"""
+            WITH scoped AS (SELECT * FROM commits WHERE date IS NOT NULL AND {condition} {dedup}),
+            limits AS ({_quantile_sql(COMMIT_CODE_COLUMNS, 'scoped')})
+        """
+        integers = self._integer_columns("commits", (sql, params), COMMIT_CODE_COLUMNS)
+        sql += f""",
+            clean_commits AS (
+                SELECT s.repo, s.sha, s.author_login, s.author_name, s.date, s.message,
+                       isodow(s.date) - 1 AS day_of_week, dayname(s.date) AS day_name,
+                       hour(s.date) AS hour_of_day, month(s.date) AS month, year(s.date) AS year,
+                       coalesce(s.message_length, 0) AS message_length,
+                       {_clip_sql(COMMIT_CODE_COLUMNS, integers)}
+                FROM scoped s, limits l
+            )
+        """
+        return sql, params
+    
+    def _clean_pull_requests(self, repos=None, start=None, end=None):
+        """clean_data의 PR 정제를 SQL로 옮긴 CTE (clean_prs)와 파라미터"""
+        condition, params = self._scope("created_at", repos, start, end)
+        sql = f"""
+            WITH scoped AS (SELECT * FROM pull_requests WHERE {condition}),
+            limits AS ({_quantile_sql(PR_CLIP_COLUMNS, 'scoped')})
+        """
+        integers = self._integer_columns("pull_requests", (sql, params), PR_CLIP_COLUMNS)
+        sql += f""",
+            clean_prs AS (
+                SELECT s.repo, s.number, s.state, s.author_login, s.created_at, s.updated_at, s.closed_at, s.merged_at,
+                       epoch(s.closed_at - s.created_at) / 3600 AS processing_time,
+                       coalesce(s.is_merged, s.merged_at IS NOT NULL) AS is_merged,
+                       coalesce(length(s.title), 0) AS title_length,
+                       {_clip_sql(PR_CLIP_COLUMNS, integers)}
+                FROM scoped s, limits l
+            )
+        """
+        return sql, params
+    
+    def _clean_issues(self, repos=None, start=None, end=None):
+        """clean_data의 이슈 정제를 SQL로 옮긴 CTE (clean_issues)와 파라미터"""
+        condition, params = self._scope("created_at", repos, start, end)
+        sql = f"""
+            WITH clean_issues AS (
+                SELECT repo, number, state, author_login, created_at, updated_at, closed_at, comments,
+                       epoch(closed_at - created_at) / 3600 AS resolution_time,
+                       coalesce(length(title), 0) AS title_length,
+                       coalesce(body_length, 0) AS body_length
+                FROM issues WHERE {condition}
+            )
+        """
+        return sql, params
+    
+    def _integer_columns(self, table, cte, columns):
+        """_clip_outliers 결과가 정수형으로 남는 열 (scoped, limits CTE 기준)
+
+        정수 열이면서 경계를 넘는 값이 없고, 결측값이 있으면 양수 값도 없는 열입니다.
+        """
+        types = dict(self.con.execute(
+            "SELECT column_name, data_type FROM duckdb_columns() WHERE table_name = ?", [table]
+        ).fetchall())
+        flags = ", ".join(
+            f"coalesce(bool_or(s.{col} > l.{col}) OR "
+            f"({'count(s.' + col + ') < count(*)' if types.get(col) in INTEGER_TYPES else 'TRUE'} AND bool_or(s.{col} > 0)), FALSE)"
+            for col in columns
+        )
+        sql, params = cte
+        floats = self.con.execute(sql + f"SELECT {flags} FROM scoped s, limits l", params).fetchone()
+        return {col for col, is_float in zip(columns, floats) if not is_float}
+    
+    def _sums(self, cte, view, columns):
+        """열별 sum SQL (정수 열의 합계는 pandas와 같이 정수가 되도록 BIGINT로 변환)"""
+        dtypes = self.query(cte, f"SELECT {', '.join(columns)} FROM {view} LIMIT 0").dtypes
+        return {
+            col: f"sum({col})::BIGINT" if pd.api.types.is_integer_dtype(dtypes[col]) else f"sum({col})"
+            for col in columns
+        }
+    
+    def query(self, cte, select):
+        """CTE(sql, params) 뒤에 SELECT를 붙여 실행한 결과 DataFrame"""
+        sql, params = cte
+        return self.con.execute(sql + select, params).df()
+    
+    def clean_frames(self, repos=None, start=None, end=None):
+        """clean_data와 같은 형태의 정제 데이터 (커밋 메시지, PR/이슈 본문 같은 텍스트 열 제외, 리뷰는 범위 안의 PR만)
+
+        SQL 집계를 쓰지 않는 클러스터링, PR 승인 모델과 요약 통계용입니다.
+        """
+        clean = {
+            "commits": self.query(self._clean_commits(repos, start, end),
+                                  f"SELECT * EXCLUDE (message) FROM clean_commits {frames.order_by_sql('commits')}"),
+            "pull_requests": self.query(self._clean_pull_requests(repos, start, end),
+                                        f"SELECT * FROM clean_prs {frames.order_by_sql('pull_requests')}"),
+            "issues": self.query(self._clean_issues(repos, start, end),
+                                 f"SELECT * FROM clean_issues {frames.order_by_sql('issues')}"),
+            "pr_reviews": self.query(self._clean_pull_requests(repos, start, end), f"""
+                SELECT r.* FROM pr_reviews r
+                SEMI JOIN clean_prs p ON r.repo = p.repo AND r.pr_number = p.number
+                {frames.order_by_sql('pr_reviews')}
+            """)
+        }
+        
+        # pandas 경로와 같이 UTC 시각으로 반환
+        for df in clean.values():
+            for col in df.columns:
+                if pd.api.types.is_datetime64_any_dtype(df[col]):
+                    df[col] = df[col].dt.tz_localize("UTC")
+        return frames.mark_cleaned(clean)
+    
+    def developer_patterns(self, repos=None, start=None, end=None):
+        """analyze_developer_patterns 집계 (dev_stats, day_activity, hour_activity, message_patterns)"""
+        cte = self._clean_commits(repos, start, end)
+        
+        sums = self._sums(cte, "clean_commits", COMMIT_CODE_COLUMNS)
+        code_aggs = ", ".join(
+            f"avg({col}) AS {col}_mean, median({col}) AS {col}_median, {sums[col]} AS {col}_sum"
+            for col in COMMIT_CODE_COLUMNS
+        )
+        dev_stats = self.query(cte, f"""
+            SELECT author_login, count(sha) AS commit_count,
+                   avg(message_length) AS message_length_mean, median(message_length) AS message_length_median,
+                   min(date) AS date_min, max(date) AS date_max, {code_aggs}
+            FROM clean_commits WHERE author_login IS NOT NULL
+            GROUP BY author_login ORDER BY author_login
+        """).set_index("author_login")
+        
+        # 활동 기간, 일일 평균 커밋 수, 추가/삭제 비율 (열 순서는 pandas 구현과 같음)
+        for col in ["date_min", "date_max"]:
+            dev_stats[col] = dev_stats[col].dt.tz_localize("UTC")
+        code_columns = [f"{col}_{agg}" for col in COMMIT_CODE_COLUMNS for agg in ("mean", "median", "sum")]
+        code_stats = dev_stats[code_columns]
+        dev_stats = dev_stats.drop(columns=code_columns)
+        dev_stats['active_days'] = (dev_stats['date_max'] - dev_stats['date_min']).dt.days + 1
+        dev_stats['commits_per_day'] = dev_stats['commit_count'] / dev_stats['active_days']
+        dev_stats = pd.concat([dev_stats, code_stats], axis=1)
+        dev_stats['add_delete_ratio'] = dev_stats['additions_sum'] / (dev_stats['deletions_sum'] + 1)
+        
+        # 요일/시간대별 활동 비율 (개발자별 정규화)
+        day_activity = self._crosstab(cte, "author_login", "day_name", normalize=True)
+        if set(DAY_ORDER).issubset(day_activity.columns):
+            day_activity = day_activity.reindex(columns=DAY_ORDER)
+        hour_activity = self._crosstab(cte, "author_login", "hour_of_day", normalize=True)
+        
+        # 상위 30명 개발자의 커밋 메시지 단어 빈도 상위 10개 (문장 부호 제거, 불용어 제외,
+        # 커밋 수/빈도가 같으면 pandas 구현처럼 정제 데이터 행 순서(frames.ROW_ORDER)에서 먼저 나온 개발자/단어 우선)
+        words = self.query(cte, f"""
+            , top_authors AS (
+                SELECT author_login, count(*) AS commit_count,
+                       min({{'repo': repo, 'date': -epoch_us(date), 'sha': sha}}) AS first_row
+                FROM clean_commits WHERE author_login IS NOT NULL GROUP BY author_login
+                ORDER BY commit_count DESC, first_row LIMIT 30
+            ),
+            tokens AS (
+                SELECT c.author_login, c.repo, c.date, c.sha,
+                       string_split_regex(trim(regexp_replace(lower(c.message), '[^\\p{{L}}\\p{{N}}_\\s]', ' ', 'g')), '\\s+') AS words
+                FROM clean_commits c JOIN top_authors USING (author_login)
+                WHERE c.message IS NOT NULL
+            ),
+            words AS (
+                SELECT author_login, repo, date, sha, unnest(words) AS word, generate_subscripts(words, 1) AS position FROM tokens
+            )
+            SELECT w.author_login, w.word, count(*) AS count, any_value(t.commit_count) AS commit_count,
+                   any_value(t.first_row) AS first_row,
+                   min({{'repo': w.repo, 'date': -epoch_us(w.date), 'sha': w.sha, 'position': w.position}}) AS first_seen
+            FROM words w JOIN top_authors t USING (author_login)
+            WHERE w.word <> '' AND w.word NOT IN ({', '.join(f"'{word}'" for word in STOPWORDS)})
+            GROUP BY w.author_login, w.word
+            QUALIFY row_number() OVER (PARTITION BY w.author_login ORDER BY count(*) DESC, first_seen) <= 10
+            ORDER BY commit_count DESC, first_row, count DESC, first_seen
+        """)
+        message_patterns = {}
+        for row in words.itertuples(index=False):
+            message_patterns.setdefault(row.author_login, {})[row.word] = int(row.count)
+        
+        return dev_stats, day_activity, hour_activity, message_patterns
+    
+    def pr_patterns(self, repos=None, start=None, end=None):
+        """analyze_pr_patterns 집계 (pr_stats, size_time_corr, review_network)"""
+        cte = self._clean_pull_requests(repos, start, end)
+        
+        sums = self._sums(cte, "clean_prs", PR_CODE_COLUMNS + ["comments"])
+        code_aggs = ", ".join(
+            f"avg({col}) AS {col}_mean, median({col}) AS {col}_median, {sums[col]} AS {col}_sum"
+            for col in PR_CODE_COLUMNS
+        )
+        pr_stats = self.query(cte, f"""
+            SELECT author_login, count(number) AS pr_count,
+                   avg(processing_time) AS processing_time_mean, median(processing_time) AS processing_time_median,
+                   stddev_samp(processing_time) AS processing_time_std,
+                   avg(is_merged::DOUBLE) AS is_merged_mean,
+                   avg(comments) AS comments_mean, {sums['comments']} AS comments_sum,
+                   avg(commits) AS commits_mean, max(commits) AS commits_max, {code_aggs}
+            FROM clean_prs WHERE author_login IS NOT NULL
+            GROUP BY author_login ORDER BY author_login
+        """).set_index("author_login")
+        
+        # PR 크기 대 처리 시간 상관관계 (전체, PR 10개 이상인 상위 30명, PR 수가 같으면 행 순서에서 먼저 나온 개발자 우선)
+        corr = self.query(cte, """
+            , top_authors AS (
+                SELECT author_login, count(*) AS pr_count,
+                       min({'repo': repo, 'created_at': -epoch_us(created_at), 'number': number}) AS first_row
+                FROM clean_prs WHERE author_login IS NOT NULL GROUP BY author_login
+                ORDER BY pr_count DESC, first_row LIMIT 30
+            )
+            SELECT NULL AS author_login, corr(additions, processing_time) AS corr, NULL AS pr_count, NULL AS first_row FROM clean_prs
+            UNION ALL
+            SELECT author_login, corr(p.additions, p.processing_time), any_value(t.pr_count), any_value(t.first_row)
+            FROM clean_prs p JOIN top_authors t USING (author_login)
+            GROUP BY author_login HAVING count(*) >= 10
+            ORDER BY pr_count DESC NULLS FIRST, first_row
+        """)
+        size_time_corr = {}
+        for row in corr.itertuples(index=False):
+            size_time_corr['overall' if pd.isna(row.author_login) else row.author_login] = None if pd.isna(row.corr) else row.corr
+        
+        # 리뷰 네트워크 (리뷰어 → PR 작성자, PR 하나에서 같은 리뷰어는 한 번만 셈)
+        edges = self.query(cte, """
+            SELECT r.reviewer AS source, p.author_login AS target, count(*) AS weight
+            FROM (SELECT DISTINCT repo, pr_number, reviewer FROM pr_reviews) r
+            JOIN clean_prs p ON r.repo = p.repo AND r.pr_number = p.number
+            WHERE r.reviewer IS DISTINCT FROM p.author_login
+            GROUP BY r.reviewer, p.author_login
+            ORDER BY weight DESC, source, target
+        """)
+        review_network = None
+        if not edges.empty:
+            review_network = {'edges': [
+                {'source': row.source, 'target': row.target, 'weight': int(row.weight)}
+                for row in edges.itertuples(index=False)
+            ]}
+        
+        return pr_stats, size_time_corr, review_network
+    
+    def time_patterns(self, repos=None, start=None, end=None):
+        """analyze_time_patterns 집계 (daily_commits, day_counts, hour_counts, day_hour_counts, monthly_counts)"""
+        cte = self._clean_commits(repos, start, end)
+        
+        daily_commits = self.query(cte, """
+            SELECT date::DATE AS date_only, count(*) AS count FROM clean_commits GROUP BY date_only ORDER BY date_only
+        """)
+        daily_commits['date_only'] = daily_commits['date_only'].dt.date
+        
+        day_counts = self._counts(cte, "day_name")
+        if set(day_counts.index).issubset(DAY_ORDER):
+            day_counts = day_counts.reindex(DAY_ORDER)
+        hour_counts = self._counts(cte, "hour_of_day")
+        day_hour_counts = self._crosstab(cte, "day_of_week", "hour_of_day")
+        
+        monthly_counts = self._counts(cte, "strftime(date, '%Y-%m')")
+        monthly_counts.index = pd.PeriodIndex(monthly_counts.index, freq='M', name='year_month')
+        
+        return daily_commits, day_counts, hour_counts, day_hour_counts, monthly_counts
+    
+    def _counts(self, cte, expression):
+        """groupby(...).size()와 같은 값별 행 수 Series"""
+        df = self.query(cte, f"SELECT {expression} AS key, count(*) AS count FROM clean_commits GROUP BY key ORDER BY key")
+        name = expression if expression.isidentifier() else None
+        return pd.Series(df['count'].to_numpy(), index=pd.Index(df['key'], name=name))
+    
+    def _crosstab(self, cte, index, columns, normalize=False):
+        """pd.crosstab과 같은 교차표 (normalize=True이면 행 기준 비율)"""
+        df = self.query(cte, f"""
+            SELECT {index}, {columns}, count(*) AS count FROM clean_commits
+            WHERE {index} IS NOT NULL GROUP BY {index}, {columns}
+        """)
+        table = df.pivot(index=index, columns=columns, values='count').fillna(0).astype('int64')
+        if normalize:
+            table = table.div(table.sum(axis=1), axis=0)
+        return table